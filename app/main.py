@@ -14,11 +14,26 @@ Issue/Note  : 주소 데이터는 RAG 챗봇 상담 시 활용 가능
 from flask import Flask, render_template, request, jsonify, redirect, url_for, session
 from datetime import datetime
 import bcrypt
+import gc
 import sqlite3
 import os
 import sys
 from pathlib import Path
 
+# orjson 사용 가능 시 SSE 이벤트 직렬화 가속 (bytes 직접 생성, 없으면 표준 json 사용)
+try:
+    import orjson
+
+    def _sse_event(payload) -> bytes:
+        """SSE data 이벤트 1건 직렬화 (비ASCII 그대로 UTF-8)"""
+        return b"data: " + orjson.dumps(payload) + b"\n\n"
+except ImportError:
+    import json
+
+    def _sse_event(payload) -> bytes:
+        """SSE data 이벤트 1건 직렬화 (비ASCII 그대로 UTF-8)"""
+        return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
 # RAG 시스템 임포트를 위한 경로 설정
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -42,8 +57,11 @@ except ImportError as e:
 # -------------------------------------------------------------
 
 # 환경설정 로드 (config 디렉토리)
-from config.settings import app_settings
-from config.db_config import db_settings
+from config.settings import get_app_settings
+from config.db_config import get_db_settings
+
+app_settings = get_app_settings()
+db_settings = get_db_settings()
 
 app = Flask(__name__)
 app.secret_key = app_settings.SECRET_KEY
@@ -142,6 +160,11 @@ if RAG_AVAILABLE:
 else:
     print("[Warning] RAG 모듈을 사용할 수 없습니다. 데모 모드로 실행합니다.")
 
+# 초기화로 생성된 장수 객체(모델, 체인, 프롬프트, 모듈)를 GC 추적 대상에서 제외
+# → 요청 처리 중 세대별 GC가 이 객체들을 반복 스캔하지 않아 GC 정지 시간 단축
+gc.collect()
+gc.freeze()
+
 
 # =============================================================
 # Page Routes
@@ -1128,14 +1151,9 @@ def api_chat_stream():
             
             # RAG 시스템으로 응답 스트리밍
             for chunk in rag_chain.stream(user_id, chat_session_id, message, debug=debug_mode):
-                if debug_mode:
-                    # Debug mode: chunk is already a dict {'type': ..., 'data': ...}
-                    payload = json.dumps(chunk, ensure_ascii=False)
-                else:
-                    # Normal mode: chunk is text string
-                    payload = json.dumps({"text": chunk}, ensure_ascii=False)
-                
-                yield f"data: {payload}\n\n"
+                # Debug mode: chunk is already a dict {'type': ..., 'data': ...}
+                # Normal mode: chunk is text string
+                yield _sse_event(chunk if debug_mode else {"text": chunk})
             
             yield "data: [DONE]\n\n"
             
@@ -10,16 +10,23 @@ Issue/Note  : Pydantic Settings 적용
 # Imports
 # -------------------------------------------------------------
 
+from functools import cached_property, lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# 프로젝트 루트 (config/ 의 상위 디렉토리)
+# - import 시점에 한 번만 계산, __file__ 이 상대 경로인 경우에만 resolve()
+_PROJECT_ROOT = Path(__file__).parent.parent
+if not _PROJECT_ROOT.is_absolute():
+    _PROJECT_ROOT = _PROJECT_ROOT.resolve()
+
 class DatabaseSettings(BaseSettings):
     """
     데이터베이스 설정을 관리하는 클래스 (Pydantic BaseSettings)
     """
     # 환경 변수 설정
     model_config = SettingsConfigDict(
-        env_file=Path(__file__).parent.parent / ".env",
+        env_file=_PROJECT_ROOT / ".env",
         env_file_encoding="utf-8",
         extra="ignore"
     )
@@ -30,35 +37,54 @@ class DatabaseSettings(BaseSettings):
     # PROJECT_ROOT를 Path(__file__).parent.parent 로 고정하고 나머지 필드 기본값으로 설정합니다.
 
     # 프로젝트 루트는 이 파일(config/db_config.py)의 상위 상위 디렉토리
-    PROJECT_ROOT: Path = Path(__file__).resolve().parent.parent
+    PROJECT_ROOT: Path = _PROJECT_ROOT
 
     # SQLite
     SQLITE_DB_NAME: str = "mind_care.db"
     
     # ChromaDB
     CHROMA_COLLECTION_NAME: str = "psych_counseling_vectors"
+    # CHROMA_HOST 설정 시 `chroma run` 서버(HttpClient)에 접속 → 워커 간 인덱스 공유
+    # 비워두면 로컬 PersistentClient 사용 (단일 프로세스 개발용)
+    CHROMA_HOST: str = ""
+    CHROMA_PORT: int = 8001
+    # HNSW 인덱스 파라미터 (M, construction_ef는 컬렉션 생성 시에만 적용, search_ef는 기존 컬렉션에도 적용)
+    # - 목표 recall을 정한 뒤 이를 만족하는 가장 작은 값으로 조정
+    CHROMA_HNSW_M: int = 24
+    CHROMA_HNSW_CONSTRUCTION_EF: int = 200
+    CHROMA_HNSW_SEARCH_EF: int = 64
     
     # [NEW] AWS RDS 설정 (프로덕션용)
     # 환경변수 DATABASE_URL이 설정되면 RDS 사용, 없으면 SQLite 사용
     DATABASE_URL: str = ""
 
-    @property
+    # 커넥션 풀 설정 (PostgreSQL 전용, 동기/비동기 엔진 공통)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_RECYCLE: int = 1800  # 초 단위, 오래된 커넥션 재생성
+    DB_POOL_TIMEOUT: int = 30    # 초 단위, 풀에서 커넥션 대기 최대 시간
+    # PgBouncer(transaction pooling) 경유 시 True → prepared statement 캐시 비활성화
+    DB_PGBOUNCER: bool = False
+
+    # 파생 경로는 인스턴스당 한 번만 계산 (cached_property)
+    # - embed_documents, ensure_directories 등에서 반복 접근 시 Path 재생성 방지
+    @cached_property
     def DATA_DIR(self) -> Path:
         return self.PROJECT_ROOT / "data"
 
-    @property
+    @cached_property
     def SQLITE_DB_PATH(self) -> Path:
         return self.DATA_DIR / self.SQLITE_DB_NAME
 
-    @property
+    @cached_property
     def CHROMA_DB_DIR(self) -> Path:
         return self.DATA_DIR / "vector_store"
 
-    @property
+    @cached_property
     def RAW_DATA_DIR(self) -> Path:
         return self.DATA_DIR / "raw"
 
-    @property
+    @cached_property
     def PROCESSED_DATA_DIR(self) -> Path:
         return self.DATA_DIR / "processed"
 
@@ -94,23 +120,33 @@ class DatabaseSettings(BaseSettings):
     def ensure_directories(self) -> None:
         """
         필요한 디렉토리들이 존재하는지 확인하고, 없으면 생성
+        - 공통 상위 디렉토리(DATA_DIR)만 parents=True로 한 번 생성하고,
+          하위 디렉토리는 바로 아래 한 단계만 생성 (상위 경로 반복 stat 방지)
         """
-        directories = [
-            self.DATA_DIR,
-            self.CHROMA_DB_DIR,
-            self.RAW_DATA_DIR,
-            self.PROCESSED_DATA_DIR,
-        ]
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+        self.DATA_DIR.mkdir(parents=True, exist_ok=True)
+        for directory in (self.CHROMA_DB_DIR, self.RAW_DATA_DIR, self.PROCESSED_DATA_DIR):
+            directory.mkdir(exist_ok=True)
+
+
+# 전역 설정 인스턴스 (최초 접근 시 1회 생성)
+@lru_cache(maxsize=1)
+def get_db_settings() -> DatabaseSettings:
+    """
+    DatabaseSettings 싱글톤 반환 (.env 파싱 및 검증은 최초 호출 시 1회만 수행)
+    """
+    return DatabaseSettings()
 
 
-# 전역 설정 인스턴스 생성
-db_settings = DatabaseSettings()
+def __getattr__(name: str):
+    # 하위 호환: `from config.db_config import db_settings` 사용 시 지연 생성
+    if name == "db_settings":
+        return get_db_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     # 디렉토리 생성 테스트
+    db_settings = get_db_settings()
     db_settings.ensure_directories()
     print(f"SQLite DB Path: {db_settings.SQLITE_DB_PATH}")
     print(f"ChromaDB Dir: {db_settings.CHROMA_DB_DIR}")
\ No newline at end of file
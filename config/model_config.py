@@ -7,10 +7,14 @@ Issue/Note  : Pydantic Settings 적용
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from langchain_openai import ChatOpenAI
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+# langchain_openai는 모델 생성 시점에만 import (설정만 필요한 경우 로딩 비용 제거)
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 class ModelSettings(BaseSettings):
     """
@@ -33,18 +37,38 @@ class ModelSettings(BaseSettings):
     def EMBEDDING_MODEL(self) -> str:
         return self.OPENAI_EMBEDDING_MODEL
 
-# 전역 설정 인스턴스
-model_settings = ModelSettings()
+# 전역 설정 인스턴스 (최초 접근 시 1회 생성)
+@lru_cache(maxsize=1)
+def get_model_settings() -> ModelSettings:
+    """
+    ModelSettings 싱글톤 반환 (.env 파싱 및 검증은 최초 호출 시 1회만 수행)
+    """
+    return ModelSettings()
+
 
-# ChromaDB 등 외부 라이브러리가 환경변수에서 API 키를 찾을 수 있도록 설정
-os.environ["OPENAI_API_KEY"] = model_settings.OPENAI_API_KEY
-# os.environ["TAVILY_API_KEY"] = model_settings.TAVILY_API_KEY
+def __getattr__(name: str):
+    # 하위 호환: `from config.model_config import model_settings` 사용 시 지연 생성
+    if name == "model_settings":
+        return get_model_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+def _propagate_env_vars() -> None:
+    """
+    ChromaDB 등 외부 라이브러리가 환경변수에서 API 키를 찾을 수 있도록 설정
+    - import 시점이 아닌 모델 생성 시점에 수행, 이미 설정된 값은 유지
+    """
+    os.environ.setdefault("OPENAI_API_KEY", get_model_settings().OPENAI_API_KEY)
+    # os.environ.setdefault("TAVILY_API_KEY", get_model_settings().TAVILY_API_KEY)
 
-def create_chat_model() -> ChatOpenAI:
+
+def create_chat_model() -> "ChatOpenAI":
     """
     model_settings.OPENAI_CHAT_MODEL에서 모델이름을 가져와 ChatOpenAI 모델을 실질적으로 생성
     """
+    from langchain_openai import ChatOpenAI
+    
+    _propagate_env_vars()
+    model_settings = get_model_settings()
     model_name = model_settings.OPENAI_CHAT_MODEL
     print(f"모델이름: {model_name}")
 
@@ -58,7 +82,7 @@ def create_chat_model() -> ChatOpenAI:
     return model
 
 if __name__ == "__main__":
-    print(f"OpenAI API Key Set: {bool(model_settings.OPENAI_API_KEY)}")
+    print(f"OpenAI API Key Set: {bool(get_model_settings().OPENAI_API_KEY)}")
     try:
         chat_model = create_chat_model()
         print(type(chat_model))
@@ -13,10 +13,21 @@ Issue/Note  : db_config.py는 DB 경로/설정 전담, 이 파일은 앱 설정
 # -------------------------------------------------------------
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+from pydantic import ValidationError
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+if TYPE_CHECKING:
+    from config.model_config import ModelSettings
+
+# 프로젝트 루트 (config/ 의 상위 디렉토리)
+# - import 시점에 한 번만 계산, __file__ 이 상대 경로인 경우에만 resolve()
+_PROJECT_ROOT = Path(__file__).parent.parent
+if not _PROJECT_ROOT.is_absolute():
+    _PROJECT_ROOT = _PROJECT_ROOT.resolve()
+
 # -------------------------------------------------------------
 # Settings Class
 # -------------------------------------------------------------
@@ -26,13 +37,13 @@ class AppSettings(BaseSettings):
     애플리케이션 전체 설정을 관리하는 클래스
     """
     model_config = SettingsConfigDict(
-        env_file=Path(__file__).parent.parent / ".env",
+        env_file=_PROJECT_ROOT / ".env",
         env_file_encoding="utf-8",
         extra="ignore"
     )
     
     # 프로젝트 루트
-    PROJECT_ROOT: Path = Path(__file__).resolve().parent.parent
+    PROJECT_ROOT: Path = _PROJECT_ROOT
     
     # -------------------------------------------
     # 환경 설정
@@ -59,9 +70,21 @@ class AppSettings(BaseSettings):
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     
     # -------------------------------------------
-    # API 키
+    # API 키 (ModelSettings 싱글톤에 위임)
     # -------------------------------------------
-    OPENAI_API_KEY: Optional[str] = None
+    # OPENAI_API_KEY는 ModelSettings에서만 파싱/검증 → 같은 값을 두 번 검증하지 않음
+    @property
+    def model(self) -> "ModelSettings":
+        from config.model_config import get_model_settings
+        return get_model_settings()
+    
+    @property
+    def OPENAI_API_KEY(self) -> Optional[str]:
+        try:
+            return self.model.OPENAI_API_KEY
+        except ValidationError:
+            # 키 미설정 시 validate_config()에서 오류로 보고
+            return None
     
     # -------------------------------------------
     # 검증 메서드
@@ -95,8 +118,20 @@ class AppSettings(BaseSettings):
         print("=" * 50)
 
 
-# 전역 설정 인스턴스
-app_settings = AppSettings()
+# 전역 설정 인스턴스 (최초 접근 시 1회 생성)
+@lru_cache(maxsize=1)
+def get_app_settings() -> AppSettings:
+    """
+    AppSettings 싱글톤 반환 (.env 파싱 및 검증은 최초 호출 시 1회만 수행)
+    """
+    return AppSettings()
+
+
+def __getattr__(name: str):
+    # 하위 호환: `from config.settings import app_settings` 사용 시 지연 생성
+    if name == "app_settings":
+        return get_app_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # -------------------------------------------------------------
@@ -104,6 +139,7 @@ app_settings = AppSettings()
 # -------------------------------------------------------------
 
 if __name__ == "__main__":
+    app_settings = get_app_settings()
     app_settings.print_config()
     
     errors = app_settings.validate_config()
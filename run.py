@@ -18,9 +18,11 @@ Issue/Note  : 이 파일 하나로 개발/프로덕션 환경 모두 실행 가
 # -------------------------------------------------------------
 
 import sys
-import argparse
 from pathlib import Path
 
+# 무거운 모듈(app.main, uvicorn 등)은 각 실행 함수 내부에서 지연 import
+# → `python run.py --check` 는 Flask/LangChain 로딩 없이 설정 검증만 수행
+
 # 프로젝트 루트를 Python 경로에 추가
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -43,8 +45,11 @@ def check_environment() -> bool:
     Returns:
         bool: 검증 성공 여부
     """
-    from config.settings import app_settings
-    from config.db_config import db_settings
+    from config.settings import get_app_settings
+    from config.db_config import get_db_settings
+    
+    app_settings = get_app_settings()
+    db_settings = get_db_settings()
     
     print("[CHECK] 환경 검증 중...")
     print("-" * 40)
@@ -93,9 +98,11 @@ def check_environment() -> bool:
 
 def run_development():
     """개발 서버 실행 (Flask 내장 서버)"""
-    from config.settings import app_settings
+    from config.settings import get_app_settings
     from app.main import app
     
+    app_settings = get_app_settings()
+    
     print(f"[START] 개발 서버 시작: http://{app_settings.HOST}:{app_settings.PORT}")
     print("   (Ctrl+C 로 종료)\n")
     
@@ -107,7 +114,9 @@ def run_development():
 
 def run_production():
     """프로덕션 서버 실행 (Uvicorn ASGI)"""
-    from config.settings import app_settings
+    from config.settings import get_app_settings
+    
+    app_settings = get_app_settings()
     
     try:
         import uvicorn
@@ -133,7 +142,10 @@ def run_production():
 # Main
 # -------------------------------------------------------------
 
-def main():
+def _build_parser() -> "argparse.ArgumentParser":
+    """CLI 인자 파서 생성 (스크립트 실행 시에만 호출)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="AI 상담 챗봇",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -154,8 +166,10 @@ def main():
         action="store_true", 
         help="환경 검증만 수행"
     )
-    
-    args = parser.parse_args()
+    return parser
+
+def main():
+    args = _build_parser().parse_args()
     
     # 배너 출력
     print_banner()
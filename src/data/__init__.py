@@ -18,9 +18,12 @@ from src.data.vector_loader import (
 )
 
 from src.data.db_loader import (
+    # SQLite Save
+    bulk_insert,
     # SQLite Load
     get_db_session,
-    get_db_statistics
+    get_db_statistics,
+    remove_session
 )
 
 __all__ = [
@@ -32,8 +35,11 @@ __all__ = [
     "get_all_documents",
     "get_by_ids",
     "get_document_count",
+    # SQLite Save
+    "bulk_insert",
     # SQLite Load
     "get_db_session",
-    "get_db_statistics"
+    "get_db_statistics",
+    "remove_session"
 ]
 
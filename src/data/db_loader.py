@@ -17,9 +17,10 @@ from typing import List, Dict, Any, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
-from config.db_config import DatabaseConfig
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from config.db_config import get_db_settings
 from src.database.database_schema import (
     User,
     ChatSession,
@@ -31,26 +32,102 @@ from src.database.database_schema import (
 # DB Connection
 # -------------------------------------------------------------
 
+# 프로세스당 하나의 Engine 재사용 (커넥션 풀 공유)
+_engine: Optional[Engine] = None
+
+# 스레드별 Session 레지스트리 (같은 스레드에서는 동일 Session 객체 재사용)
+# - bind는 최초 get_db_session() 호출 시 설정 (import 시 Engine 생성 방지)
+_SessionLocal = scoped_session(sessionmaker(expire_on_commit=False))
+
+# 대량 INSERT 시 한 번에 보낼 행 수
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """SQLite 쓰기 처리량 향상을 위한 PRAGMA 설정 (커넥션 생성 시 1회)"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _get_engine() -> Engine:
+    """Engine 싱글톤 반환 (최초 호출 시 생성)"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(get_db_settings().get_sqlite_url(), pool_pre_ping=True)
+        event.listen(_engine, "connect", _set_sqlite_pragma)
+    return _engine
+
+
 def get_db_session() -> Session:
-    """DB 세션 생성"""
-    engine = create_engine(DatabaseConfig.get_sqlite_url())
-    return Session(engine)
+    """현재 스레드의 DB 세션 반환 (없으면 생성)"""
+    if _engine is None:
+        _SessionLocal.configure(bind=_get_engine())
+    return _SessionLocal()
+
+
+def remove_session() -> None:
+    """현재 스레드의 세션 정리 (요청 종료/teardown 시 호출)"""
+    _SessionLocal.remove()
+
+
+# -------------------------------------------------------------
+# 저장 (Bulk Insert)
+# -------------------------------------------------------------
+
+def bulk_insert(model, rows: List[Dict[str, Any]], chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> int:
+    """
+    여러 행을 Core INSERT로 일괄 저장 (ORM 객체 생성 없이)
+    
+    Args:
+        model: ORM 모델 클래스 (예: ChatMessage)
+        rows: 컬럼명 → 값 딕셔너리 리스트
+        chunk_size: 한 번에 INSERT할 행 수
+        
+    Returns:
+        int: 저장된 행 수
+    """
+    if not rows:
+        return 0
+    
+    table = model.__table__
+    session = get_db_session()
+    try:
+        # 전체를 하나의 트랜잭션으로 처리 (실패 시 전체 롤백)
+        with session.begin():
+            for start in range(0, len(rows), chunk_size):
+                session.execute(insert(table), rows[start:start + chunk_size])
+        return len(rows)
+    finally:
+        session.close()
 
 
 # -------------------------------------------------------------
 # 통계
 # -------------------------------------------------------------
 
+# 통계 키 → 테이블 (단일 쿼리로 집계)
+_STATISTICS_TABLES = {
+    'users': User.__tablename__,
+    'chat_sessions': ChatSession.__tablename__,
+    'chat_messages': ChatMessage.__tablename__,
+    'expert_referrals': ExpertReferral.__tablename__,
+}
+
+_STATISTICS_QUERY = text(
+    "SELECT " + ", ".join(
+        f"(SELECT COUNT(*) FROM {table})" for table in _STATISTICS_TABLES.values()
+    )
+)
+
+
 def get_db_statistics() -> Dict[str, int]:
-    """DB 전체 통계"""
+    """DB 전체 통계 (테이블별 COUNT를 한 번의 쿼리로 조회)"""
     session = get_db_session()
     try:
-        return {
-            'users': session.query(User).count(),
-            'chat_sessions': session.query(ChatSession).count(),
-            'chat_messages': session.query(ChatMessage).count(),
-            'expert_referrals': session.query(ExpertReferral).count()
-        }
+        counts = session.execute(_STATISTICS_QUERY).one()
+        return dict(zip(_STATISTICS_TABLES, counts))
     finally:
         session.close()
 
@@ -12,11 +12,30 @@ Issue/Note  : docs_for_vectordb.jsonl → ChromaDB 벡터 스토어
 
 import sys
 import json
-import argparse
+import math
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, BinaryIO, Callable, Iterable, Iterator, Union
 from tqdm import tqdm
 
+# orjson 사용 가능 시 JSONL 파싱 가속 (bytes 입력 지원, 없으면 표준 json 사용)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 재시도 대상 일시적 오류 (원격 ChromaDB 사용 시 httpx 연결/타임아웃 오류 포함)
+TRANSIENT_ERRORS: tuple = (ConnectionError, TimeoutError)
+try:
+    import httpx
+    TRANSIENT_ERRORS += (httpx.TransportError,)
+except ImportError:
+    pass
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.database import VectorStore
@@ -27,6 +46,8 @@ from src.database import VectorStore
 
 DEFAULT_INPUT_PATH = Path(__file__).parent.parent.parent / "data" / "processed" / "docs_for_vectordb.jsonl"
 BATCH_SIZE = 100  # 한 번에 저장할 문서 수
+MAX_WORKERS = 4   # 동시에 처리할 배치 수 (임베딩 + ChromaDB 저장)
+MAX_RETRIES = 3   # 일시적 오류(연결/타임아웃) 시 재시도 횟수 (지수 백오프)
 
 
 # -------------------------------------------------------------
@@ -57,48 +78,188 @@ def flatten_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
     return flat
 
 
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+def build_metadata_flattener(sample: Dict[str, Any]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    샘플 metadata의 스키마(키 순서 + 값 타입)에 특화된 평탄화 함수 생성
+    
+    JSONL의 metadata 구조는 모든 문서가 동일하므로, 첫 문서 기준으로
+    isinstance 분기 없이 dict 리터럴만 만드는 함수를 생성한다.
+    스키마가 다른 문서는 flatten_metadata로 처리되어 결과는 항상 동일하다.
+    """
+    if not isinstance(sample, dict) or not sample:
+        return flatten_metadata
+    
+    consts = {"_fallback": flatten_metadata}
+    guards = []
+    items = []
+    
+    def add_guard(var: str, expr: str, d: Dict[str, Any]) -> None:
+        # 키 순서와 값 타입이 샘플과 같을 때만 특화 경로 사용
+        idx = len(guards)
+        consts[f"_K{idx}"] = tuple(d)
+        consts[f"_T{idx}"] = tuple(type(v) for v in d.values())
+        guards.append(f"tuple({var} := {expr}) != _K{idx} or tuple(map(type, {var}.values())) != _T{idx}")
+    
+    add_guard("_m", "m", sample)
+    for key, value in sample.items():
+        if isinstance(value, dict):
+            sub_var = f"_s{len(guards)}"
+            add_guard(sub_var, f"m[{key!r}]", value)
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, _SCALAR_TYPES):
+                    items.append(f"{key + '_' + sub_key!r}: {sub_var}[{sub_key!r}]")
+        elif isinstance(value, _SCALAR_TYPES):
+            items.append(f"{key!r}: m[{key!r}]")
+        elif value is None:
+            items.append(f"{key!r}: ''")
+        else:
+            items.append(f"{key!r}: str(m[{key!r}])")
+    
+    src = (
+        "def _flat(m):\n"
+        + "".join(f"    if {g}:\n        return _fallback(m)\n" for g in guards)
+        + "    return {" + ", ".join(items) + "}\n"
+    )
+    exec(compile(src, "<metadata_flattener>", "exec"), consts)
+    return consts["_flat"]
+
+
+# -------------------------------------------------------------
+# Document ID
+# -------------------------------------------------------------
+
+# 문서마다 호출되므로 모듈 속성 조회를 피하기 위해 로컬 참조로 보관
+_blake2b = hashlib.blake2b
+
+
+def make_doc_id(session_id: Any, turn_index: Any) -> str:
+    """
+    (session_id, turn_index) 기반 결정적 문서 ID 생성
+    
+    BLAKE2b 12바이트 다이제스트(24자 hex)로 고정 길이 ID를 만든다.
+    같은 입력은 항상 같은 ID가 되므로 재임베딩 시 중복 제거가 유지된다.
+    주의: ID만으로는 원래 세션/턴을 알 수 없으므로 조회 시 metadata를 사용할 것.
+    """
+    return _blake2b(f"{session_id}|{turn_index}".encode(), digest_size=12).hexdigest()
+
+
 # -------------------------------------------------------------
 # Load and Embed Functions
 # -------------------------------------------------------------
 
+def iter_jsonl(f: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """열린 JSONL 파일(바이너리 모드)을 한 줄씩 파싱 (전체를 메모리에 올리지 않음)"""
+    for line in f:
+        if line.strip():
+            yield _json_loads(line)
+
+
 def load_jsonl(path: Path) -> List[Dict[str, Any]]:
     """JSONL 파일 로드"""
-    docs = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                docs.append(json.loads(line))
-    return docs
+    with open(path, "rb") as f:
+        return list(iter_jsonl(f))
+
+
+def count_jsonl(f: BinaryIO) -> int:
+    """JSONL 문서 수 계산 (파싱 없이 라인 수만 카운트, 이후 파일 처음으로 되돌림)"""
+    count = sum(1 for line in f if line.strip())
+    f.seek(0)
+    return count
+
+
+def iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """이터러블을 batch_size 크기의 리스트로 나누어 반환"""
+    it = iter(items)
+    return iter(lambda: list(islice(it, batch_size)), [])
+
+
+def _add_batch_with_retry(
+    vs: VectorStore,
+    texts: List[str],
+    metadatas: List[Dict[str, Any]],
+    doc_ids: List[str],
+    max_retries: int = MAX_RETRIES
+) -> List[str]:
+    """
+    배치 저장 (일시적 오류 시 지수 백오프로 재시도)
+    - 중복 ID, 메타데이터 타입, 임베딩 차원 오류 등은 재시도해도 같으므로 즉시 전파
+    
+    Returns:
+        새로 저장된 문서 ID 리스트
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return vs.add_documents(
+                documents=texts,
+                metadatas=metadatas,
+                ids=doc_ids
+            ) or []
+        except TRANSIENT_ERRORS:
+            if attempt == max_retries:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def _collect_batch_result(future: Future, batch_no: int, batch_len: int, stats: Dict[str, int]) -> None:
+    """완료된 배치 결과를 통계에 반영"""
+    try:
+        new_ids = future.result()
+        stats['embedded'] += len(new_ids)
+        stats['skipped'] += batch_len - len(new_ids)
+    except Exception as e:
+        print(f"\n⚠️ 배치 {batch_no + 1} 에러: {e}")
+        stats['skipped'] += batch_len
 
 
 def embed_documents(
-    input_path: Path = DEFAULT_INPUT_PATH,
+    input_path: Union[Path, BinaryIO] = DEFAULT_INPUT_PATH,
     batch_size: int = BATCH_SIZE,
-    limit: int = None
+    limit: int = None,
+    max_workers: int = MAX_WORKERS
 ) -> Dict[str, int]:
     """
     JSONL 파일의 문서들을 ChromaDB에 임베딩
     
     Args:
-        input_path: 입력 JSONL 파일 경로
+        input_path: 입력 JSONL 파일 경로 또는 바이너리 모드로 열린 파일 객체
         batch_size: 배치 크기
         limit: 임베딩할 최대 문서 수 (테스트용)
+        max_workers: 동시에 처리할 배치 수
     
     Returns:
         {'total': 368944, 'embedded': 368944, 'skipped': 0}
     """
-    print(f"📂 입력 파일: {input_path}")
+    # 이미 열린 파일이면 그대로 사용 (호출자가 닫음)
+    if hasattr(input_path, "read"):
+        return _embed_from_file(input_path, batch_size, limit, max_workers)
+    
+    with open(input_path, "rb") as f:
+        return _embed_from_file(f, batch_size, limit, max_workers)
+
+
+def _embed_from_file(
+    f: BinaryIO,
+    batch_size: int,
+    limit: int,
+    max_workers: int
+) -> Dict[str, int]:
+    """열린 JSONL 파일 핸들로 임베딩 수행 (embed_documents 본체)"""
+    print(f"📂 입력 파일: {f.name}")
     
-    # 1. 데이터 로드
+    # 1. 데이터 로드 (스트리밍: 배치 단위로 읽으면서 임베딩)
     print("📖 데이터 로드 중...")
-    docs = load_jsonl(input_path)
-    total = len(docs)
+    total = count_jsonl(f)
+    docs = iter_jsonl(f)
     
     if limit:
-        docs = docs[:limit]
+        docs = islice(docs, limit)
         print(f"   (테스트 모드: {limit}개만 처리)")
     
     print(f"   전체 문서 수: {total:,}")
+    n_docs = min(total, limit) if limit else total
     
     # 2. VectorStore 초기화
     print("\n🔧 VectorStore 초기화...")
@@ -107,44 +268,49 @@ def embed_documents(
     print(f"   현재 저장된 문서: {initial_count:,}")
     
     # 3. 배치 단위로 임베딩
-    print(f"\n🚀 임베딩 시작 (배치 크기: {batch_size})...")
+    print(f"\n🚀 임베딩 시작 (배치 크기: {batch_size}, 워커: {max_workers})...")
     
-    stats = {'total': len(docs), 'embedded': 0, 'skipped': 0}
+    stats = {'total': n_docs, 'embedded': 0, 'skipped': 0}
     
-    for i in tqdm(range(0, len(docs), batch_size), desc="임베딩 진행"):
-        batch = docs[i:i + batch_size]
+    # 배치 구성은 메인 스레드, 임베딩 + 저장은 워커 스레드에서 수행
+    # 메모리 사용량 제한을 위해 처리 중인 배치 수는 워커 수의 2배까지만 유지
+    # 진행률 표시는 2초 간격으로만 갱신 (터미널 출력 최소화)
+    pbar = tqdm(total=math.ceil(n_docs / batch_size), desc="임베딩 진행", mininterval=2.0, smoothing=0.1)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: Dict[Future, tuple] = {}
+    flatten = None
+    
+    for batch_no, batch in enumerate(iter_batches(docs, batch_size)):
+        i = batch_no * batch_size
+        if flatten is None:
+            flatten = build_metadata_flattener(batch[0].get('metadata', {}))
         
-        # 문서 텍스트, 메타데이터, ID 추출
-        texts = []
-        metadatas = []
-        doc_ids = []
+        # 문서 텍스트, 메타데이터(평탄화), ID 추출
+        texts = [doc['text'] for doc in batch]
+        metadatas = [flatten(doc.get('metadata', {})) for doc in batch]
         
-        for idx, doc in enumerate(batch):
-            global_idx = i + idx
-            texts.append(doc['text'])
-            
-            # 메타데이터 평탄화
-            flat_meta = flatten_metadata(doc.get('metadata', {}))
-            metadatas.append(flat_meta)
-            
-            # 고유 ID 생성 (session_id + turn_index)
-            session_id = flat_meta.get('session_id', f'doc_{global_idx}')
-            turn_index = flat_meta.get('turn_index', global_idx)
-            doc_id = f"{session_id}_turn_{turn_index}"
-            doc_ids.append(doc_id)
+        # 고유 ID 생성 (session_id + turn_index 해시)
+        doc_ids = [
+            make_doc_id(meta.get('session_id', f'doc_{i + j}'), meta.get('turn_index', i + j))
+            for j, meta in enumerate(metadatas)
+        ]
         
-        # VectorStore에 추가
-        try:
-            new_ids = vs.add_documents(
-                documents=texts, 
-                metadatas=metadatas,
-                ids=doc_ids
-            )
-            stats['embedded'] += len(new_ids)
-            stats['skipped'] += len(batch) - len(new_ids)
-        except Exception as e:
-            print(f"\n⚠️ 배치 {i//batch_size + 1} 에러: {e}")
-            stats['skipped'] += len(batch)
+        # VectorStore에 추가 (워커 스레드)
+        future = executor.submit(_add_batch_with_retry, vs, texts, metadatas, doc_ids)
+        pending[future] = (batch_no, len(batch))
+        
+        if len(pending) >= max_workers * 2:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                _collect_batch_result(fut, *pending.pop(fut), stats)
+                pbar.update(1)
+    
+    # 남은 배치 완료 대기
+    for fut in wait(pending).done:
+        _collect_batch_result(fut, *pending[fut], stats)
+        pbar.update(1)
+    executor.shutdown()
+    pbar.close()
     
     # 4. 결과 출력
     final_count = vs.get_document_count()
@@ -161,7 +327,10 @@ def embed_documents(
 # Entry Point
 # -------------------------------------------------------------
 
-if __name__ == "__main__":
+def _build_parser() -> "argparse.ArgumentParser":
+    """CLI 인자 파서 생성 (스크립트 실행 시에만 호출)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="JSONL 데이터를 VectorDB에 임베딩")
     parser.add_argument(
         "--input", 
@@ -181,16 +350,29 @@ if __name__ == "__main__":
         default=None,
         help="테스트용 최대 문서 수"
     )
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=MAX_WORKERS,
+        help="동시에 처리할 배치 수 (기본: 4)"
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    args = _build_parser().parse_args()
     
-    args = parser.parse_args()
-    
-    input_path = Path(args.input)
-    if not input_path.exists():
-        print(f"❌ 파일을 찾을 수 없습니다: {input_path}")
+    # 존재 여부 확인(stat) 후 다시 여는 대신, 한 번 열어서 그대로 전달
+    try:
+        input_file = open(args.input, "rb")
+    except FileNotFoundError:
+        print(f"❌ 파일을 찾을 수 없습니다: {args.input}")
         sys.exit(1)
     
-    embed_documents(
-        input_path=input_path,
-        batch_size=args.batch_size,
-        limit=args.limit
-    )
+    with input_file:
+        embed_documents(
+            input_path=input_file,
+            batch_size=args.batch_size,
+            limit=args.limit,
+            max_workers=args.workers
+        )
@@ -13,37 +13,52 @@ Issue/Note  : 기존 데이터 삭제 → 전처리 → 임베딩 자동화
 import os
 import sys
 import shutil
-import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 프로젝트 루트 추가
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from config.db_config import DatabaseConfig
+from config.db_config import get_db_settings
 
 
 # -------------------------------------------------------------
 # Configuration
 # -------------------------------------------------------------
 
-# 삭제 대상 경로
-PATHS_TO_DELETE = [
-    DatabaseConfig.PROCESSED_DATA_DIR,
-    DatabaseConfig.CHROMA_DB_DIR,
-    DatabaseConfig.SQLITE_DB_PATH,
-]
-
-# 전처리 기본 경로
+# 전처리 기본 경로 (출력 경로 기본값은 main()에서 db_settings로 결정)
 DEFAULT_TXT_ROOT = PROJECT_ROOT / "data" / "raw" / "16.심리상담 데이터" / "3.개방데이터" / "1.데이터" / "Training" / "01.원천데이터"
 DEFAULT_JSON_ROOT = PROJECT_ROOT / "data" / "raw" / "16.심리상담 데이터" / "3.개방데이터" / "1.데이터" / "Training" / "02.라벨링데이터"
-DEFAULT_OUT_DIR = DatabaseConfig.PROCESSED_DATA_DIR
+
+
+# 디렉토리 삭제 시 동시 unlink 스레드 수 (I/O 바운드)
+RMTREE_WORKERS = 8
 
 
 # -------------------------------------------------------------
 # Step 1: Clean existing data
 # -------------------------------------------------------------
 
+def _fast_rmtree(path: Path) -> None:
+    """
+    최상위 항목들을 스레드 풀에서 병렬 삭제한 뒤 루트 디렉토리 제거
+    (ChromaDB처럼 파일이 많은 디렉토리에서 shutil.rmtree보다 빠름)
+    """
+    with ThreadPoolExecutor(max_workers=RMTREE_WORKERS) as executor:
+        futures = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    futures.append(executor.submit(shutil.rmtree, entry.path))
+                else:
+                    futures.append(executor.submit(os.unlink, entry.path))
+        # 삭제 중 발생한 예외 전파
+        for future in futures:
+            future.result()
+    os.rmdir(path)
+
+
 def clean_existing_data(dry_run: bool = False) -> None:
     """
     기존 처리 데이터 삭제
@@ -55,14 +70,21 @@ def clean_existing_data(dry_run: bool = False) -> None:
     print("STEP 1: 기존 데이터 정리")
     print("=" * 60)
     
-    for path in PATHS_TO_DELETE:
-        path = Path(path)
+    # 삭제 대상 경로 (import 시점이 아닌 호출 시점에 설정값 조회)
+    db_settings = get_db_settings()
+    paths_to_delete = (
+        db_settings.PROCESSED_DATA_DIR,
+        db_settings.CHROMA_DB_DIR,
+        db_settings.SQLITE_DB_PATH,
+    )
+    
+    for path in paths_to_delete:
         if path.exists():
             if dry_run:
                 print(f"   [DRY-RUN] 삭제 예정: {path}")
             else:
                 if path.is_dir():
-                    shutil.rmtree(path)
+                    _fast_rmtree(path)
                     print(f"   ✅ 삭제됨 (디렉토리): {path}")
                 else:
                     path.unlink()
@@ -77,7 +99,7 @@ def clean_existing_data(dry_run: bool = False) -> None:
 
 def run_preprocessing(txt_root: Path, json_root: Path, out_dir: Path, window: int = 1) -> bool:
     """
-    전처리 파이프라인 실행 (subprocess 사용)
+    전처리 파이프라인 실행 (같은 프로세스에서 preprocess_data.main 호출)
     
     Args:
         txt_root: 원천 텍스트 데이터 경로
@@ -88,33 +110,26 @@ def run_preprocessing(txt_root: Path, json_root: Path, out_dir: Path, window: in
     Returns:
         성공 여부
     """
-    import subprocess
-    
     print("\n" + "=" * 60)
     print("STEP 2: 데이터 전처리")
     print("=" * 60)
     
     try:
-        preprocess_script = PROJECT_ROOT / "src" / "data" / "preprocess_data.py"
-        cmd = [
-            sys.executable,
-            str(preprocess_script),
-            "--txt_root", str(txt_root),
-            "--json_root", str(json_root),
-            "--out_dir", str(out_dir),
-            "--window", str(window)
-        ]
+        from src.data.preprocess_data import main as preprocess_main
         
-        result = subprocess.run(cmd, cwd=str(PROJECT_ROOT), capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"   ❌ 전처리 실패: {result.stderr}")
-            return False
+        # 상대 경로는 기존 subprocess(cwd=PROJECT_ROOT)와 동일하게 프로젝트 루트 기준으로 해석
+        preprocess_main(
+            txt_root=str(PROJECT_ROOT / txt_root),
+            json_root=str(PROJECT_ROOT / json_root),
+            out_dir=str(PROJECT_ROOT / out_dir),
+            window=window
+        )
         
-        print(result.stdout)
         print("   ✅ 전처리 완료")
         return True
     except Exception as e:
+        import traceback
+        traceback.print_exc()
         print(f"   ❌ 전처리 실패: {e}")
         return False
 
@@ -140,17 +155,20 @@ def run_embedding(input_path: Path, batch_size: int = 100, limit: int = None) ->
     print("STEP 3: 벡터DB 임베딩")
     print("=" * 60)
     
-    if not input_path.exists():
+    try:
+        input_file = open(input_path, "rb")
+    except FileNotFoundError:
         print(f"   ❌ 입력 파일 없음: {input_path}")
         return False
     
     try:
         from src.data.embed_to_vectordb import embed_documents
-        stats = embed_documents(
-            input_path=input_path,
-            batch_size=batch_size,
-            limit=limit
-        )
+        with input_file:
+            stats = embed_documents(
+                input_path=input_file,
+                batch_size=batch_size,
+                limit=limit
+            )
         print(f"   ✅ 임베딩 완료: {stats}")
         return True
     except Exception as e:
@@ -210,7 +228,7 @@ def main(
     """
     txt_root = Path(txt_root) if txt_root else DEFAULT_TXT_ROOT
     json_root = Path(json_root) if json_root else DEFAULT_JSON_ROOT
-    out_dir = Path(out_dir) if out_dir else DEFAULT_OUT_DIR
+    out_dir = Path(out_dir) if out_dir else get_db_settings().PROCESSED_DATA_DIR
     
     print("\n" + "=" * 60)
     print("🔄 데이터 파이프라인 리셋 및 재처리")
@@ -260,7 +278,10 @@ def main(
 # Entry Point
 # -------------------------------------------------------------
 
-if __name__ == "__main__":
+def _build_parser() -> "argparse.ArgumentParser":
+    """CLI 인자 파서 생성 (스크립트 실행 시에만 호출)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="데이터 파이프라인 리셋 및 재처리")
     parser.add_argument("--txt_root", type=str, default=None, help="원천 데이터 경로")
     parser.add_argument("--json_root", type=str, default=None, help="라벨링 데이터 경로")
@@ -272,8 +293,11 @@ if __name__ == "__main__":
     parser.add_argument("--skip-clean", action="store_true", help="기존 데이터 삭제 건너뛰기")
     parser.add_argument("--skip-preprocess", action="store_true", help="전처리 건너뛰기")
     parser.add_argument("--skip-embed", action="store_true", help="임베딩 건너뛰기")
-    
-    args = parser.parse_args()
+    return parser
+
+
+if __name__ == "__main__":
+    args = _build_parser().parse_args()
     
     main(
         txt_root=args.txt_root,
@@ -186,8 +186,8 @@ def search_similar(
             ...
         ]
     """
-    from src.database import VectorStore
-    vs = VectorStore()
+    from src.database import get_vector_store
+    vs = get_vector_store()
     
     # 필터 조건 구성
     where = {}
@@ -227,8 +227,8 @@ def get_all_documents(limit: int = 100) -> List[Dict[str, Any]]:
             ...
         ]
     """
-    from src.database import VectorStore
-    vs = VectorStore()
+    from src.database import get_vector_store
+    vs = get_vector_store()
     
     results = vs.get_all_documents(limit=limit)
     
@@ -256,8 +256,8 @@ def get_by_ids(ids: List[str]) -> List[Dict[str, Any]]:
             ...
         ]
     """
-    from src.database import VectorStore
-    vs = VectorStore()
+    from src.database import get_vector_store
+    vs = get_vector_store()
     
     results = vs.collection.get(ids=ids)
     
@@ -274,8 +274,8 @@ def get_by_ids(ids: List[str]) -> List[Dict[str, Any]]:
 
 def get_document_count() -> int:
     """Vector DB 문서 수 조회"""
-    from src.database import VectorStore
-    vs = VectorStore()
+    from src.database import get_vector_store
+    vs = get_vector_store()
     return vs.get_document_count()
 
 
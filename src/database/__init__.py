@@ -10,11 +10,11 @@ from src.database.database_schema import (
     User, ChatSession, ChatMessage, ExpertReferral,
     init_database, get_session
 )
-from src.database.vector_store import VectorStore
+from src.database.vector_store import VectorStore, get_vector_store
 from src.database.db_manager import DatabaseManager
 
 __all__ = [
     "User", "ChatSession", "ChatMessage", "ExpertReferral",
     "init_database", "get_session",
-    "VectorStore", "DatabaseManager"
+    "VectorStore", "get_vector_store", "DatabaseManager"
 ]
\ No newline at end of file
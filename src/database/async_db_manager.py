@@ -12,16 +12,19 @@ Issue/Note  : db_manager.py의 비동기 버전
 # Imports
 # -------------------------------------------------------------
 
-from typing import Optional, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy import select
-from datetime import datetime
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from config.db_config import db_settings
+from config.db_config import get_db_settings
 from src.database.database_schema import Base, User, ChatSession, ChatMessage, ExpertReferral
 
 
@@ -44,11 +47,41 @@ class AsyncDatabaseManager:
         Args:
             echo: SQL 쿼리 로그 출력 여부
         """
-        self.engine = create_async_engine(
-            db_settings.get_async_database_url(),
-            echo=echo,
-            pool_pre_ping=True
-        )
+        db_settings = get_db_settings()
+        url = db_settings.get_async_database_url()
+        
+        if url.startswith("sqlite"):
+            # SQLite(aiosqlite): 파일 DB는 커넥션 생성 비용이 낮으므로 풀링하지 않음
+            engine_kwargs = {"poolclass": NullPool}
+        else:
+            # PostgreSQL(asyncpg): 워커 동시성에 맞춘 풀 크기 설정
+            engine_kwargs = {
+                "poolclass": AsyncAdaptedQueuePool,
+                "pool_size": db_settings.DB_POOL_SIZE,
+                "max_overflow": db_settings.DB_MAX_OVERFLOW,
+                "pool_recycle": db_settings.DB_POOL_RECYCLE,
+                "pool_timeout": db_settings.DB_POOL_TIMEOUT,
+                "pool_pre_ping": True,
+            }
+            if url.startswith("postgresql+asyncpg"):
+                # 반복 쿼리는 prepared statement 캐시로 재사용
+                # (PgBouncer transaction pooling에서는 커넥션이 바뀌므로 0으로 비활성화)
+                cache_size = 0 if db_settings.DB_PGBOUNCER else 500
+                engine_kwargs["connect_args"] = {
+                    "statement_cache_size": cache_size,
+                    "prepared_statement_cache_size": cache_size,
+                    "server_settings": {
+                        # 짧은 OLTP 쿼리에서는 JIT 컴파일 비용이 더 큼
+                        "jit": "off",
+                        "application_name": "skn21-chatbot",
+                        # TCP keepalive로 끊어진 커넥션 조기 감지
+                        "tcp_keepalives_idle": "60",
+                        "tcp_keepalives_interval": "10",
+                        "tcp_keepalives_count": "5",
+                    }
+                }
+        
+        self.engine = create_async_engine(url, echo=echo, **engine_kwargs)
         self.async_session = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
@@ -68,36 +101,77 @@ class AsyncDatabaseManager:
         """
         await self.engine.dispose()
     
+    # ---------------------------------------------------------
+    # Session
+    # ---------------------------------------------------------
+    
+    @asynccontextmanager
+    async def get_session(self) -> AsyncIterator[AsyncSession]:
+        """
+        요청 단위 세션 (요청 하나에서 여러 CRUD 호출 시 커넥션/트랜잭션 1회로 처리)
+        
+        사용 예:
+            async with db.get_session() as session:
+                user = await db.get_user(user_id, session=session)
+                await db.add_chat_message(sid, "user", text, session=session)
+        
+        정상 종료 시 commit, 예외 발생 시 rollback
+        """
+        async with self.async_session() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+    
+    @asynccontextmanager
+    async def _session_scope(self, session: Optional[AsyncSession]) -> AsyncIterator[AsyncSession]:
+        """
+        CRUD 메서드 공통 세션 처리
+        - session 전달 시: 그대로 사용 (commit은 get_session()이 담당)
+        - 미전달 시: 단독 세션을 열고 종료 시 commit
+        """
+        if session is not None:
+            yield session
+            return
+        async with self.get_session() as own_session:
+            yield own_session
+    
     # ---------------------------------------------------------
     # User CRUD
     # ---------------------------------------------------------
     
-    async def create_user(self, username: str, password_hash: Optional[str] = None) -> User:
+    async def create_user(
+        self,
+        username: str,
+        password_hash: Optional[str] = None,
+        session: Optional[AsyncSession] = None
+    ) -> User:
         """
         사용자 생성
         """
-        async with self.async_session() as session:
+        async with self._session_scope(session) as session:
             user = User(username=username, password_hash=password_hash)
             session.add(user)
-            await session.commit()
-            await session.refresh(user)
+            await session.flush()
             return user
     
-    async def get_user(self, user_id: int) -> Optional[User]:
+    async def get_user(self, user_id: int, session: Optional[AsyncSession] = None) -> Optional[User]:
         """
         ID로 사용자 조회
         """
-        async with self.async_session() as session:
+        async with self._session_scope(session) as session:
             result = await session.execute(
                 select(User).where(User.id == user_id)
             )
             return result.scalar_one_or_none()
     
-    async def get_user_by_username(self, username: str) -> Optional[User]:
+    async def get_user_by_username(self, username: str, session: Optional[AsyncSession] = None) -> Optional[User]:
         """
         사용자명으로 사용자 조회
         """
-        async with self.async_session() as session:
+        async with self._session_scope(session) as session:
             result = await session.execute(
                 select(User).where(User.username == username)
             )
@@ -107,22 +181,21 @@ class AsyncDatabaseManager:
     # Chat Session CRUD
     # ---------------------------------------------------------
     
-    async def create_chat_session(self, user_id: int) -> ChatSession:
+    async def create_chat_session(self, user_id: int, session: Optional[AsyncSession] = None) -> ChatSession:
         """
         새 채팅 세션 생성
         """
-        async with self.async_session() as session:
+        async with self._session_scope(session) as session:
             chat_session = ChatSession(user_id=user_id)
             session.add(chat_session)
-            await session.commit()
-            await session.refresh(chat_session)
+            await session.flush()
             return chat_session
     
-    async def get_chat_session(self, session_id: int) -> Optional[ChatSession]:
+    async def get_chat_session(self, session_id: int, session: Optional[AsyncSession] = None) -> Optional[ChatSession]:
         """
         채팅 세션 조회
         """
-        async with self.async_session() as session:
+        async with self._session_scope(session) as session:
             result = await session.execute(
                 select(ChatSession).where(ChatSession.id == session_id)
             )
@@ -132,67 +205,149 @@ class AsyncDatabaseManager:
     # Chat Message CRUD
     # ---------------------------------------------------------
     
-    async def add_chat_message(self, session_id: int, role: str, content: str) -> ChatMessage:
+    async def add_chat_message(
+        self,
+        session_id: int,
+        role: str,
+        content: str,
+        session: Optional[AsyncSession] = None
+    ) -> ChatMessage:
         """
         채팅 메시지 추가
         """
-        async with self.async_session() as session:
+        async with self._session_scope(session) as session:
             message = ChatMessage(
                 session_id=session_id,
                 role=role,
                 content=content
             )
             session.add(message)
-            await session.commit()
-            await session.refresh(message)
+            await session.flush()
             return message
     
-    async def get_chat_history(self, session_id: int) -> List[ChatMessage]:
+    async def add_chat_messages(
+        self,
+        rows: List[Tuple[int, str, str]],
+        session: Optional[AsyncSession] = None
+    ) -> List[ChatMessage]:
         """
-        세션의 채팅 히스토리 조회
+        채팅 메시지 여러 개를 한 번의 INSERT ... RETURNING으로 추가
+        (한 턴의 user + assistant 메시지를 하나의 트랜잭션으로 저장)
+        
+        Args:
+            rows: (session_id, role, content) 튜플 리스트
+            session: 요청 단위 세션 (없으면 단독 세션 사용)
+            
+        Returns:
+            저장된 ChatMessage 리스트 (id, created_at 포함)
         """
-        async with self.async_session() as session:
-            result = await session.execute(
-                select(ChatMessage)
-                .where(ChatMessage.session_id == session_id)
-                .order_by(ChatMessage.created_at)
+        if not rows:
+            return []
+        
+        params = [
+            {"session_id": session_id, "role": role, "content": content}
+            for session_id, role, content in rows
+        ]
+        async with self._session_scope(session) as session:
+            result = await session.scalars(
+                insert(ChatMessage).returning(ChatMessage),
+                params
             )
+            return list(result.all())
+    
+    async def get_chat_history(
+        self,
+        session_id: int,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        session: Optional[AsyncSession] = None
+    ) -> List[ChatMessage]:
+        """
+        세션의 채팅 히스토리 조회 (limit/offset으로 페이지 단위 조회 가능)
+        """
+        stmt = (
+            select(ChatMessage)
+            .where(ChatMessage.session_id == session_id)
+            .order_by(ChatMessage.created_at, ChatMessage.id)  # created_at 동일(같은 초/트랜잭션) → id 순
+            .offset(offset)
+            .limit(limit)
+        )
+        async with self._session_scope(session) as session:
+            result = await session.execute(stmt)
             return list(result.scalars().all())
     
-    async def get_user_recent_sessions(self, user_id: int, limit: int = 5) -> List[dict]:
+    async def stream_chat_history(
+        self,
+        session_id: int,
+        session: Optional[AsyncSession] = None
+    ) -> AsyncIterator[ChatMessage]:
+        """
+        세션의 채팅 히스토리를 서버 측 커서로 한 건씩 반환 (긴 대화도 메모리 일정)
+        
+        사용 예:
+            async for msg in db.stream_chat_history(session_id):
+                ...
+        """
+        stmt = (
+            select(ChatMessage)
+            .where(ChatMessage.session_id == session_id)
+            .order_by(ChatMessage.created_at, ChatMessage.id)
+            .execution_options(yield_per=100)
+        )
+        async with self._session_scope(session) as session:
+            stream = await session.stream_scalars(stmt)
+            async for message in stream:
+                yield message
+    
+    async def get_user_recent_sessions(
+        self,
+        user_id: int,
+        limit: int = 5,
+        session: Optional[AsyncSession] = None
+    ) -> List[dict]:
         """
         사용자의 최근 채팅 세션 목록 조회
         
         Args:
             user_id: 사용자 ID
             limit: 반환할 세션 수
+            session: 요청 단위 세션 (없으면 단독 세션 사용)
             
         Returns:
             세션 목록 (id, title, date, started_at)
         """
-        async with self.async_session() as session:
-            # 세션 조회
-            result = await session.execute(
-                select(ChatSession)
-                .where(ChatSession.user_id == user_id)
-                .order_by(ChatSession.started_at.desc())
-                .limit(limit)
+        # 세션별 첫 번째 user 메시지 (ROW_NUMBER 윈도우 함수, SQLite 3.25+ / PostgreSQL)
+        first_msgs = (
+            select(
+                ChatMessage.session_id,
+                ChatMessage.content,
+                func.row_number().over(
+                    partition_by=ChatMessage.session_id,
+                    order_by=(ChatMessage.created_at, ChatMessage.id)
+                ).label("rn")
             )
-            sessions = result.scalars().all()
+            .where(ChatMessage.role == 'user')
+            .cte("first_msgs")
+        )
+        
+        # 세션 목록 + 첫 메시지를 한 번의 쿼리로 조회 (N+1 제거)
+        stmt = (
+            select(ChatSession, first_msgs.c.content)
+            .outerjoin(
+                first_msgs,
+                and_(first_msgs.c.session_id == ChatSession.id, first_msgs.c.rn == 1)
+            )
+            .where(ChatSession.user_id == user_id)
+            .order_by(ChatSession.started_at.desc())
+            .limit(limit)
+        )
+        
+        async with self._session_scope(session) as session:
+            result = await session.execute(stmt)
             
             recent_sessions = []
-            for chat_session in sessions:
-                # 첫 번째 user 메시지 조회
-                msg_result = await session.execute(
-                    select(ChatMessage)
-                    .where(ChatMessage.session_id == chat_session.id)
-                    .where(ChatMessage.role == 'user')
-                    .order_by(ChatMessage.created_at)
-                    .limit(1)
-                )
-                first_msg = msg_result.scalar_one_or_none()
-                
-                title = first_msg.content[:30] + "..." if first_msg and len(first_msg.content) > 30 else (first_msg.content if first_msg else "새 대화")
+            for chat_session, first_content in result.all():
+                title = first_content[:30] + "..." if first_content and len(first_content) > 30 else (first_content if first_content else "새 대화")
                 
                 recent_sessions.append({
                     'id': chat_session.id,
@@ -211,34 +366,34 @@ class AsyncDatabaseManager:
         self, 
         session_id: int, 
         severity_level: str, 
-        recommended_action: Optional[str] = None
+        recommended_action: Optional[str] = None,
+        session: Optional[AsyncSession] = None
     ) -> ExpertReferral:
         """
         전문가 연결 기록 생성 또는 업데이트
+        - session_id UNIQUE 충돌 시 UPDATE (INSERT ... ON CONFLICT DO UPDATE, 1회 왕복)
         """
-        async with self.async_session() as session:
-            # 기존 레코드 확인
-            result = await session.execute(
-                select(ExpertReferral).where(ExpertReferral.session_id == session_id)
+        dialect_insert = pg_insert if self.engine.dialect.name == "postgresql" else sqlite_insert
+        stmt = dialect_insert(ExpertReferral).values(
+            session_id=session_id,
+            severity_level=severity_level,
+            recommended_action=recommended_action
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ExpertReferral.session_id],
+            set_={
+                "severity_level": stmt.excluded.severity_level,
+                "recommended_action": stmt.excluded.recommended_action,
+            }
+        ).returning(ExpertReferral)
+        
+        async with self._session_scope(session) as session:
+            # populate_existing: 세션에 이미 로드된 객체도 UPDATE 결과로 갱신
+            result = await session.scalars(
+                stmt,
+                execution_options={"populate_existing": True}
             )
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                existing.severity_level = severity_level
-                existing.recommended_action = recommended_action
-                await session.commit()
-                await session.refresh(existing)
-                return existing
-            else:
-                referral = ExpertReferral(
-                    session_id=session_id,
-                    severity_level=severity_level,
-                    recommended_action=recommended_action
-                )
-                session.add(referral)
-                await session.commit()
-                await session.refresh(referral)
-                return referral
+            return result.one()
 
 
 # -------------------------------------------------------------
@@ -11,6 +11,7 @@ Issue/Note  : SQLite 기반, JSON 필드는 SQLAlchemy의 JSON 타입 사용, Py
 # -------------------------------------------------------------
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List
 from sqlalchemy import (
     create_engine, 
@@ -21,7 +22,9 @@ from sqlalchemy import (
     DateTime, 
     Boolean, 
     ForeignKey,
+    Index,
     JSON,
+    func,
     text
 )
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
@@ -31,7 +34,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from config.db_config import db_settings
+from config.db_config import get_db_settings
 
 # -------------------------------------------------------------
 # SQLAlchemy Base
@@ -51,6 +54,8 @@ class User(Base):
     - 회원가입 시 수집하는 개인정보 포함
     """
     __tablename__ = "users"
+    # INSERT 시 서버 기본값(created_at 등)을 RETURNING으로 함께 조회
+    __mapper_args__ = {"eager_defaults": True}
     
     # ---------------------------------------------------------
     # 기본 인증 정보
@@ -72,7 +77,7 @@ class User(Base):
     # ---------------------------------------------------------
     # 타임스탬프
     # ---------------------------------------------------------
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     last_login = Column(DateTime, nullable=True)
     
     # Relationships
@@ -94,10 +99,15 @@ class ChatSession(Base):
     - status: active(진행중), completed(완료), referred(전문가 연결됨)
     """
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        # 사용자별 최근 세션 조회 (WHERE user_id ORDER BY started_at DESC LIMIT)
+        Index("ix_sessions_user_started", "user_id", "started_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    started_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     ended_at = Column(DateTime, nullable=True)
     status = Column(String(20), default="active")  # active, completed, referred
     screening_result = Column(JSON, nullable=True)
@@ -121,12 +131,19 @@ class ChatMessage(Base):
     - role: user(사용자), assistant(챗봇), system(시스템 메시지)
     """
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # 세션 히스토리 조회 (WHERE session_id ORDER BY created_at)
+        Index("ix_msg_session_created", "session_id", "created_at"),
+        # 세션별 첫 user 메시지 조회 (WHERE session_id, role ORDER BY created_at)
+        Index("ix_msg_session_role_created", "session_id", "role", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False)
     role = Column(String(10), nullable=False)  # user, assistant, system
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     
     # Relationships
     session = relationship("ChatSession", back_populates="messages")
@@ -146,12 +163,14 @@ class ExpertReferral(Base):
     - severity_level: mild, moderate, severe, crisis
     """
     __tablename__ = "expert_referrals"
+    # INSERT 시 서버 기본값(created_at 등)을 RETURNING으로 함께 조회
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False, unique=True)
     severity_level = Column(String(20), nullable=False)  # mild, moderate, severe, crisis
     recommended_action = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     
     # Relationships
     session = relationship("ChatSession", back_populates="expert_referral")
@@ -179,7 +198,7 @@ class EmbeddingStore(Base):
     from pgvector.sqlalchemy import Vector
     embedding = Column(Vector(1536), nullable=False)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     
     def __repr__(self):
         return f"<EmbeddingStore(id={self.id})>"
@@ -189,20 +208,36 @@ class EmbeddingStore(Base):
 # Database Initialization
 # -------------------------------------------------------------
 
+def _ensure_indexes(engine: Engine) -> None:
+    """
+    모델에 선언된 인덱스 생성 (없는 경우에만)
+    - create_all은 기존 테이블에 새 인덱스를 추가하지 않으므로 별도 처리
+    """
+    for table in (ChatSession.__table__, ChatMessage.__table__):
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+@lru_cache(maxsize=None)
 def init_database(echo: bool = False) -> Engine:
     """
     데이터베이스 초기화 - 테이블 생성
     
     우선순위:
-        1. DATABASE_URL이 설정된 경우 해당 DB에 연결 시도
+        1. DATABASE_URL이 설정된 경우 해당 DB에 연결 시도 (커넥션 풀 설정 적용)
         2. 연결 실패 시 SQLite로 폴백
     
+    echo 값별로 엔진을 캐시 → DatabaseManager 인스턴스들이 같은 커넥션 풀 공유
+    (매니저 생성마다 엔진/풀 재생성 및 create_all 반복 방지)
+    
     Args:
         echo: SQL 로그 출력 여부
     
     Returns:
         SQLAlchemy Engine 객체
     """
+    db_settings = get_db_settings()
+    
     # 디렉토리 생성 (SQLite 폴백용)
     db_settings.ensure_directories()
     
@@ -212,7 +247,15 @@ def init_database(echo: bool = False) -> Engine:
     if db_settings.DATABASE_URL:
         try:
             print(f"[DB] DATABASE_URL 연결 시도 중...")
-            engine = create_engine(db_settings.DATABASE_URL, echo=echo)
+            engine = create_engine(
+                db_settings.DATABASE_URL,
+                echo=echo,
+                pool_size=db_settings.DB_POOL_SIZE,
+                max_overflow=db_settings.DB_MAX_OVERFLOW,
+                pool_recycle=db_settings.DB_POOL_RECYCLE,
+                pool_timeout=db_settings.DB_POOL_TIMEOUT,
+                pool_pre_ping=True
+            )
             
             # 연결 테스트 (실제로 연결되는지 확인)
             with engine.connect() as conn:
@@ -222,6 +265,7 @@ def init_database(echo: bool = False) -> Engine:
             
             # 테이블 생성
             Base.metadata.create_all(engine)
+            _ensure_indexes(engine)
             return engine
             
         except Exception as e:
@@ -235,6 +279,7 @@ def init_database(echo: bool = False) -> Engine:
     
     # 테이블 생성
     Base.metadata.create_all(engine)
+    _ensure_indexes(engine)
     
     print(f"[DB] SQLite 연결 성공!")
     return engine
@@ -256,7 +301,7 @@ def get_session(engine: Engine):
 if __name__ == "__main__":
     print("데이터베이스 초기화 중...")
     engine = init_database(echo=True)
-    print(f"데이터베이스 생성 완료: {db_settings.SQLITE_DB_PATH}")
+    print(f"데이터베이스 생성 완료: {get_db_settings().SQLITE_DB_PATH}")
     
     # 테스트 세션
     session = get_session(engine)
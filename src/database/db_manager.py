@@ -10,7 +10,7 @@ Issue/Note  : SQLite와 ChromaDB를 통합 관리
 # Imports
 # -------------------------------------------------------------
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 
 import sys
@@ -22,7 +22,7 @@ from src.database.database_schema import (
     init_database, get_session, 
     User, ChatSession, ChatMessage, ExpertReferral
 )
-from src.database.vector_store import VectorStore
+from src.database.vector_store import get_vector_store
 
 # -------------------------------------------------------------
 # Database Manager Class
@@ -46,8 +46,8 @@ class DatabaseManager:
         self.engine = init_database(echo=echo)
         self._session: Optional[Session] = None
         
-        # VectorStore 초기화 (ChromaDB)
-        self.vector_store = VectorStore()
+        # VectorStore (ChromaDB) - 프로세스 전역 싱글톤 공유
+        self.vector_store = get_vector_store()
     
     # -------------------------------------------------------------
     # Session Management
@@ -139,13 +139,34 @@ class DatabaseManager:
         self.commit()
         return message
     
+    def add_chat_messages(self, session_id: int, messages: List[Tuple[str, str]]) -> List[ChatMessage]:
+        """
+        채팅 메시지 여러 개를 한 트랜잭션으로 추가 (예: 사용자 + 어시스턴트 한 턴)
+        
+        Args:
+            messages: [(role, content), ...] (저장 순서대로)
+        """
+        rows = [ChatMessage(session_id=session_id, role=role, content=content) for role, content in messages]
+        self.session.add_all(rows)
+        self.commit()
+        return rows
+    
     def get_chat_history(self, session_id: int) -> List[ChatMessage]:
         """
         세션의 채팅 히스토리 조회
         """
         return self.session.query(ChatMessage).filter(
             ChatMessage.session_id == session_id
-        ).order_by(ChatMessage.created_at).all()
+        ).order_by(ChatMessage.created_at, ChatMessage.id).all()  # 같은 트랜잭션 저장분은 created_at 동일 → id 순
+    
+    def get_chat_history_since(self, session_id: int, after_id: int = 0) -> List[ChatMessage]:
+        """
+        세션에서 after_id 이후에 추가된 메시지만 조회 (히스토리 증분 로드용)
+        """
+        return self.session.query(ChatMessage).filter(
+            ChatMessage.session_id == session_id,
+            ChatMessage.id > after_id
+        ).order_by(ChatMessage.id).all()
     
     def get_user_recent_sessions(self, user_id: int, limit: int = 5) -> List[Dict]:
         """
@@ -175,7 +196,7 @@ class DatabaseManager:
             first_message = self.session.query(ChatMessage).filter(
                 ChatMessage.session_id == chat_session.id,
                 ChatMessage.role == "user"
-            ).order_by(ChatMessage.created_at).first()
+            ).order_by(ChatMessage.created_at, ChatMessage.id).first()
             
             if first_message:
                 # 제목: 첫 메시지를 20자로 자르고 "..."
@@ -10,17 +10,358 @@ Issue/Note  : RDS 마이그레이션 취소 -> ChromaDB 복구
 # Imports
 # -------------------------------------------------------------
 
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from itertools import repeat
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+import asyncio
+import hashlib
+import json
 import os
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils import embedding_functions
+import queue
+import threading
+import unicodedata
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+# chromadb / torch / sentence_transformers / numpy는 VectorStore 생성 시점에 import
+# (스키마 등 database 패키지만 import하는 프로세스의 시작 비용 절감)
+if TYPE_CHECKING:
+    import numpy as np
+
+from config.db_config import get_db_settings
+
+# -------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------
+
+ENCODE_BATCH_SIZE = 64     # SentenceTransformer.encode 내부 배치 크기
+INGEST_BATCH_SIZE_GPU = 128  # GPU 적재(add_documents) 시 encode 배치 크기 (텐서 코어 활용)
+ADD_SUB_BATCH_SIZE = 256   # 한 번에 임베딩 + 저장할 문서 수 (GPU 메모리 상한)
+WRITER_QUEUE_SIZE = 4      # 임베딩 완료 후 저장 대기 중인 서브 배치 최대 수
+
+# 시맨틱 검색 캐시 (유사한 질의는 이전 검색 결과 재사용)
+SEARCH_CACHE_SIZE = 512          # 캐시 최대 항목 수 (LRU)
+SEARCH_CACHE_THRESHOLD = 0.97    # 캐시 적중 최소 코사인 유사도
+
+# 쿼리 임베딩 LRU 캐시 크기 (반복되는 짧은 발화: "안녕", "우울해", "몰라" 등)
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+
+# collection.query 기본 include 필드 (호출마다 리스트를 새로 만들지 않도록 모듈 상수)
+DEFAULT_INCLUDE = ("documents", "metadatas", "distances")
+
+# 비동기 쿼리 마이크로 배칭 (짧은 시간 창에 도착한 쿼리를 한 번에 임베딩/검색)
+QUERY_BATCH_MAX_SIZE = 32
+QUERY_BATCH_MAX_WAIT_MS = 10
+
+# 동기 쿼리 임베딩 마이크로 배칭 (검색 + 시맨틱 캐시가 공유)
+# - 대기 창 0ms: 단일 요청은 추가 지연 없음, 모델 forward 중에 쌓인 요청만 다음 forward 1회로 묶음
+QUERY_EMBED_MAX_BATCH = 32
+QUERY_EMBED_MAX_WAIT_MS = 0
+
+# 임베딩 모델 (config/model_config.py에 없는 경우 대비 하드코딩)
+EMBEDDING_MODEL_NAME = "jhgan/ko-sroberta-multitask"
+
+# CPU 추론 시 Linear 레이어 INT8 동적 양자화 (VECTOR_STORE_INT8=1 일 때만)
+USE_CPU_INT8 = os.getenv("VECTOR_STORE_INT8", "0") == "1"
+
+# 2단계 검색: HNSW로 k × RERANK_CANDIDATE_FACTOR개 후보 조회 → Cross-Encoder로 재정렬 후 상위 k개
+# (VECTOR_STORE_RERANK=1 일 때만 - 모델 다운로드/추론 비용이 있어 기본 비활성화)
+USE_RERANKER = os.getenv("VECTOR_STORE_RERANK", "0") == "1"
+RERANKER_MODEL_NAME = "BAAI/bge-reranker-base"
+RERANK_CANDIDATE_FACTOR = 4
+RERANK_BATCH_SIZE = 32
+
+# FP16 사이드 인덱스 (persist_directory에 임베딩 사본 저장)
+# - 문서 수가 SCAN_MAX_DOCS 미만이고 필터가 없으면 HNSW 대신 NumPy 전수 탐색 (정확한 top-k)
+# - 파일은 FP16으로 저장, 로드 시 1회 float32로 변환해 계산 (NumPy FP16 행렬곱은 BLAS 미사용으로 느림)
+# - 적재 후 문서 수가 SCAN_MAX_DOCS를 넘는 경우 사이드 인덱스 파일을 쓰지 않음
+SCAN_VECTORS_FILE = "vecs.f16"
+SCAN_IDS_FILE = "vecs.ids"
+SCAN_MAX_DOCS = 20000
+# 임베딩 모델이 CUDA에 있으면 사이드 인덱스도 GPU 텐서로 올려 전수 탐색 (VECTOR_STORE_GPU_SCAN=0 이면 비활성화)
+USE_GPU_SCAN = os.getenv("VECTOR_STORE_GPU_SCAN", "1") == "1"
+
+# 컬렉션 HNSW 거리 공간
+# - 임베딩은 저장/검색 모두 L2 정규화 → 내적(ip) 거리 = 1 - cos = cosine 거리
+#   (HNSW 탐색 시 후보마다 정규화 연산 생략, 기존 거리 임계값 그대로 유효)
+HNSW_SPACE = "ip"
+
+
+def _collection_metadata() -> Dict[str, Any]:
+    """컬렉션 생성 시 HNSW 설정 (M/construction_ef/search_ef는 DB 설정에서 조회)"""
+    db_settings = get_db_settings()
+    return {
+        "hnsw:space": HNSW_SPACE,
+        "hnsw:construction_ef": db_settings.CHROMA_HNSW_CONSTRUCTION_EF,
+        "hnsw:M": db_settings.CHROMA_HNSW_M,
+        "hnsw:search_ef": db_settings.CHROMA_HNSW_SEARCH_EF,
+    }
+
+# -------------------------------------------------------------
+# Shared Resources (모델 / ChromaDB 클라이언트 캐시)
+# -------------------------------------------------------------
+
+# VectorStore 인스턴스가 여러 개여도 모델 가중치와 클라이언트는 프로세스당 1벌만 유지
+_MODEL_CACHE: Dict[tuple, Any] = {}    # (model_name, device) → SentenceTransformer
+_CLIENT_CACHE: Dict[str, Any] = {}     # persist_directory 또는 host:port → ChromaDB 클라이언트
+_RERANKER_CACHE: Dict[tuple, Any] = {} # (model_name, device) → CrossEncoder
+_CACHE_LOCK = threading.Lock()
+
+
+def _compile_embedding_model(model, torch) -> None:
+    """
+    트랜스포머 본체를 torch.compile로 컴파일 (커널 융합 + CUDA Graph)
+    - 첫 실제 쿼리가 컴파일 비용을 내지 않도록 더미 입력으로 워밍업
+    - 컴파일/워밍업 실패 시 원래 모듈로 복구 (기능 동일, 속도만 차이)
+    """
+    transformer = model[0]
+    original = transformer.auto_model
+    try:
+        transformer.auto_model = torch.compile(
+            original,
+            mode="reduce-overhead",
+            fullgraph=False,
+            dynamic=True  # 문장 길이별 재컴파일 최소화
+        )
+        for _ in range(3):
+            model.encode(["."], convert_to_numpy=True)
+        print("[VectorStore] Embedding model compiled (torch.compile)")
+    except Exception as e:
+        transformer.auto_model = original
+        print(f"[VectorStore][WARN] torch.compile 실패, 기본 모델 사용: {e}")
+
+
+def _load_embedding_model(model_name: str, device: str):
+    """SentenceTransformer 로드 + 추론용 설정 (캐시 미스 시에만 호출)"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    print(f"[VectorStore] Loading embedding model: {model_name} on {device}")
+    model = SentenceTransformer(
+        model_name, 
+        device=device
+    )
+    
+    # 추론 전용 → GPU에서는 반정밀도로 변환 (처리량 약 2배, VRAM 절반)
+    # BF16 지원 GPU는 LayerNorm 오버플로 방지를 위해 BF16, 그 외 FP16
+    if device == "cuda":
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        model.to(dtype)
+        print(f"[VectorStore] Embedding dtype: {dtype}")
+    model.eval()
+    
+    if device == "cpu" and USE_CPU_INT8:
+        # 가중치 바이트 1/4 → 메모리 대역폭 병목 완화, VNNI/AVX-512 int8 커널 사용
+        transformer = model[0]
+        transformer.auto_model = torch.ao.quantization.quantize_dynamic(
+            transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        print("[VectorStore] Embedding model quantized (dynamic INT8)")
+    
+    if device == "cuda":
+        _compile_embedding_model(model, torch)
+    print(f"[VectorStore] Model loaded successfully")
+    return model
+
+
+def _get_embedding_model(model_name: str = EMBEDDING_MODEL_NAME):
+    """(model_name, device)별 SentenceTransformer 싱글톤 반환"""
+    import torch
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    key = (model_name, device)
+    
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        with _CACHE_LOCK:
+            model = _MODEL_CACHE.get(key)
+            if model is None:
+                model = _load_embedding_model(model_name, device)
+                _MODEL_CACHE[key] = model
+    return model
+
+
+def _load_reranker(model_name: str, device: str):
+    """CrossEncoder 로드 + 추론용 설정 (GPU: 반정밀도, CPU: 동적 INT8 양자화)"""
+    import torch
+    from sentence_transformers import CrossEncoder
+    
+    print(f"[VectorStore] Loading reranker: {model_name} on {device}")
+    reranker = CrossEncoder(model_name, device=device, max_length=512)
+    
+    if device == "cuda":
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        reranker.model.to(dtype)
+    else:
+        reranker.model = torch.ao.quantization.quantize_dynamic(
+            reranker.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    reranker.model.eval()
+    return reranker
+
+
+def _get_reranker(model_name: str = RERANKER_MODEL_NAME):
+    """(model_name, device)별 CrossEncoder 싱글톤 반환"""
+    import torch
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    key = (model_name, device)
+    
+    reranker = _RERANKER_CACHE.get(key)
+    if reranker is None:
+        with _CACHE_LOCK:
+            reranker = _RERANKER_CACHE.get(key)
+            if reranker is None:
+                reranker = _load_reranker(model_name, device)
+                _RERANKER_CACHE[key] = reranker
+    return reranker
+
+
+def _get_chroma_client(persist_directory: str):
+    """
+    ChromaDB 클라이언트 싱글톤 반환 (텔레메트리 비활성화 → 시작 시 외부 HTTP 호출 제거)
+    - CHROMA_HOST 설정 시 Chroma 서버(HttpClient), 아니면 로컬 PersistentClient
+    """
+    import chromadb
+    from chromadb.config import Settings
+    
+    db_settings = get_db_settings()
+    key = f"{db_settings.CHROMA_HOST}:{db_settings.CHROMA_PORT}" if db_settings.CHROMA_HOST else persist_directory
+    
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        with _CACHE_LOCK:
+            client = _CLIENT_CACHE.get(key)
+            if client is None:
+                client_settings = Settings(anonymized_telemetry=False)
+                if db_settings.CHROMA_HOST:
+                    # 다중 워커: 하나의 Chroma 서버를 공유 (HNSW 그래프 1벌, 쓰기 직렬화)
+                    print(f"[VectorStore] Connecting to Chroma server: {key}")
+                    client = chromadb.HttpClient(
+                        host=db_settings.CHROMA_HOST,
+                        port=db_settings.CHROMA_PORT,
+                        settings=client_settings
+                    )
+                else:
+                    client = chromadb.PersistentClient(
+                        path=persist_directory,
+                        settings=client_settings
+                    )
+                _CLIENT_CACHE[key] = client
+    return client
+
+
+def _is_unit_norm(embeddings: "np.ndarray", atol: float = 1e-3) -> bool:
+    """모든 임베딩 벡터의 L2 노름이 1인지 확인 (디버그용)"""
+    import numpy as np
+    return bool(np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=atol))
+
+
+# -------------------------------------------------------------
+# Query Micro-Batcher
+# -------------------------------------------------------------
+
+class QueryBatcher:
+    """
+    비동기 쿼리 마이크로 배처
+    
+    max_wait_ms 동안 도착한 쿼리(최대 max_batch개)를 모아
+    임베딩 1회 + ChromaDB 쿼리 1회((k, filter) 그룹별)로 처리한 뒤 요청별로 결과를 돌려준다.
+    이벤트 루프 하나에 바인딩되며, 실제 임베딩/검색은 스레드풀에서 실행된다.
+    """
+    
+    def __init__(
+        self,
+        store: "VectorStore",
+        max_batch: int = QUERY_BATCH_MAX_SIZE,
+        max_wait_ms: int = QUERY_BATCH_MAX_WAIT_MS
+    ):
+        self.store = store
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task = self.loop.create_task(self._run())
+    
+    async def submit(self, query: str, k: int, filter: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """쿼리를 큐에 넣고 배치 처리 결과를 기다림"""
+        future = self.loop.create_future()
+        await self.queue.put((query, k, filter, future))
+        return await future
+    
+    async def _run(self) -> None:
+        while True:
+            items = [await self.queue.get()]
+            deadline = self.loop.time() + self.max_wait
+            while len(items) < self.max_batch:
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await asyncio.to_thread(
+                    self.store._search_batch,
+                    [(query, k, filter) for query, k, filter, _ in items]
+                )
+            except Exception as e:
+                for *_, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (*_, future), docs in zip(items, results):
+                if not future.done():
+                    future.set_result(docs)
+
+
+class QueryEmbedder:
+    """
+    동기 쿼리 임베딩 마이크로 배처
+    
+    여러 요청 스레드(Flask 워커 등)의 embed 호출을 전용 워커 스레드 하나에서 모아
+    큐에 쌓여 있거나 max_wait_ms 이내에 이어서 도착한 텍스트(최대 max_batch개)를 모델 forward 1회로 임베딩한다.
+    """
+    
+    def __init__(
+        self,
+        encode_fn,
+        max_batch: int = QUERY_EMBED_MAX_BATCH,
+        max_wait_ms: int = QUERY_EMBED_MAX_WAIT_MS
+    ):
+        self.encode = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="query-embedder", daemon=True)
+        self._thread.start()
+    
+    def embed(self, text: str) -> "np.ndarray":
+        """텍스트를 큐에 넣고 배치 임베딩 결과(L2 정규화 float32 벡터)를 기다림"""
+        future: Future = Future()
+        self.queue.put((text, future))
+        return future.result()
+    
+    def _run(self) -> None:
+        while True:
+            items = [self.queue.get()]
+            while len(items) < self.max_batch:
+                try:
+                    items.append(self.queue.get(timeout=self.max_wait) if self.max_wait > 0 else self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                embeddings = self.encode([text for text, _ in items], batch_size=len(items))
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(items, embeddings):
+                future.set_result(embedding)
 
-from config.model_config import model_settings
 
 # -------------------------------------------------------------
 # Vector Store Class
@@ -47,25 +388,12 @@ class VectorStore:
         
         print(f"[VectorStore] Initializing ChromaDB at: {self.persist_directory}")
         
-        # ChromaDB 클라이언트 초기화
-        self.client = chromadb.PersistentClient(path=self.persist_directory)
+        # ChromaDB 클라이언트 (프로세스 내 공유)
+        self.client = _get_chroma_client(self.persist_directory)
         
-        # 임베딩 모델 초기화 (SentenceTransformer)
+        # 임베딩 모델 초기화 (SentenceTransformer, 프로세스 내 공유)
         try:
-            from sentence_transformers import SentenceTransformer
-            # 모델 설정 (config/model_config.py에 없는 경우 대비 하드코딩)
-            model_name = "jhgan/ko-sroberta-multitask" 
-            device = "cpu"
-            import torch
-            if torch.cuda.is_available():
-                device = "cuda"
-            
-            print(f"[VectorStore] Loading embedding model: {model_name} on {device}")
-            self.embedding_model = SentenceTransformer(
-                model_name, 
-                device=device
-            )
-            print(f"[VectorStore] Model loaded successfully")
+            self.embedding_model = _get_embedding_model()
         except Exception as e:
             print(f"[ERROR] Failed to load embedding model: {e}")
             raise e
@@ -74,12 +402,119 @@ class VectorStore:
         self.collection_name = "psych_counseling_vectors"
         self.collection = self.client.get_or_create_collection(
             name=self.collection_name,
-            metadata={"hnsw:space": "cosine"} # 코사인 유사도 사용
+            metadata=_collection_metadata() # 정규화 벡터 내적 (= 코사인 유사도)
+        )
+        self.apply_search_ef()
+        self._warm_up_index()
+        
+        # 시맨틱 검색 캐시: (filter, k)별 {항목 ID: (정규화 임베딩, 결과)} (LRU 순서)
+        self._search_cache: Dict[tuple, "OrderedDict[int, tuple]"] = {}
+        self._search_cache_size = 0
+        self._search_cache_seq = 0
+        self._search_cache_lock = threading.Lock()
+        
+        # 비동기 마이크로 배처 (asimilarity_search 최초 호출 시 생성)
+        self._batcher: Optional[QueryBatcher] = None
+        
+        # 적재용 encode 배치 크기 (GPU는 크게, CPU는 기본값)
+        self._ingest_batch_size = (
+            INGEST_BATCH_SIZE_GPU if str(self.embedding_model.device).startswith("cuda") else ENCODE_BATCH_SIZE
+        )
+        
+        # FP16 사이드 인덱스 (scan_topk 최초 호출 시 메모리 매핑)
+        self._scan_vectors_path = os.path.join(self.persist_directory, SCAN_VECTORS_FILE)
+        self._scan_ids_path = os.path.join(self.persist_directory, SCAN_IDS_FILE)
+        self._scan_index: Optional[tuple] = None   # (float32 행렬 또는 GPU 텐서, ID 리스트)
+        self._scan_lock = threading.Lock()
+        
+        # 컬렉션 문서 수 캐시 (컬렉션, 문서 수) - 검색마다 count() 호출(원격 ChromaDB는 HTTP 왕복) 방지
+        # add_documents 후 / 다른 컬렉션으로 교체 시 다시 조회
+        self._count_cache: Optional[tuple] = None
+        
+        # 캐시 미스 쿼리 임베딩은 마이크로 배처 경유 (동시 요청을 forward 1회로 묶음)
+        self._query_embedder = QueryEmbedder(self._encode)
+        
+        # 정규화된 쿼리 텍스트 → 임베딩 바이트 (반복 쿼리는 모델 forward 생략)
+        self._encode_query_bytes = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(
+            lambda text: self._query_embedder.embed(text).tobytes()
         )
+    
+    def _encode(self, texts, batch_size: int = ENCODE_BATCH_SIZE) -> "np.ndarray":
+        """
+        텍스트(단일 문자열 또는 리스트) 임베딩 → L2 정규화된 float32 numpy 배열
+        - 모델이 BF16/FP16이어도 텐서로 받은 뒤 마지막에 float32로 변환 (ChromaDB 저장 형식)
+        """
+        import torch
+        
+        with torch.inference_mode():
+            embeddings = self.embedding_model.encode(
+                texts,
+                batch_size=batch_size,
+                convert_to_tensor=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        return embeddings.float().cpu().numpy()
+    
+    def _encode_query(self, query: str) -> "np.ndarray":
+        """쿼리 임베딩 (NFC 정규화 + 공백 제거 + 소문자화한 텍스트 기준 LRU 캐시)"""
+        import numpy as np
+        
+        normalized = unicodedata.normalize("NFC", query).strip().lower()
+        return np.frombuffer(self._encode_query_bytes(normalized), dtype=np.float32)
+    
+    def embed_query(self, query: str) -> "np.ndarray":
+        """쿼리 임베딩 (L2 정규화 float32, 정규화 텍스트 기준 LRU 캐시) - 시맨틱 캐시 등 외부 사용용"""
+        return self._encode_query(query)
+    
+    def apply_search_ef(self) -> None:
+        """
+        현재 컬렉션에 설정의 HNSW search_ef 적용
+        - 컬렉션 메타데이터는 생성 시에만 반영되므로 기존 컬렉션은 설정을 바꿔도 이전 값으로 검색됨
+        - search_ef는 M/construction_ef와 달리 재색인 없이 변경 가능
+        """
+        search_ef = get_db_settings().CHROMA_HNSW_SEARCH_EF
+        try:
+            hnsw = (getattr(self.collection, "configuration", None) or {}).get("hnsw") or {}
+            if hnsw.get("ef_search") == search_ef:
+                return
+            self.collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+            print(f"[VectorStore] HNSW search_ef = {search_ef}")
+        except Exception as e:
+            print(f"[VectorStore][WARN] search_ef 적용 실패: {e}")
+    
+    def _warm_up_index(self) -> None:
+        """
+        더미 쿼리로 HNSW 인덱스를 메모리에 미리 로드 (첫 검색의 콜드 스타트 제거)
+        - 컬렉션 기본 임베딩 함수가 로드되지 않도록 query_texts 대신 임베딩을 직접 전달
+        """
+        try:
+            if self.collection.count() == 0:
+                return
+            warm_embedding = self._encode(".")
+            self.collection.query(query_embeddings=warm_embedding[None, :], n_results=1, include=[])
+        except Exception as e:
+            print(f"[VectorStore][WARN] 인덱스 워밍업 실패: {e}")
             
+    @classmethod
+    def warmup(cls) -> None:
+        """
+        앱 시작 시 1회 호출 - 모델 가중치와 ChromaDB 클라이언트를 미리 로드
+        (첫 사용자 요청이 모델 로딩 비용을 내지 않도록)
+        """
+        get_vector_store()
+    
     def get_document_count(self) -> int:
-        """저장된 문서 수 반환"""
-        return self.collection.count()
+        """저장된 문서 수 반환 (항상 새로 조회하고 캐시 갱신)"""
+        self._count_cache = None
+        return self._cached_count()
+    
+    def _cached_count(self) -> int:
+        """현재 컬렉션 문서 수 (캐시, 컬렉션이 바뀌었으면 다시 조회)"""
+        cached = self._count_cache
+        if cached is None or cached[0] is not self.collection:
+            cached = self._count_cache = (self.collection, self.collection.count())
+        return cached[1]
 
     def add_documents(self, documents: List[str], metadatas: Optional[List[Dict[str, Any]]] = None, ids: Optional[List[str]] = None):
         """
@@ -88,35 +523,121 @@ class VectorStore:
         Args:
             documents: 저장할 텍스트 리스트
             metadatas: 메타데이터 리스트
-            ids: 문서 ID 리스트 (없으면 자동 생성)
+            ids: 문서 ID 리스트 (없으면 문서 내용 해시로 생성 → 재적재 시 중복 저장 없음)
+        
+        Returns:
+            새로 저장된 문서 ID 리스트 (이미 존재하는 ID는 제외)
         """
         if not documents:
-            return
+            return []
 
         try:
-            # 임베딩 생성 (Batch)
-            embeddings = self.embedding_model.encode(documents, convert_to_numpy=True).tolist()
-            
-            # ID 생성 (없으면)
+            # ID 생성 (없으면) - 내용 기반 blake2b 해시 (uuid4보다 빠르고 멱등)
             if ids is None:
-                import uuid
-                ids = [str(uuid.uuid4()) for _ in documents]
-            
-            # ChromaDB에 추가
-            self.collection.add(
-                documents=documents,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                ids=ids
+                ids = [hashlib.blake2b(d.encode("utf-8"), digest_size=16).hexdigest() for d in documents]
+                # 같은 배치 내 동일 문서 제거 (ChromaDB는 중복 ID add 시 오류)
+                first = {}
+                for i, doc_id in enumerate(ids):
+                    first.setdefault(doc_id, i)
+                if len(first) < len(ids):
+                    keep = sorted(first.values())
+                    documents = [documents[i] for i in keep]
+                    metadatas = [metadatas[i] for i in keep] if metadatas else None
+                    ids = [ids[i] for i in keep]
+            
+            # 이미 저장된 ID 제외 (include=[] → ID만 조회, 문서/임베딩 로드 없음)
+            existing = set(self.collection.get(ids=ids, include=[])["ids"])
+            if existing:
+                keep = [i for i, doc_id in enumerate(ids) if doc_id not in existing]
+                if not keep:
+                    return []
+                documents = [documents[i] for i in keep]
+                metadatas = [metadatas[i] for i in keep] if metadatas else None
+                ids = [ids[i] for i in keep]
+            
+            # 전체를 길이순으로 정렬한 뒤 서브 배치로 나눔
+            # (encode는 배치 내부만 정렬하므로, 서브 배치 간에도 길이를 맞춰 패딩 낭비 최소화)
+            order = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+            
+            # 적재 후에도 전수 탐색 대상 규모일 때만 사이드 인덱스 기록 (대량 적재 시 파일 쓰기 생략)
+            write_scan = self._cached_count() + len(documents) < SCAN_MAX_DOCS
+            
+            # 서브 배치 단위로 임베딩 생성(Batch) → writer 스레드가 저장
+            # (GPU 임베딩과 sqlite/HNSW 삽입을 겹쳐 실행 - 저장 중에도 다음 배치 임베딩 진행)
+            writer_queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=WRITER_QUEUE_SIZE)
+            errors: List[BaseException] = []
+            writer = threading.Thread(
+                target=self._write_batches,
+                args=(writer_queue, errors, write_scan),
+                name="vector-store-writer",
+                daemon=True
             )
+            writer.start()
+            try:
+                for start in range(0, len(order), ADD_SUB_BATCH_SIZE):
+                    if errors:
+                        break
+                    idx = order[start:start + ADD_SUB_BATCH_SIZE]
+                    sub_docs = [documents[i] for i in idx]
+                    # numpy 배열 그대로 전달 (.tolist()로 Python float 수백만 개 생성하지 않음)
+                    embeddings = self._encode(sub_docs, batch_size=self._ingest_batch_size)
+                    # ip 거리는 단위 벡터를 전제로 함 (python -O 실행 시 생략)
+                    assert _is_unit_norm(embeddings), "embeddings must be L2-normalized"
+                    
+                    writer_queue.put((
+                        embeddings,
+                        sub_docs,
+                        [metadatas[i] for i in idx] if metadatas else None,
+                        [ids[i] for i in idx]
+                    ))
+            finally:
+                writer_queue.put(None)
+                writer.join()
+                self._count_cache = None  # 문서 수 변경 → 다음 검색 시 다시 조회
+                self._clear_search_cache()  # 적재 전 검색 결과 재사용 방지
+            if errors:
+                raise errors[0]
             
             print(f"[VectorStore] Saved {len(documents)} documents to {self.collection_name}.")
+            return ids
             
         except Exception as e:
             print(f"[VectorStore][ERROR] add_documents failed: {e}")
             raise e
 
-    def similarity_search(self, query: str, k: int = 5, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def _write_batches(self, writer_queue: "queue.Queue[Optional[tuple]]", errors: List[BaseException], write_scan: bool = True) -> None:
+        """
+        writer 스레드 본체 - 큐에서 (임베딩, 문서, 메타데이터, ID)를 꺼내 저장 (None 수신 시 종료)
+        - write_scan이 False이면 FP16 사이드 인덱스 파일은 갱신하지 않음
+        - 저장 실패 시 예외를 errors에 기록하고, 남은 항목은 저장 없이 소비 (생산자 블로킹 방지)
+        """
+        while True:
+            item = writer_queue.get()
+            if item is None:
+                return
+            if errors:
+                continue
+            embeddings, sub_docs, sub_metadatas, sub_ids = item
+            try:
+                # ChromaDB에 추가 (임베딩을 직접 전달 → 컬렉션 내부 임베딩 함수 미사용)
+                self.collection.add(
+                    documents=sub_docs,
+                    embeddings=embeddings,
+                    metadatas=sub_metadatas,
+                    ids=sub_ids
+                )
+                if write_scan:
+                    self._append_scan_index(embeddings, sub_ids)
+            except BaseException as e:
+                errors.append(e)
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        include: tuple = DEFAULT_INCLUDE
+    ) -> List[Dict[str, Any]]:
         """
         유사도 검색
         
@@ -124,35 +645,355 @@ class VectorStore:
             query: 검색 쿼리
             k: 반환할 문서 수
             filter: 메타데이터 필터링
+            include: 조회할 필드 (예: 재랭킹에 metadata가 불필요하면 ("documents", "distances"))
+                     제외된 필드는 빈 값("" / {} / 0.0)으로 채워짐
             
         Returns:
             List[Dict]: {page_content: str, metadata: dict, distance: float}
         """
         try:
             # 쿼리 임베딩
-            query_embedding = self.embedding_model.encode(query, convert_to_numpy=True).tolist()
-            
-            # 검색
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=k,
-                where=filter, # 메타데이터 필터
-                include=["documents", "metadatas", "distances"]
-            )
+            query_embedding = self._encode_query(query)
+            
+            # 시맨틱 캐시 확인 (같은 필터/k에서 거의 같은 질의면 HNSW 검색 생략)
+            cache_key = (json.dumps(filter, sort_keys=True) if filter else None, k)
+            if include != DEFAULT_INCLUDE:
+                cache_key += (tuple(include),)
+            cached = self._search_cache_get(cache_key, query_embedding)
+            if cached is not None:
+                return cached
+            
+            # 검색 (소규모 + 필터 없음 → 사이드 인덱스 전수 탐색, 그 외 HNSW)
+            results = self._scan_query(query_embedding, self._n_candidates(k), include) if filter is None else None
+            if results is None:
+                results = self.collection.query(
+                    query_embeddings=query_embedding[None, :],
+                    n_results=self._n_candidates(k),
+                    where=filter, # 메타데이터 필터
+                    include=list(include)
+                )
             
             # 결과 변환
             # ChromaDB query returns list of lists (one per query)
-            docs = []
-            if results["documents"]:
-                for i in range(len(results["documents"][0])):
-                    docs.append({
-                        "content": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                        "distance": results["distances"][0][i] if results["distances"] else 0.0
-                    })
-                
-            return docs
+            docs = self._rerank(query, self._to_docs(results, 0), k)
+            
+            self._search_cache_put(cache_key, query_embedding, docs)
+            return list(docs)
             
         except Exception as e:
             print(f"[VectorStore][ERROR] similarity_search failed: {e}")
             return []
+    
+    def similarity_search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        여러 쿼리를 한 번에 검색 (임베딩 1회 배치 + ChromaDB 쿼리 1회)
+        - 검색 결과 캐시 적중 쿼리는 ChromaDB 쿼리에서 제외 (_search_batch)
+        
+        Returns:
+            쿼리 순서대로 similarity_search 결과 리스트
+        """
+        if not queries:
+            return []
+        try:
+            return self._search_batch([(q, k, filter) for q in queries])
+        except Exception as e:
+            print(f"[VectorStore][ERROR] similarity_search_many failed: {e}")
+            return [[] for _ in queries]
+    
+    async def asimilarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        마이크로 배칭 비동기 검색 - 동시에 들어온 쿼리들을 모아 한 번에 임베딩/검색
+        (동기 similarity_search와 결과 형식 동일)
+        """
+        batcher = self._batcher
+        if batcher is None or batcher.loop is not asyncio.get_running_loop():
+            batcher = self._batcher = QueryBatcher(self)
+        return await batcher.submit(query, k, filter)
+    
+    def _search_batch(self, requests: List[tuple]) -> List[List[Dict[str, Any]]]:
+        """
+        (query, k, filter) 요청 목록을 일괄 처리 (QueryBatcher 워커 스레드에서 호출)
+        - 길이순 정렬 후 임베딩 (패딩 낭비 최소화)
+        - 캐시 적중 요청은 제외, 나머지는 (k, filter)별로 검색 1회
+          (필터 없는 그룹은 사이드 인덱스 행렬곱 1회, 그 외 ChromaDB 쿼리 1회)
+        """
+        import numpy as np
+        
+        order = sorted(range(len(requests)), key=lambda i: len(requests[i][0]))
+        sorted_embeddings = self._encode([requests[i][0] for i in order], batch_size=len(order))
+        embeddings = [None] * len(requests)
+        for pos, i in enumerate(order):
+            embeddings[i] = sorted_embeddings[pos]
+        
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(requests)
+        groups: Dict[tuple, List[int]] = {}
+        for i, (_, k, filter) in enumerate(requests):
+            cache_key = (json.dumps(filter, sort_keys=True) if filter else None, k)
+            cached = self._search_cache_get(cache_key, embeddings[i])
+            if cached is not None:
+                results[i] = cached
+            else:
+                groups.setdefault(cache_key, []).append(i)
+        
+        for cache_key, indices in groups.items():
+            _, k, filter = requests[indices[0]]
+            query_results = None
+            if filter is None:
+                query_results = self._scan_query_many(
+                    np.stack([embeddings[i] for i in indices]), self._n_candidates(k), DEFAULT_INCLUDE
+                )
+            if query_results is None:
+                query_results = self.collection.query(
+                    query_embeddings=[embeddings[i] for i in indices],
+                    n_results=self._n_candidates(k),
+                    where=filter,
+                    include=list(DEFAULT_INCLUDE)
+                )
+            for qi, i in enumerate(indices):
+                docs = self._rerank(requests[i][0], self._to_docs(query_results, qi), k)
+                self._search_cache_put(cache_key, embeddings[i], docs)
+                results[i] = list(docs)
+        
+        return results
+    
+    async def asearch(self, query: str, k: int = 5, filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """similarity_search 비동기 버전 (임베딩/검색을 스레드풀에서 실행 → 이벤트 루프 비차단)"""
+        return await asyncio.to_thread(self.similarity_search, query, k, filter)
+    
+    async def asearch_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """similarity_search_many 비동기 버전"""
+        return await asyncio.to_thread(self.similarity_search_many, queries, k, filter)
+    
+    # ---------------------------------------------------------
+    # FP16 사이드 인덱스 (전수 탐색)
+    # ---------------------------------------------------------
+    
+    def _append_scan_index(self, embeddings: "np.ndarray", ids: List[str]) -> None:
+        """저장한 임베딩을 FP16으로 사이드 인덱스 파일 끝에 추가"""
+        import numpy as np
+        
+        with self._scan_lock:
+            with open(self._scan_vectors_path, "ab") as f:
+                f.write(embeddings.astype(np.float16).tobytes())
+            with open(self._scan_ids_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{doc_id}\n" for doc_id in ids))
+            self._scan_index = None  # 다음 탐색 시 다시 매핑
+    
+    def _load_scan_index(self) -> Optional[tuple]:
+        """사이드 인덱스 로드 (FP16 파일 → float32 행렬 1회 변환, 파일이 없거나 개수가 맞지 않으면 None)"""
+        import numpy as np
+        
+        with self._scan_lock:
+            if self._scan_index is None:
+                if not (os.path.exists(self._scan_vectors_path) and os.path.exists(self._scan_ids_path)):
+                    return None
+                with open(self._scan_ids_path, encoding="utf-8") as f:
+                    ids = f.read().split()
+                dim = self.embedding_model.get_sentence_embedding_dimension()
+                matrix = np.memmap(self._scan_vectors_path, dtype=np.float16, mode="r").reshape(-1, dim)
+                if len(ids) != matrix.shape[0]:
+                    return None
+                if USE_GPU_SCAN and str(self.embedding_model.device).startswith("cuda"):
+                    import torch
+                    matrix = torch.from_numpy(np.ascontiguousarray(matrix)).to(self.embedding_model.device)
+                else:
+                    matrix = np.asarray(matrix, dtype=np.float32)  # BLAS float32 행렬곱 사용
+                self._scan_index = (matrix, ids)
+            return self._scan_index
+    
+    def scan_topk(self, query_embedding: "np.ndarray", k: int) -> Optional[tuple]:
+        """
+        FP16 사이드 인덱스 전수 탐색 (정규화 벡터 내적 → ip 거리와 동일한 1 - score)
+        
+        Returns:
+            (ID 리스트, 거리 리스트) - 거리 오름차순, 사이드 인덱스가 컬렉션과 불일치하면 None
+        """
+        hits = self.scan_topk_many(query_embedding[None, :], k)
+        return None if hits is None else hits[0]
+    
+    def scan_topk_many(self, query_embeddings: "np.ndarray", k: int) -> Optional[List[tuple]]:
+        """
+        여러 쿼리를 행렬곱 1회로 전수 탐색 ((B, d) x (d, N) → 쿼리별 top-k)
+        - 사이드 인덱스가 GPU에 있으면 행렬곱과 top-k 모두 GPU에서 실행
+        
+        Returns:
+            쿼리 순서대로 (ID 리스트, 거리 리스트), 사이드 인덱스가 컬렉션과 불일치하면 None
+        """
+        import numpy as np
+        
+        index = self._load_scan_index()
+        if index is None:
+            return None
+        matrix, ids = index
+        if len(ids) != self._cached_count():
+            return None  # 사이드 인덱스 도입 전 적재분 등 → HNSW 사용
+        
+        k = min(k, len(ids))
+        if k == 0:
+            return [([], []) for _ in range(len(query_embeddings))]
+        if isinstance(matrix, np.ndarray):
+            scores = np.asarray(query_embeddings, dtype=np.float32) @ matrix.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+        else:
+            import torch
+            with torch.inference_mode():
+                queries = torch.from_numpy(np.asarray(query_embeddings, dtype=np.float16)).to(matrix.device)
+                scores = (queries @ matrix.T).float()
+                top_scores, top = torch.topk(scores, k, dim=1)
+            top_scores, top = top_scores.cpu().numpy(), top.cpu().numpy()
+        return [([ids[i] for i in row], (1.0 - row_scores).tolist()) for row, row_scores in zip(top, top_scores)]
+    
+    def _scan_query(self, query_embedding: "np.ndarray", n_results: int, include: tuple) -> Optional[Dict[str, Any]]:
+        """scan_topk 결과를 collection.query와 같은 형식으로 변환 (문서/메타데이터는 get 1회)"""
+        return self._scan_query_many(query_embedding[None, :], n_results, include)
+    
+    def _scan_query_many(self, query_embeddings: "np.ndarray", n_results: int, include: tuple) -> Optional[Dict[str, Any]]:
+        """scan_topk_many 결과를 collection.query(다중 쿼리)와 같은 형식으로 변환 (전체 쿼리의 문서를 get 1회)"""
+        if self._cached_count() >= SCAN_MAX_DOCS:
+            return None
+        hits = self.scan_topk_many(query_embeddings, n_results)
+        if hits is None:
+            return None
+        
+        unique_ids = list(dict.fromkeys(doc_id for ids, _ in hits for doc_id in ids))
+        fields = [f for f in include if f != "distances"]
+        fetched = self.collection.get(ids=unique_ids, include=fields) if fields else {"ids": unique_ids}
+        if len(fetched["ids"]) != len(unique_ids):
+            return None  # 사이드 인덱스와 컬렉션 불일치 (삭제된 문서 등)
+        pos = {doc_id: i for i, doc_id in enumerate(fetched["ids"])}
+        
+        results: Dict[str, Any] = {"ids": [ids for ids, _ in hits]}
+        for field in fields:
+            values = fetched.get(field)
+            results[field] = [[values[pos[doc_id]] for doc_id in ids] for ids, _ in hits] if values else None
+        results["distances"] = [distances for _, distances in hits] if "distances" in include else None
+        return results
+    
+    @staticmethod
+    def _n_candidates(k: int) -> int:
+        """HNSW에서 가져올 후보 수 (재랭킹 사용 시 k의 배수)"""
+        return k * RERANK_CANDIDATE_FACTOR if USE_RERANKER else k
+    
+    def _rerank(self, query: str, docs: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+        """
+        Cross-Encoder로 (query, content) 쌍을 점수화하여 상위 k개 반환
+        - distance는 HNSW 값 그대로 유지 (하위 임계값 필터 호환), 재랭킹 점수는 rerank_score에 기록
+        - 재랭킹 미사용이거나 실패 시 HNSW 순서의 상위 k개
+        """
+        if not USE_RERANKER or len(docs) <= 1:
+            return docs[:k]
+        try:
+            import torch
+            
+            with torch.inference_mode():
+                scores = _get_reranker().predict(
+                    [(query, d["content"]) for d in docs],
+                    batch_size=RERANK_BATCH_SIZE,
+                    show_progress_bar=False
+                )
+            ranked = sorted(zip(scores, docs), key=lambda x: x[0], reverse=True)[:k]
+            for score, doc in ranked:
+                doc["rerank_score"] = float(score)
+            return [doc for _, doc in ranked]
+        except Exception as e:
+            print(f"[VectorStore][WARN] 재랭킹 실패, HNSW 순서 사용: {e}")
+            return docs[:k]
+    
+    @staticmethod
+    def _to_docs(results: Dict[str, Any], qi: int) -> List[Dict[str, Any]]:
+        """ChromaDB query 결과에서 qi번째 쿼리의 문서 리스트 추출"""
+        if not results["ids"]:
+            return []
+        # 세 리스트를 zip으로 한 번에 순회 (결과마다 results[...][qi][i] 인덱싱 반복 제거)
+        # include에서 제외된 필드는 repeat로 기본값 공급
+        n = len(results["ids"][qi])
+        documents = results["documents"][qi] if results.get("documents") else repeat("", n)
+        metadatas = results["metadatas"][qi] if results.get("metadatas") else repeat(None, n)
+        distances = results["distances"][qi] if results.get("distances") else repeat(0.0, n)
+        return [
+            {"content": c, "metadata": m or {}, "distance": d}
+            for c, m, d in zip(documents, metadatas, distances)
+        ]
+    
+    def _clear_search_cache(self) -> None:
+        """시맨틱 검색 캐시 전체 삭제 (문서 추가 후 이전 검색 결과가 반환되지 않도록)"""
+        with self._search_cache_lock:
+            self._search_cache.clear()
+            self._search_cache_size = 0
+    
+    def _search_cache_get(self, cache_key: tuple, query_embedding: "np.ndarray") -> Optional[List[Dict[str, Any]]]:
+        """
+        시맨틱 캐시 조회 - 캐시된 임베딩과의 최대 코사인 유사도가 임계값 이상이면 결과 반환
+        (정규화된 벡터이므로 코사인 = 내적)
+        """
+        import numpy as np
+        
+        with self._search_cache_lock:
+            bucket = self._search_cache.get(cache_key)
+            if not bucket:
+                return None
+            
+            entry_ids = list(bucket)
+            keys = np.stack([bucket[entry_id][0] for entry_id in entry_ids])
+            scores = np.einsum("nd,d->n", keys, query_embedding)
+            best = int(scores.argmax())
+            if scores[best] < SEARCH_CACHE_THRESHOLD:
+                return None
+            
+            # 최근 사용 항목으로 갱신 (새 ID로 재삽입 → 버킷 내 ID 오름차순 = LRU 순서 유지)
+            entry = bucket.pop(entry_ids[best])
+            self._search_cache_seq += 1
+            bucket[self._search_cache_seq] = entry
+            return list(entry[1])
+    
+    def _search_cache_put(self, cache_key: tuple, query_embedding: "np.ndarray", docs: List[Dict[str, Any]]) -> None:
+        """시맨틱 캐시 저장 (전체 항목 수가 SEARCH_CACHE_SIZE를 넘으면 가장 오래 안 쓴 항목 제거)"""
+        with self._search_cache_lock:
+            self._search_cache_seq += 1
+            self._search_cache.setdefault(cache_key, OrderedDict())[self._search_cache_seq] = (query_embedding, docs)
+            self._search_cache_size += 1
+            
+            if self._search_cache_size > SEARCH_CACHE_SIZE:
+                # 항목 ID는 단조 증가 → 각 버킷의 첫 항목 중 ID가 가장 작은 것이 LRU
+                oldest_key = min(
+                    self._search_cache,
+                    key=lambda key: next(iter(self._search_cache[key]))
+                )
+                oldest_bucket = self._search_cache[oldest_key]
+                oldest_bucket.popitem(last=False)
+                if not oldest_bucket:
+                    del self._search_cache[oldest_key]
+                self._search_cache_size -= 1
+
+
+# -------------------------------------------------------------
+# Singleton Accessor
+# -------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """
+    프로세스 전역 VectorStore 싱글톤 반환
+    - 임베딩 모델 로드(GPU 메모리)와 ChromaDB 클라이언트 생성은 최초 호출 시 1회만 수행
+    - encode()는 CUDA 연산 중 GIL을 해제하므로 여러 요청 스레드에서 공유해도 안전
+    """
+    return VectorStore()
@@ -9,7 +9,7 @@ Issue/Note  : 외부 패키지(tests, app 등)에서 접근하기 쉬운 인터
 from .chain import RAGChain
 from .retriever import create_retriever, load_vector_db
 from .rewrite import create_rewrite_chain, rewrite_query, format_history
-from .answer import create_answer_chain, generate_answer, format_sources
+from .answer import create_answer_chain, generate_answer, agenerate_answer, format_sources, quick_reply, crisis_reply, should_retrieve
 from .intent_router import route_query, classify_intent, QueryIntent
 
 __all__ = [
@@ -21,7 +21,11 @@ __all__ = [
     "format_history",
     "create_answer_chain",
     "generate_answer",
+    "agenerate_answer",
     "format_sources",
+    "quick_reply",
+    "crisis_reply",
+    "should_retrieve",
     "route_query",
     "classify_intent",
     "QueryIntent",
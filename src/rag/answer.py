@@ -11,15 +11,21 @@ Issue/Note  : docs/DATABASE_DESIGN.md를 참고, src/database/db_manager.py 내
 # -------------------------------------------------------------
 
 import os
+import re
 import sys
 
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from typing import List, Dict, Optional, Any
+if __name__ == "__main__":
+    # 스크립트 직접 실행 시에만 프로젝트 루트를 경로에 추가 (패키지 import 시에는 불필요)
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, AsyncIterator
 
 from src.database.vector_store import VectorStore
 from src.database import db_manager
 from config.model_config import create_chat_model
+from src.rag.prompts import PROMPT_DETAILED, ANSWER_USER_PROMPT
+from src.rag.intent_router import DIRECT_RESPONSES, QueryIntent
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
@@ -27,64 +33,80 @@ from langchain_core.output_parsers import StrOutputParser
 # Constants
 # -------------------------------------------------------------
 
-SYSTEM_PROMPT = """\
-[역할]
-당신은 '마음챙김' 심리 상담 AI입니다.
-RAG(검색 증강 생성)를 통해 이전 상담 내역을 참고하여 답변합니다.
-
-[RAG 검색 결과 처리 규칙 - 매우 중요]
-1. 제공된 Context에 "[전문가 상담 가이드]"가 포함되어 있다면:
-   - **가장 높은 우선순위**로 해당 가이드의 **구체적인 상담 기법(예: 점수 매기기, 호흡법, 특정 질문법 등)**을 답변에 적용하세요.
-   - **금지 사항:** 검색된 기법이 있는데도 불구하고 "산책하세요", "음악을 들으세요" 같은 뻔하고 일반적인 조언을 하지 마세요.
-   - **[문맥 자연스럽게 다듬기 - 필수]**: 검색된 텍스트의 어투가 대화의 흐름과 맞지 않거나 어색하다면(예: "그걸 계속 체크하는 게요"), **반드시 자연스럽고 정중한 상담 톤으로 수정**하여 표현하세요.
-   - 검색된 사례에서 상담사가 0~10점 척도를 사용했다면, 당신도 정확히 그 기법을 사용하여 질문하세요.
-   - 단순히 내용을 요약하는 것이 아니라, 당신이 그 전문 상담사가 된 것처럼 그 기법을 실연(Role-play)하세요.
-
-2. 제공된 Context가 "관련된 상담 내역이 없습니다."라고 되어 있다면:
-   - 검색 결과를 무시하고, 당신의 전문적인 심리 상담 지식을 바탕으로 공감하고 조언하세요.
-   - "검색 결과가 없다"는 말을 사용자에게 절대 하지 마세요.
-
-[최우선 규칙]
-1. 응답은 3~5문장 정도로, 충분한 공감과 제안을 담으세요. 따옴표로 감싸지 마세요.
-2. [서식 - 중요]
-   - **공감 멘트와 후속 질문은 '글머리 기호(-)'를 절대 사용하지 마세요.** 문단 형태로 자연스럽게 쓰세요.
-   - **해결책 제안**이나 **나열이 필요한 경우**에만 글머리 기호(-)를 사용하세요.
-3. 정치, 뉴스, 기술 등 상담 외 주제는 언급 금지.
-4. 답변은 따뜻하고 전문적인 심리 상담가처럼 작성하세요.
-5. 해결책 제안 시, 줄바꿈을 하여 명확하게 구분해 주세요.
-6. [선택] 대화의 흐름상 자연스러울 때만 "개방형 후속 질문"을 덧붙이세요. (매번 질문하지 않아도 됩니다.)
-7. [중요] 이전 대화 내역을 확인하여, 이미 제안한 해결책(예: 심호흡, 안정화 기법 등)을 앵무새처럼 반복하지 마세요. 대신 다른 새로운 방법을 제안하거나, 사용자의 증상에 맞춰 더 구체적인 조언을 해주세요.
-
-[구조 가이드]
-(공감 멘트 - 글머리 기호 없이 자연스럽게)
-(줄바꿈)
-(전문가 상담 가이드를 반영한 구체적 해결책/기법 제안 - 필요시 글머리 기호 사용)
-(줄바꿈)
-(필요 시 후속 질문 - 글머리 기호 없이)
-
-[거절 감지 - 가장 중요]
-싫어, 싫다, 싫다고, 그만, 됐어, 몰라 등이 포함되면:
-→ 반드시 알겠어요. 한 문장만 응답
-→ 그 외 어떤 말도 붙이지 마세요
-→ 조언, 설명, 질문 금지
-
-[화남 감지]
-시발, 씨발, 짜증, 욕설이 포함되면:
-→ 반드시 괜찮아요. 한 문장만 응답
-
-[위험한 요청]
-자해, 타해, 폭력 방법 요청 → 그건 도움이 되지 않아요.
-이후 사용자가 할 수 있을거야, 해줘 등 재요청 → 도와드리기 어려워요.
-
-당신은 공감적이고 따뜻한 심리 상담 전문가입니다.
-사용자의 감정을 깊이 이해하고, 대화가 자연스럽게 이어지도록 반응하세요.
-지나친 질문보다는 깊은 공감과 경청을 우선시하세요."""
+# 하위 호환: 기존 SYSTEM_PROMPT 이름 유지
+SYSTEM_PROMPT = PROMPT_DETAILED
+
+# 상담사례 블록 구분자
+_SEP = "\n\n---\n\n"
+
+# 고정 응답 패턴 (SYSTEM_PROMPT의 [거절 감지]/[화남 감지] 규칙을 LLM 호출 없이 처리)
+_REFUSAL_PATTERN = re.compile(r"(싫어|싫다|그만|됐어|몰라)")
+_ANGER_PATTERN = re.compile(r"(시발|씨발|짜증|좆|fuck)", re.IGNORECASE)
+# 위기 표현이 섞여 있으면 고정 응답을 쓰지 않음 (예: "다 그만하고 싶어, 죽고 싶어")
+_CRISIS_GUARD_PATTERN = re.compile(r"(죽|자살|자해|살기 싫|사라지고)")
+
+# 위기 패턴 (LLM 호출 없이 고정 응답 + 전문가 연결 기록)
+# - 위험한 방법 요청: SYSTEM_PROMPT [위험한 요청] 규칙의 고정 응답
+# - 위기 표현: intent_router의 CRISIS 응답 (상담전화 안내)
+_DANGEROUS_REQUEST_PATTERN = re.compile(r"(자해|타해|자살|폭력|죽는|목\s*매는)\s*(하는\s*)?(방법|법)")
+_CRISIS_PATTERN = re.compile(r"(자해|자살|죽고\s*싶|목\s*매|살고\s*싶지\s*않|살기\s*싫)")
+
+DANGEROUS_REQUEST_REPLY = "그건 도움이 되지 않아요."
+CRISIS_REPLY = DIRECT_RESPONSES[QueryIntent.CRISIS][0]
+
+# 전문가 연결 트리거 태그 (사용자에게 노출하지 않음)
+REFERRAL_TAG = "[EXPERT_REFERRAL_NEEDED]"
+
+# 이 길이 미만의 짧은 발화("응", "고마워" 등)는 검색 결과가 답변에 도움이 되지 않음
+MIN_RETRIEVAL_QUERY_LEN = 8
+
+REFUSAL_REPLY = "알겠어요."
+ANGER_REPLY = "괜찮아요."
 
 
 # -------------------------------------------------------------
 # answer helper functions
 # -------------------------------------------------------------
 
+def crisis_reply(query: str) -> Optional[str]:
+    """
+    위험한 방법 요청/위기 표현이면 고정 응답을 반환 (호출자가 전문가 연결 기록)
+    
+    Returns:
+        고정 응답 문자열, 해당하지 않으면 None
+    """
+    if _DANGEROUS_REQUEST_PATTERN.search(query):
+        return DANGEROUS_REQUEST_REPLY
+    if _CRISIS_PATTERN.search(query):
+        return CRISIS_REPLY
+    return None
+
+def quick_reply(query: str) -> Optional[str]:
+    """
+    거절/화남 표현이면 고정 응답을 반환 (검색 + LLM 호출 생략)
+    
+    Returns:
+        고정 응답 문자열, 해당하지 않으면 None
+    """
+    if _CRISIS_GUARD_PATTERN.search(query):
+        return None
+    if _REFUSAL_PATTERN.search(query):
+        return REFUSAL_REPLY
+    if _ANGER_PATTERN.search(query):
+        return ANGER_REPLY
+    return None
+
+def should_retrieve(query: str) -> bool:
+    """
+    벡터 검색이 필요한 발화인지 판단 (짧은 발화/고정 응답 대상이면 False → docs=[]로 호출)
+    - PROMPT_BRIEF처럼 검색 결과 없이도 답변하는 프롬프트에서 임베딩 + HNSW 검색 생략용
+    """
+    return (
+        len(query.strip()) >= MIN_RETRIEVAL_QUERY_LEN
+        and crisis_reply(query) is None
+        and quick_reply(query) is None
+    )
+
 def format_sources(docs: List[Dict]) -> str:
     """
     검색된 문서 리스트를 프롬프트에 입력하기 좋은 문자열 형태로 변환
@@ -98,19 +120,15 @@ def format_sources(docs: List[Dict]) -> str:
     if not docs:
         return "검색된 관련 문서가 없습니다."
     
-    # 실제 content가 있는 문서만 필터링
-    valid_docs = [doc for doc in docs if doc.get("content", "").strip()]
-    
-    if not valid_docs:
-        return "검색된 관련 문서가 없습니다."
+    # 실제 content가 있는 문서만 필터링 (제너레이터 - enumerate에서 한 번만 소비)
+    valid_docs = (doc for doc in docs if doc.get("content", "").strip())
 
-    formatted_docs = []
-    for i, doc in enumerate(valid_docs):
+    parts: List[str] = []
+    for i, doc in enumerate(valid_docs, 1):
         content = doc.get("content", "").strip()
         
         # 메타데이터에서 사용 가능한 정보 추출 (실제 VectorDB 키 사용)
         metadata = doc.get("metadata", {})
-        session_id = metadata.get("session_id", "")
         category = metadata.get("default_category") or metadata.get("category", "")
         
         # [Context Construction]
@@ -121,25 +139,20 @@ def format_sources(docs: List[Dict]) -> str:
         counselor_response = metadata.get("counselor_response", "")
         
         # 문맥이 있으면 사용, 없으면 content만 사용
-        if context_text:
-            # context_text에는 이미 "상담사: ... \n 내담자: ..." 형태가 포함되어 있을 수 있음
-            # preprocess_data.py의 build_window_text 확인 필요
-            # 중복 방지를 위해 context_text 사용
-            display_text = context_text
-        else:
-            display_text = f"내담자: {content}"
-            
-        if counselor_response:
-             display_text += f"\n[전문가 상담 가이드]: {counselor_response}"
+        # (context_text에는 이미 "상담사: ... \n 내담자: ..." 형태가 포함되어 있음 - build_window_text 참고)
+        display_text = context_text or f"내담자: {content}"
         
-        # 간결한 포맷: 핵심 내용만 전달
-        if category:
-            doc_str = f"[상담사례 {i+1} - {category}]\n{display_text}"
-        else:
-            doc_str = f"[상담사례 {i+1}]\n{display_text}"
-        formatted_docs.append(doc_str)
+        # 간결한 포맷: 핵심 내용만 전달 (문서당 f-string 한 번으로 조립)
+        parts.append(
+            f"[상담사례 {i}{' - ' + category if category else ''}]\n"
+            f"{display_text}"
+            f"{chr(10) + '[전문가 상담 가이드]: ' + counselor_response if counselor_response else ''}"
+        )
+    
+    if not parts:
+        return "검색된 관련 문서가 없습니다."
         
-    return "\n\n---\n\n".join(formatted_docs)
+    return _SEP.join(parts)
 
 def format_history(history: List[Dict]) -> str:
     """
@@ -148,51 +161,51 @@ def format_history(history: List[Dict]) -> str:
     if not history:
         return ""
     
-    formatted = []
-    for msg in history:
-        role = msg.get("role", "unknown")
-        content = msg.get("content", "")
-        # role 표시: user -> 사용자, assistant -> 상담사 (프롬프트 톤앤매너에 맞춤)
-        display_role = "사용자" if role == "user" else "상담사"
-        formatted.append(f"{display_role}: {content}")
-        
-    return "\n".join(formatted)
+    # role 표시: user -> 사용자, assistant -> 상담사 (프롬프트 톤앤매너에 맞춤)
+    return "\n".join(
+        f"{'사용자' if msg.get('role') == 'user' else '상담사'}: {msg.get('content', '')}"
+        for msg in history
+    )
 
 
 # -------------------------------------------------------------
 # LCEL Chain Factory
 # -------------------------------------------------------------
 
-def create_answer_chain(model):
+@lru_cache(maxsize=8)
+def _build_prompt(system_prompt: str) -> ChatPromptTemplate:
+    """시스템 프롬프트별 ChatPromptTemplate (템플릿은 불변이므로 프롬프트당 한 번만 파싱)"""
+    return ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("user", ANSWER_USER_PROMPT)
+    ])
+
+# (id(model), prompt) -> (model, chain). model을 함께 보관하여 id 재사용으로 인한 오매칭 방지
+_CHAIN_CACHE: Dict[tuple, tuple] = {}
+_CHAIN_CACHE_SIZE = 8
+
+def create_answer_chain(model, prompt: str = PROMPT_DETAILED):
     """
     LCEL 방식의 Answer Chain 생성
     Chain: Prompt | Model | StrOutputParser
+    
+    Args:
+        prompt: 시스템 프롬프트 (PROMPT_DETAILED / PROMPT_BRIEF, src/rag/prompts.py)
     """
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", SYSTEM_PROMPT),
-        ("user", """\   
-[검색된 문서(Context)]
-{context}
-
-[이전 대화(History)]
-{history}
-
-[사용자 질문]
-{query}
-
-위 문서를 바탕으로 사용자 질문에 답변해주세요.
-
-[EXPERT_REFERRAL_NEEDED 태그 조건 - 매우 엄격하게 적용]
-다음 조건 중 하나라도 해당할 때만 답변 끝에 "[EXPERT_REFERRAL_NEEDED]" 태그를 붙이세요:
-1. 사용자가 자살, 죽고 싶다, 사라지고 싶다 등 극단적 표현을 직접 언급한 경우
-2. 자해 행위를 하고 있거나 하려고 한다고 언급한 경우
-3. 타인을 해치고 싶다고 언급한 경우
-
-주의: "힘들어", "우울해", "슬퍼", "지쳐" 같은 일반적인 감정 표현에는 태그를 붙이지 마세요. 이런 일반적인 감정은 상담으로 충분히 도울 수 있습니다.
-""")
-    ])
+    return _build_prompt(prompt) | model | StrOutputParser()
+
+def _get_chain(model, prompt: str = PROMPT_DETAILED):
+    """(모델 객체, 프롬프트)별로 Answer Chain을 캐싱하여 반환"""
+    key = (id(model), prompt)
+    cached = _CHAIN_CACHE.get(key)
+    if cached is not None and cached[0] is model:
+        return cached[1]
     
-    chain = prompt | model | StrOutputParser()
+    if len(_CHAIN_CACHE) >= _CHAIN_CACHE_SIZE:
+        _CHAIN_CACHE.pop(next(iter(_CHAIN_CACHE)))
+    
+    chain = create_answer_chain(model, prompt)
+    _CHAIN_CACHE[key] = (model, chain)
     return chain
 
 # -------------------------------------------------------------
@@ -205,12 +218,23 @@ def generate_answer(
     history: Optional[List[Dict]] = None,
     session_id: Optional[int] = None,
     db: Optional[Any] = None,
-    model=None
+    model=None,
+    prompt: str = PROMPT_DETAILED
 ) -> str:
     """
     정해진 프롬프트를 따라서 사용자의 질문에 대한 답변을 생성합니다.
     (LCEL create_answer_chain을 내부적으로 사용하는 래퍼 함수)
     """
+    # 0) 위기 → 고정 응답 + 전문가 연결 기록, 거절/화남 → 고정 응답 (모델 초기화/LLM 호출 불필요)
+    crisis = crisis_reply(query)
+    if crisis is not None:
+        _log_referral(session_id, db, "위기 키워드 감지 - 전문 상담사 연결 권장")
+        return crisis
+    
+    canned = quick_reply(query)
+    if canned is not None:
+        return canned
+    
     # 1) model 준비
     if model is None:
         try:
@@ -226,39 +250,118 @@ def generate_answer(
 
     # 4) LCEL 실행
     try:
-        chain = create_answer_chain(model)
+        chain = _get_chain(model, prompt)
         answer = chain.invoke({
             "context": context_text,
             "history": history_text,
             "query": query
         })
-        answer = answer.strip()
         
         # 6) 전문가 연결 트리거 확인
-        if "[EXPERT_REFERRAL_NEEDED]" in answer:
-            # 태그 제거
-            answer = answer.replace("[EXPERT_REFERRAL_NEEDED]", "").strip()
+        return _handle_referral(answer.strip(), session_id, db)
+        
+    except Exception as e:
+        return f"[Error] 답변 생성 중 오류가 발생했습니다: {str(e)}"
+
+async def agenerate_answer(
+    docs: List[Dict],
+    query: str,
+    history: Optional[List[Dict]] = None,
+    session_id: Optional[int] = None,
+    db: Optional[Any] = None,
+    model=None,
+    prompt: str = PROMPT_DETAILED
+) -> AsyncIterator[str]:
+    """
+    generate_answer의 스트리밍 버전 (chain.astream으로 토큰 도착 즉시 yield)
+    
+    전문가 연결 태그는 사용자에게 노출되지 않도록 스트림 중에 보류했다가
+    스트림 종료 후 제거하고, DB 기록은 generate_answer와 동일하게 처리합니다.
+    """
+    crisis = crisis_reply(query)
+    if crisis is not None:
+        _log_referral(session_id, db, "위기 키워드 감지 - 전문 상담사 연결 권장")
+        yield crisis
+        return
+    
+    canned = quick_reply(query)
+    if canned is not None:
+        yield canned
+        return
+    
+    if model is None:
+        try:
+            model = create_chat_model()
+        except Exception:
+            yield "[Error] 모델을 초기화할 수 없습니다. (model_config.py 확인 필요)"
+            return
+
+    context_text = format_sources(docs)
+    history_text = format_history(history) if history else "없음"
+
+    answer_parts: List[str] = []
+    pending = ""
+    try:
+        async for chunk in _get_chain(model, prompt).astream({
+            "context": context_text,
+            "history": history_text,
+            "query": query
+        }):
+            answer_parts.append(chunk)
+            pending += chunk
             
-            # DB에 기록
-            if db and session_id:
-                try:
-                    db.create_expert_referral(
-                        session_id=session_id,
-                        severity_level="high", # LLM 판단 기반이므로 일단 high로 설정하거나 별도 로직 필요
-                        recommended_action="전문 상담사 연결 권장"
-                    )
-                    # 안내 멘트 추가 (이미 답변에 포함되어 있을 수 있으나 확실히 하기 위해)
-                    # referral_msg = "\n\n(전문가와의 상담이 필요해 보여 전문 상담 센터 정보를 준비하고 있습니다.)"
-                    referral_msg=" "
-                    if "상담" not in answer:
-                         answer += referral_msg
-                except Exception as e:
-                    print(f"[Error] Expert referral logging failed: {e}")
+            # 마지막 '['부터가 태그(또는 태그의 앞부분)일 수 있으면 보류
+            cut = pending.rfind("[")
+            tail = pending[cut:] if cut != -1 else ""
+            if tail and (REFERRAL_TAG.startswith(tail) or tail.startswith(REFERRAL_TAG)):
+                emit, pending = pending[:cut], tail
+            else:
+                emit, pending = pending, ""
+            if emit:
+                yield emit
+    except Exception as e:
+        yield f"[Error] 답변 생성 중 오류가 발생했습니다: {str(e)}"
+        return
+    
+    # 보류된 꼬리에서 태그 제거 후 방출
+    pending = pending.replace(REFERRAL_TAG, "").rstrip()
+    if pending:
+        yield pending
+    
+    _handle_referral("".join(answer_parts).strip(), session_id, db)
 
+def _handle_referral(answer: str, session_id: Optional[int], db: Optional[Any]) -> str:
+    """전문가 연결 태그가 있으면 제거하고 DB에 기록"""
+    if REFERRAL_TAG not in answer:
         return answer
-        
+    
+    # 태그 제거
+    answer = answer.replace(REFERRAL_TAG, "").strip()
+    
+    # DB에 기록
+    if _log_referral(session_id, db, "전문 상담사 연결 권장"):
+        # 안내 멘트 추가 (이미 답변에 포함되어 있을 수 있으나 확실히 하기 위해)
+        # referral_msg = "\n\n(전문가와의 상담이 필요해 보여 전문 상담 센터 정보를 준비하고 있습니다.)"
+        referral_msg=" "
+        if "상담" not in answer:
+             answer += referral_msg
+    
+    return answer
+
+def _log_referral(session_id: Optional[int], db: Optional[Any], recommended_action: str) -> bool:
+    """전문가 연결 요청을 DB에 기록 (db/session_id가 없거나 실패 시 False)"""
+    if not (db and session_id):
+        return False
+    try:
+        db.create_expert_referral(
+            session_id=session_id,
+            severity_level="high", # LLM 판단 기반이므로 일단 high로 설정하거나 별도 로직 필요
+            recommended_action=recommended_action
+        )
+        return True
     except Exception as e:
-        return f"[Error] 답변 생성 중 오류가 발생했습니다: {str(e)}"
+        print(f"[Error] Expert referral logging failed: {e}")
+        return False
 
 # -------------------------------------------------------------
 # Entry Point
@@ -10,8 +10,13 @@ Issue/Note  : DB 연결, Rewrite, Retrieve, Answer 모든 단계 통합
 # Imports
 # -------------------------------------------------------------
 
+import hashlib
+import os
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
@@ -19,14 +24,17 @@ from typing import Dict, List, Optional, Any
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from operator import itemgetter
+from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda
 from config.model_config import create_chat_model
 from src.database.db_manager import DatabaseManager
 from src.database.vector_store import VectorStore
 from src.rag.retriever import create_retriever, load_vector_db
-from src.rag.rewrite import create_rewrite_chain, format_history
-from src.rag.answer import create_answer_chain, format_sources
-from src.rag.intent_router import route_query, QueryIntent, should_use_rag
+from src.rag.rewrite import create_rewrite_chain, format_history, needs_rewrite, SessionHistoryCache, REFERENCE_WORDS
+from src.rag.answer import create_answer_chain, format_sources, quick_reply, crisis_reply, REFERRAL_TAG
+from src.rag.semantic_cache import QueryAnswerCache, SemanticCache
+from src.rag.streaming import aiter_in_thread, coalesce_chunks
+from src.rag.intent_router import route_query, QueryIntent, should_use_rag, _quick_classify
 import re
 
 # -------------------------------------------------------------
@@ -40,6 +48,54 @@ SPECIAL_TOKEN_PATTERN = re.compile(
     # r'|\[EXPERT_REFERRAL_NEEDED\]' # 전문가 연결 태그 (내부용)
 )
 
+# 의도 분류 / 질문 재작성 LLM 호출을 동시에 실행하기 위한 스레드풀 (DB 접근 없는 작업만 제출)
+_PIPELINE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rag-pipeline")
+
+# 질문 재작성 결과 캐시 크기 ((히스토리, 질문)이 같으면 재작성 LLM 호출 생략)
+REWRITE_CACHE_SIZE = 2048
+
+# 상담 종료 요약 프롬프트 (정적 지시문은 한 번만 구성, 대화 기록만 채움)
+SUMMARY_PROMPT = PromptTemplate.from_template("""
+[역할]
+당신은 심리 상담 내용을 정리해주는 AI 비서입니다.
+아래 대화 기록을 바탕으로, **상담사가 내담자에게 제안했던 심리적 안정화 기법이나 실질적인 조언들**을 요약해서 정리해 주세요.
+
+[대화 기록]
+{conversation}
+
+[요약 규칙]
+1. 상담사가 제안한 **구체적인 해결책, 기법(예: 호흡법, 점수 매기기 등), 행동 지침**만 추출하세요.
+2. 단순히 "공감해주었다" 같은 내용은 적지 마세요.
+3. 내담자가 실천할 수 있도록 [오늘의 심리 처방] 형식으로 깔끔하게 리스트업 해주세요.
+4. 마지막에는 따뜻한 격려의 한 마디로 마무리하세요.
+
+[출력 형식]
+[오늘의 심리 처방] 📝
+1. (기법 이름): (구체적 방법 요약)
+2. ...
+
+(마무리 격려)
+""")
+
+# 최상위 검색 결과 거리가 이 값 이상이면 관련 데이터 없음으로 보고 LLM 호출 없이 고정 응답
+LOW_SIMILARITY_DISTANCE = 0.65
+LOW_SIMILARITY_REPLY = "해당 질문에는 답변을 드리기 어렵습니다. 다른 질문을 부탁드립니다."
+
+# stream() 문서 필터 기준 거리 (한국어 임베딩 모델(ko-sroberta) 거리 척도에 맞춤)
+SIMILARITY_THRESHOLD = 0.40
+
+# 필터 후 남은 문서가 없을 때 답변 LLM에 넘기는 context
+NO_CONTEXT_TEXT = "관련된 상담 내역이 없습니다. (위로와 공감, 일반적인 심리학 지식에 기반하여 답변하세요)"
+
+# CRISIS 의도인데 Intent Router 고정 응답이 없을 때 사용
+CRISIS_FALLBACK_REPLY = "지금 많이 힘드시군요. 전문 상담사와 이야기해 보시는 것을 권해드려요. 📞 자살예방상담전화: 1393 (24시간)"
+
+# 재작성 결과에서 제거할 감싸는 따옴표
+REWRITE_STRIP_CHARS = "\"'"
+
+# 검색 거리 로그 출력 여부 (RAG_VERBOSE=1 일 때만 - 요청마다 포맷 문자열 생성 방지)
+RAG_VERBOSE = os.getenv("RAG_VERBOSE", "0") == "1"
+
 def filter_special_tokens(text: str) -> str:
     """LLM 출력에서 특수 토큰을 제거합니다."""
     if not text:
@@ -59,6 +115,9 @@ class RAGChain:
     def __init__(self, db_manager: DatabaseManager = None):
         """
         초기화 및 체인 구성
+        
+        Args:
+            db_manager: 요청 간 공유할 DatabaseManager (엔진/커넥션 풀은 프로세스 내에서 공유됨)
         """
         # 1. DB Manager
         self.db = db_manager if db_manager else DatabaseManager()
@@ -74,6 +133,10 @@ class RAGChain:
         rewrite_chain = create_rewrite_chain(self.model)
         answer_chain = create_answer_chain(self.model)
         
+        # stream()에서도 재사용 (요청마다 재생성하지 않음)
+        self._retriever_func = retriever_func
+        self._answer_chain = answer_chain
+        
         # ---------------------------------------------------------
         # RAG 전체 파이프라인 구성 (Compose Full RAG Pipeline)
         # Input: {"query": str, "history_text": str}
@@ -81,54 +144,42 @@ class RAGChain:
         
         # 1. 질문 재작성 (Rewrite)
         # Input: {query, history_text} -> Output: rewritten_query (str)
+        self._rewrite_chain = rewrite_chain
+        self._rewrite_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._rewrite_lock = threading.Lock()
+        
+        # 세션별 히스토리 증분 캐시 (새 메시지만 DB 조회)
+        self._history_cache = SessionHistoryCache(self.db)
         rewrite_step = RunnablePassthrough.assign(
-            rewritten_query=lambda x: rewrite_chain.invoke({
-                "history": x["history_text"], 
-                "query": x["query"]
-            }).strip().strip('"\'').splitlines()[0]
+            rewritten_query=lambda x: self._rewrite(x["history_text"], x["query"])
         )
         
         # 2. 문서 검색 (Retrieve) & Context 포맷팅
-        # Input: {..., rewritten_query} -> Output: source_docs (List), context (Str)
-        def retrieve_and_format(x):
-            docs = retriever_func(query=x["rewritten_query"])
-            
-            is_low_similarity = False
-            
+        # Input: {..., rewritten_query} -> Output: source_docs (List), context (Str), is_low_similarity (bool)
+        def check_low_similarity(docs):
             # [유사도 점수 기반 경고]
             # 유사도(Similarity) <= 0.65 인 경우 경고 (Distance >= 0.65)
-            if docs:
-                first_dist = docs[0].get("distance")
-                if first_dist is not None and first_dist >= 0.65:
-                    print("[Warning] 데이터 내에 유사한 정보가 없어서 임의의 내용을 출력 중입니다.")
-                    is_low_similarity = True
-            else:
-                 print("[Warning] 데이터 내에 유사한 정보가 없어서 임의의 내용을 출력 중입니다.")
-                 is_low_similarity = True
-
-            for i, doc in enumerate(docs):
-                dist = doc.get("distance")
-                if dist is not None:
-                    print(f"[Retrieval] Doc {i+1} distance: {dist:.4f}")
-                else:
-                    print(f"[Retrieval] Doc {i+1} distance: None")
-            return {"source_docs": docs, "context": format_sources(docs), "is_low_similarity": is_low_similarity}
-
+            # 검색 결과는 항상 최상위 "distance"를 가짐 (VectorStore._to_docs)
+            if RAG_VERBOSE and docs:
+                print("[Retrieval] distances: " + ", ".join(f"{doc['distance']:.4f}" for doc in docs))
+            is_low_similarity = not docs or docs[0]["distance"] >= LOW_SIMILARITY_DISTANCE
+            if is_low_similarity:
+                print("[Warning] 데이터 내에 유사한 정보가 없어서 임의의 내용을 출력 중입니다.")
+            return is_low_similarity
+
+        # 검색 1회 → context / is_low_similarity는 검색 결과에서 병렬 계산 (중간 "data" 키 없음)
         retrieve_step = RunnablePassthrough.assign(
-            **{
-                "data": lambda x: retrieve_and_format(x)
-            }
+            source_docs=lambda x: retriever_func(query=x["rewritten_query"], original_query=x["query"])
         ) | RunnablePassthrough.assign(
-            source_docs=lambda x: x["data"]["source_docs"],
-            context=lambda x: x["data"]["context"],
-            is_low_similarity=lambda x: x["data"]["is_low_similarity"]
+            context=lambda x: format_sources(x["source_docs"]),
+            is_low_similarity=lambda x: check_low_similarity(x["source_docs"])
         )
         
         # 3. 답변 생성 (Answer)
         # Input: {..., context, history_text, rewritten_query} -> Output: answer (최종 답변)
         def conditional_answer(x):
             if x.get("is_low_similarity", False):
-                return "해당 질문에는 답변을 드리기 어렵습니다. 다른 질문을 부탁드립니다."
+                return LOW_SIMILARITY_REPLY
             return answer_chain.invoke({
                 "context": x["context"],
                 "history": x["history_text"],
@@ -140,7 +191,16 @@ class RAGChain:
         )
         
         # Pipeline Chain
-        self.rag_pipeline = rewrite_step | retrieve_step | answer_step
+        # (재작성 단계와 검색+답변 단계 사이에 시맨틱 캐시를 끼울 수 있도록 분리 보관)
+        self.rewrite_step = rewrite_step
+        self.answer_pipeline = retrieve_step | answer_step
+        self.rag_pipeline = rewrite_step | self.answer_pipeline
+        
+        # 5. 시맨틱 답변 캐시 (사용자별 재작성 질의 임베딩 기준, 적중 시 검색 + 답변 LLM 생략)
+        self.answer_cache = SemanticCache(self.vector_db.embed_query)
+        
+        # 6. 사용자별 원문 질의 캐시 (의도 분류 이전, 적중 시 LLM 호출 전부 생략)
+        self.query_cache = QueryAnswerCache(self.vector_db.embed_query)
 
     def run(self, user_id: int, session_id: int, query: str) -> str:
         """
@@ -149,8 +209,7 @@ class RAGChain:
         """
         print(f"\n[Flow Start] User: {user_id}, Session: {session_id}")
         
-        # 1. 사용자 메시지 저장
-        self.db.add_chat_message(session_id, "user", query)
+        # 1. 사용자 메시지는 답변과 함께 한 트랜잭션으로 저장 (턴당 커밋 1회)
         
         print(f"[Step] Input: {query}")
         
@@ -158,9 +217,20 @@ class RAGChain:
         
         try:
             # ============================================
-            # 2. Intent Router: 의도 분류
+            # 1-A. 사용자별 질의 캐시: 같은 사용자의 거의 같은 반복 질문은 이전 답변 재사용
             # ============================================
-            intent, direct_response, needs_rag = route_query(query, self.model)
+            query_key = self._query_cache_key(query)
+            cached_answer = self.query_cache.get(user_id, query_key) if query_key is not None else None
+            if cached_answer is not None:
+                self.db.add_chat_messages(session_id, [("user", query), ("assistant", cached_answer)])
+                print(f"[System] Response Time: {time.time() - start_time:.2f}s")
+                print(f"[Flow End] 질의 캐시 응답 완료")
+                return cached_answer
+            
+            # ============================================
+            # 2. Intent Router: 의도 분류 (∥ 히스토리 로드 + 질문 재작성)
+            # ============================================
+            history_text, rewrite_future, (intent, direct_response, needs_rag) = self._route_and_prepare(session_id, query, user_saved=False)
             print(f"[Intent] {intent.value} | Needs RAG: {needs_rag}")
             
             # ============================================
@@ -174,7 +244,7 @@ class RAGChain:
 
             if intent == QueryIntent.CLOSING:
                 answer = self._generate_session_summary(session_id)
-                self.db.add_chat_message(session_id, "assistant", answer)
+                self.db.add_chat_messages(session_id, [("user", query), ("assistant", answer)])
                 print(f"[Flow End] 상담 요약 및 종료 완료")
                 return answer
 
@@ -182,8 +252,8 @@ class RAGChain:
                 answer = direct_response
                 print(f"[Direct Response] Intent={intent.value}")
                 
-                # 5. Assistant 메시지 저장
-                self.db.add_chat_message(session_id, "assistant", answer)
+                # 5. 사용자 + Assistant 메시지 저장
+                self.db.add_chat_messages(session_id, [("user", query), ("assistant", answer)])
                 
                 end_time = time.time()
                 print(f"[System] Response Time: {end_time - start_time:.2f}s")
@@ -194,9 +264,9 @@ class RAGChain:
             # 3-B. CRISIS: 긴급 응답 + 전문가 연결
             # ============================================
             if intent == QueryIntent.CRISIS:
-                answer = direct_response if direct_response else "지금 많이 힘드시군요. 전문 상담사와 이야기해 보시는 것을 권해드려요. 📞 자살예방상담전화: 1393 (24시간)"
+                answer = direct_response if direct_response else CRISIS_FALLBACK_REPLY
                 self._handle_expert_referral(session_id, answer)
-                self.db.add_chat_message(session_id, "assistant", answer)
+                self.db.add_chat_messages(session_id, [("user", query), ("assistant", answer)])
                 
                 end_time = time.time()
                 print(f"[System] Response Time: {end_time - start_time:.2f}s")
@@ -204,22 +274,41 @@ class RAGChain:
                 return answer
             
             # ============================================
-            # 3-C. EMOTION/QUESTION: RAG 파이프라인 실행
+            # 3-C. 거절/화남 표현: 고정 응답 (검색 + LLM 생략)
             # ============================================
+            canned = quick_reply(query)
+            if canned is not None:
+                self.db.add_chat_messages(session_id, [("user", query), ("assistant", canned)])
+                print(f"[System] Response Time: {time.time() - start_time:.2f}s")
+                print(f"[Flow End] 고정 응답 완료")
+                return canned
             
-            # 대화 히스토리 로드
-            history_objs = self.db.get_chat_history(session_id)
-            history_dicts = [{"role": msg.role, "content": msg.content} for msg in history_objs]
-            pre_history = history_dicts[:-1]
-            history_text = format_history(pre_history)
+            # ============================================
+            # 3-D. EMOTION/QUESTION: RAG 파이프라인 실행
+            # ============================================
             
-            # RAG 파이프라인 실행
-            result = self.rag_pipeline.invoke({
+            # 질문 재작성 (의도 분류와 동시에 시작된 결과 사용)
+            state = {
                 "query": query,
-                "history_text": history_text
-            })
+                "history_text": history_text,
+                "rewritten_query": self._await_rewrite(rewrite_future, history_text, query)
+            }
+            
+            # 시맨틱 캐시 확인 (사용자별) → 미스일 때만 검색 + 답변 생성
+            query_embedding = self.answer_cache.embed(state["rewritten_query"])
+            cached = self.answer_cache.get(user_id, query_embedding)
+            if cached is not None:
+                print(f"[SemanticCache] Hit (similarity={cached.similarity:.3f})")
+                result = {"answer": cached.answer}
+            else:
+                result = self.answer_pipeline.invoke(state)
+                # 검색 실패 안내 / 전문가 연결 대상 답변은 캐시하지 않음
+                if not result.get("is_low_similarity") and REFERRAL_TAG not in result["answer"]:
+                    self.answer_cache.put(user_id, query_embedding, state["rewritten_query"], result["context"], result["answer"])
             
             answer = filter_special_tokens(result["answer"]).strip()
+            if query_key is not None and not result.get("is_low_similarity") and REFERRAL_TAG not in result["answer"]:
+                self.query_cache.put(user_id, query_key, answer)
             
             # 4. 전문가 연결 감지 (후처리)
             if "[EXPERT_REFERRAL_NEEDED]" in answer:
@@ -228,8 +317,8 @@ class RAGChain:
                 if "상담" not in answer:
                     answer += "\n"
             
-            # 5. Assistant 메시지 저장
-            self.db.add_chat_message(session_id, "assistant", answer)
+            # 5. 사용자 + Assistant 메시지 저장
+            self.db.add_chat_messages(session_id, [("user", query), ("assistant", answer)])
             
             end_time = time.time()
             elapsed_time = end_time - start_time
@@ -240,6 +329,12 @@ class RAGChain:
             
         except Exception as e:
             print(f"[Error] RAG 파이프라인 실패: {e}")
+            # 답변 생성에 실패해도 사용자 메시지는 기록
+            try:
+                self.db.rollback()
+                self.db.add_chat_message(session_id, "user", query)
+            except Exception as save_error:
+                print(f"[Error] 사용자 메시지 저장 실패: {save_error}")
             return "죄송합니다. 처리 중 오류가 발생했습니다."
 
     def stream(self, user_id: int, session_id: int, query: str, debug: bool = False):
@@ -257,8 +352,28 @@ class RAGChain:
         self.db.add_chat_message(session_id, "user", query)
         
         try:
-            # 2. Intent Router
-            intent, direct_response, needs_rag = route_query(query, self.model)
+            # 1-A. 사용자별 질의 캐시 (적중 시 의도 분류 / 재작성 / 검색 / 답변 LLM 생략)
+            query_key = self._query_cache_key(query)
+            cached_answer = self.query_cache.get(user_id, query_key) if query_key is not None else None
+            if cached_answer is not None:
+                if debug:
+                    yield {
+                        "type": "debug",
+                        "data": {
+                            "intent": "query_cache",
+                            "rewritten_query": query,
+                            "sources": [],
+                            "context_length": 0,
+                            "note": "사용자별 질의 캐시 적중 - 파이프라인 생략"
+                        }
+                    }
+                self.db.add_chat_message(session_id, "assistant", cached_answer)
+                yield {"type": "content", "data": cached_answer} if debug else cached_answer
+                print(f"[Flow End (Stream)] 질의 캐시 응답 완료")
+                return
+            
+            # 2. Intent Router (∥ 히스토리 로드 + 질문 재작성)
+            history_text, rewrite_future, (intent, direct_response, needs_rag) = self._route_and_prepare(session_id, query)
             
             # 3-A. GREETING/CHITCHAT: 직접 응답
             if not needs_rag and direct_response:
@@ -276,19 +391,13 @@ class RAGChain:
                     }
 
                 self.db.add_chat_message(session_id, "assistant", direct_response)
-                # 스트리밍 흉내 (자연스러운 타이핑 효과)
-                for i in range(0, len(direct_response), 3): # 3글자씩 끊어서
-                    chunk = direct_response[i:i+3]
-                    if debug:
-                        yield {"type": "content", "data": chunk}
-                    else:
-                        yield chunk
-                    time.sleep(0.05)
+                # LLM 대기가 없는 고정 응답 → 한 번에 전송 (타이핑 효과는 프론트엔드 담당)
+                yield {"type": "content", "data": direct_response} if debug else direct_response
                 return
 
             # 3-B. CRISIS: 위기 대응
             if intent == QueryIntent.CRISIS:
-                answer = direct_response if direct_response else "지금 많이 힘드시군요. 전문 상담사와 이야기해 보시는 것을 권해드려요. 📞 자살예방상담전화: 1393 (24시간)"
+                answer = direct_response if direct_response else CRISIS_FALLBACK_REPLY
                 
                 # Debug Info Yield
                 if debug:
@@ -306,53 +415,77 @@ class RAGChain:
                 self._handle_expert_referral(session_id, answer)
                 self.db.add_chat_message(session_id, "assistant", answer)
                 
-                # 스트리밍 흉내
-                for i in range(0, len(answer), 3):
-                    chunk = answer[i:i+3]
-                    if debug:
-                        yield {"type": "content", "data": chunk}
-                    else:
-                        yield chunk
-                    time.sleep(0.05)
+                # 즉시 전송 (위기 응답은 지연 없이)
+                yield {"type": "content", "data": answer} if debug else answer
                 return
             
-            # 3-C. RAG 파이프라인 실행
+            # 3-C. 거절/화남 표현: 고정 응답 (검색 + LLM 생략)
+            canned = quick_reply(query)
+            if canned is not None:
+                if debug:
+                    yield {
+                        "type": "debug",
+                        "data": {
+                            "intent": intent.value,
+                            "rewritten_query": query,
+                            "sources": [],
+                            "context_length": 0,
+                            "note": "거절/화남 표현 - 고정 응답"
+                        }
+                    }
+                
+                self.db.add_chat_message(session_id, "assistant", canned)
+                yield {"type": "content", "data": canned} if debug else canned
+                return
             
-            # History Load
-            history_objs = self.db.get_chat_history(session_id)
-            history_dicts = [{"role": msg.role, "content": msg.content} for msg in history_objs]
-            # 마지막 사용자 메시지는 이미 저장했으므로, 그 이전까지를 히스토리로 사용
-            pre_history = history_dicts[:-1]
-            history_text = format_history(pre_history)
+            # 3-D. RAG 파이프라인 실행
             
-            # Rewrite (Sync)
-            rewrite_chain = create_rewrite_chain(self.model)
-            rewritten_query = rewrite_chain.invoke({
-                "history": history_text, 
-                "query": query
-            }).strip().strip('"\'').splitlines()[0]
+            # Rewrite (의도 분류와 동시에 시작된 결과 사용, (히스토리, 질문) 단위 캐시)
+            rewritten_query = self._await_rewrite(rewrite_future, history_text, query)
+            
+            # 시맨틱 캐시 확인 (사용자별, 적중 시 검색 + 답변 LLM 생략)
+            query_embedding = self.answer_cache.embed(rewritten_query)
+            cached = self.answer_cache.get(user_id, query_embedding)
+            if cached is not None:
+                if debug:
+                    yield {
+                        "type": "debug",
+                        "data": {
+                            "intent": intent.value,
+                            "rewritten_query": rewritten_query,
+                            "sources": [],
+                            "context_length": len(cached.context),
+                            "note": f"시맨틱 캐시 적중 (유사도 {cached.similarity:.3f}, 원 질의: {cached.rewritten_query})"
+                        }
+                    }
+                
+                self.db.add_chat_message(session_id, "assistant", cached.answer)
+                yield {"type": "content", "data": cached.answer} if debug else cached.answer
+                print(f"[Flow End (Stream)] 시맨틱 캐시 응답 완료")
+                return
             
             # Retrieve (Sync)
-            retriever_func = create_retriever(self.vector_db)
-            docs = retriever_func(query=rewritten_query)
+            docs = self._retriever_func(query=rewritten_query, original_query=query)
             
             # [Relevance Filtering]
-            SIMILARITY_THRESHOLD = 0.40 # 한국어 임베딩 모델(ko-sroberta) 거리 척도에 맞춤
-            valid_docs = []
+            if debug:
+                docs = docs[:5]
+            # 검색 결과는 항상 최상위 "distance"를 가짐 (VectorStore._to_docs) → 거리 1회 조회로 한 번에 필터링
+            is_valid_flags = [doc["distance"] <= SIMILARITY_THRESHOLD for doc in docs]
+            valid_docs = [doc for doc, is_valid in zip(docs, is_valid_flags) if is_valid]
             
             # Debug Info Formatting & Yield
             if debug:
                 debug_info_sources = []
-                for i, doc in enumerate(docs[:5]):
-                    meta = doc.get("metadata", {})
-                    distance = round(doc.get("distance", meta.get("distance", 0)), 4)
-                    
-                    is_valid = distance <= SIMILARITY_THRESHOLD
-                    if is_valid:
-                        valid_docs.append(doc)
+                context_length = 0   # 유효 문서 본문 길이 합 (같은 루프에서 누적)
+                for i, (doc, is_valid) in enumerate(zip(docs, is_valid_flags)):
+                    meta = doc["metadata"]
+                    distance = round(doc["distance"], 4)
                     
                     window_text = meta.get("window_text", "") or ""
-                    content = doc.get("content", "")
+                    content = doc["content"]
+                    if is_valid:
+                        context_length += len(content)
                     display_content = window_text if len(window_text) > len(content) else content
                     
                     status_prefix = "" if is_valid else "[SKIPPED-Low Relevance] "
@@ -372,39 +505,37 @@ class RAGChain:
                         "intent": intent.value,
                         "rewritten_query": rewritten_query,
                         "sources": debug_info_sources,
-                        "context_length": sum(len(d.get("page_content", "") or d.get("content", "")) for d in valid_docs),
+                        "context_length": context_length,
                         "note": f"Threshold({SIMILARITY_THRESHOLD}) 적용: {len(valid_docs)}/{len(docs)} 건 사용"
                     }
                 }
-                
-                # Update docs to only valid ones for context generation
-                docs = valid_docs
-            else:
-                # Debug mode 아닐 때도 필터링 적용
-                docs = [d for d in docs if d.get("distance", d.get("metadata", {}).get("distance", 0)) <= SIMILARITY_THRESHOLD]
+            
+            # 관련 데이터 없음 (run()의 is_low_similarity와 같은 기준) → 답변 LLM 호출 없이 고정 응답
+            if not docs or docs[0]["distance"] >= LOW_SIMILARITY_DISTANCE:
+                print("[Warning] 데이터 내에 유사한 정보가 없어 고정 응답으로 대체합니다.")
+                self.db.add_chat_message(session_id, "assistant", LOW_SIMILARITY_REPLY)
+                yield {"type": "content", "data": LOW_SIMILARITY_REPLY} if debug else LOW_SIMILARITY_REPLY
+                print(f"[Flow End (Stream)] 저유사도 고정 응답 완료")
+                return
+            
+            # context 생성에는 유효 문서만 사용
+            docs = valid_docs
 
             if not docs:
-                context = "관련된 상담 내역이 없습니다. (위로와 공감, 일반적인 심리학 지식에 기반하여 답변하세요)"
+                context = NO_CONTEXT_TEXT
             else:
                 context = format_sources(docs)
             
-            # 유사도 체크 (옵션)
-            if not docs:
-                pass 
-            
             # Answer Stream
-            answer_chain = create_answer_chain(self.model)
             full_answer = ""
             
-            for chunk in answer_chain.stream({
+            # 특수 토큰 필터링 후 토큰 단위 청크를 묶어서 전달 (첫 청크는 즉시, 이후 SSE 이벤트 수 절감)
+            token_stream = self._answer_chain.stream({
                 "context": context,
                 "history": history_text,
                 "query": rewritten_query
-            }):
-                # 특수 토큰 필터링 적용
-                filtered_chunk = filter_special_tokens(chunk)
-                if not filtered_chunk:  # 빈 문자열이면 스킵
-                    continue
+            })
+            for filtered_chunk in coalesce_chunks(filter_special_tokens(chunk) for chunk in token_stream):
                 full_answer += filtered_chunk
                 if debug:
                     yield {"type": "content", "data": filtered_chunk}
@@ -421,6 +552,12 @@ class RAGChain:
             
             # 5. Assistant 메시지 저장 (Cleaned version)
             self.db.add_chat_message(session_id, "assistant", clean_answer)
+            
+            # 6. 시맨틱 캐시 / 질의 캐시 저장 (전문가 연결 대상 답변은 제외)
+            if full_answer and REFERRAL_TAG not in full_answer:
+                self.answer_cache.put(user_id, query_embedding, rewritten_query, context, full_answer)
+                if query_key is not None:
+                    self.query_cache.put(user_id, query_key, clean_answer)
             print(f"[Flow End (Stream)] RAG 응답 완료")
             
         except Exception as e:
@@ -446,17 +583,9 @@ class RAGChain:
             debug=True: {"type": "debug"|"content", "data": ...}
             debug=False: str (답변 청크)
         """
-        import asyncio
-        
-        # 동기 stream 메서드를 비동기로 래핑
-        def sync_stream():
-            return list(self.stream(user_id, session_id, query, debug))
-        
-        # 동기 작업을 별도 스레드에서 실행
-        chunks = await asyncio.to_thread(sync_stream)
-        
-        # 청크를 하나씩 yield
-        for chunk in chunks:
+        # 동기 stream을 워커 스레드에서 실행하며 청크가 생성되는 즉시 전달
+        # (블로킹 LLM 호출 동안 이벤트 루프는 다른 세션 처리)
+        async for chunk in aiter_in_thread(lambda: self.stream(user_id, session_id, query, debug)):
             yield chunk
 
     def run_with_debug(self, query: str, history: List[Dict[str, str]] = []) -> Dict[str, Any]:
@@ -498,6 +627,75 @@ class RAGChain:
                 "error": str(e)
             }
 
+    def _query_cache_key(self, query: str):
+        """
+        사용자별 질의 캐시 조회용 임베딩 (캐시 대상이 아니면 None)
+        - 위기 표현: 매번 위기 대응 흐름(전문가 연결 기록)을 타야 하므로 제외
+          (answer.crisis_reply 패턴 + intent_router의 CRISIS 키워드 둘 다 확인 - 캐시 조회가 의도 분류보다 먼저 실행됨)
+        - 지시어 포함 발화: 답이 대화 맥락에 따라 달라지므로 제외
+        """
+        if crisis_reply(query) is not None or _quick_classify(query) is QueryIntent.CRISIS:
+            return None
+        if any(word in query for word in REFERENCE_WORDS):
+            return None
+        return self.query_cache.embed(query)
+
+    def _route_and_prepare(self, session_id: int, query: str, user_saved: bool = True):
+        """
+        의도 분류와 RAG 준비 작업을 겹쳐서 실행
+        - 의도 분류(LLM)는 워커 스레드, 히스토리 로드(DB)는 현재 스레드 (scoped session 유지)
+        - 의도 분류가 아직 진행 중이면 질문 재작성(LLM)을 미리 시작 → RAG 경로에서 LLM 1회 대기 시간 제거
+          (키워드 분류로 즉시 끝났거나 고정 응답 대상이면 재작성 생략)
+        
+        Args:
+            user_saved: 현재 사용자 메시지가 이미 DB에 저장되었는지 여부 (run은 답변과 함께 저장)
+        
+        Returns:
+            (history_text, rewrite_future 또는 None, route_query 결과)
+        """
+        intent_future = _PIPELINE_EXECUTOR.submit(route_query, query, self.model)
+        
+        history_text = self._history_cache.load(session_id, user_saved)
+        
+        rewrite_future = None
+        if not intent_future.done() and quick_reply(query) is None and needs_rewrite(history_text, query):
+            rewrite_future = _PIPELINE_EXECUTOR.submit(self._rewrite, history_text, query)
+        
+        return history_text, rewrite_future, intent_future.result()
+    
+    def _await_rewrite(self, rewrite_future: Optional[Future], history_text: str, query: str) -> str:
+        """미리 시작한 재작성 결과 반환 (없으면 지금 실행)"""
+        if rewrite_future is not None:
+            return rewrite_future.result()
+        return self._rewrite(history_text, query)
+
+    def _rewrite(self, history_text: str, query: str) -> str:
+        """
+        검색용 질문 재작성 (같은 히스토리 + 질문이면 캐시된 결과 재사용)
+        - 키: (히스토리 blake2b 해시, 질문) → 긴 히스토리 문자열을 캐시에 보관하지 않음
+        - 첫 턴이거나 짧고 지시어 없는 발화는 LLM 호출 없이 원문 사용 (needs_rewrite)
+        """
+        if not needs_rewrite(history_text, query):
+            return query
+        
+        key = (hashlib.blake2b(history_text.encode("utf-8"), digest_size=16).digest(), query)
+        with self._rewrite_lock:
+            rewritten = self._rewrite_cache.get(key)
+            if rewritten is not None:
+                self._rewrite_cache.move_to_end(key)
+                return rewritten
+        
+        rewritten = self._rewrite_chain.invoke({
+            "history": history_text, 
+            "query": query
+        }).strip().strip(REWRITE_STRIP_CHARS).splitlines()[0]
+        
+        with self._rewrite_lock:
+            self._rewrite_cache[key] = rewritten
+            if len(self._rewrite_cache) > REWRITE_CACHE_SIZE:
+                self._rewrite_cache.popitem(last=False)
+        return rewritten
+
     def _handle_expert_referral(self, session_id: int, answer: str):
         """전문가 연결 DB 기록"""
         try:
@@ -517,33 +715,12 @@ class RAGChain:
         if not history:
             return "진행된 상담 내역이 없어 요약할 내용이 없습니다. 언제든 다시 찾아주세요."
 
-        conversation_text = ""
-        for msg in history:
-            if msg.role == "system": continue
-            role = "상담사" if msg.role == "assistant" else "내담자"
-            conversation_text += f"{role}: {msg.content}\n"
-
-        summary_prompt = f"""
-[역할]
-당신은 심리 상담 내용을 정리해주는 AI 비서입니다.
-아래 대화 기록을 바탕으로, **상담사가 내담자에게 제안했던 심리적 안정화 기법이나 실질적인 조언들**을 요약해서 정리해 주세요.
-
-[대화 기록]
-{conversation_text}
-
-[요약 규칙]
-1. 상담사가 제안한 **구체적인 해결책, 기법(예: 호흡법, 점수 매기기 등), 행동 지침**만 추출하세요.
-2. 단순히 "공감해주었다" 같은 내용은 적지 마세요.
-3. 내담자가 실천할 수 있도록 [오늘의 심리 처방] 형식으로 깔끔하게 리스트업 해주세요.
-4. 마지막에는 따뜻한 격려의 한 마디로 마무리하세요.
-
-[출력 형식]
-[오늘의 심리 처방] 📝
-1. (기법 이름): (구체적 방법 요약)
-2. ...
-
-(마무리 격려)
-"""
+        # 줄 단위로 모아 한 번에 join (+= 누적 연결 제거)
+        conversation_text = "".join(
+            f"{'상담사' if msg.role == 'assistant' else '내담자'}: {msg.content}\n"
+            for msg in history if msg.role != "system"
+        )
+        summary_prompt = SUMMARY_PROMPT.format(conversation=conversation_text)
         response = self.model.invoke(summary_prompt)
         return response.content if hasattr(response, 'content') else str(response)
 
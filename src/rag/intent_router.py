@@ -13,6 +13,7 @@ Issue/Note  : GREETING/CHITCHAT은 RAG 없이 직접 응답
 # Imports
 # -------------------------------------------------------------
 
+import re
 import sys
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
@@ -47,6 +48,18 @@ RAG_REQUIRED_INTENTS = {QueryIntent.EMOTION, QueryIntent.QUESTION, QueryIntent.C
 # 즉시 위기 대응이 필요한 의도
 CRISIS_INTENTS = {QueryIntent.CRISIS}
 
+# 키워드 기반 빠른 분류 (_quick_classify) - 의도별 키워드를 정규식 하나로 컴파일해 발화를 1회 스캔
+# 우선순위: CRISIS > GREETING(짧은 발화만) > EMOTION
+CRISIS_KEYWORDS = ("죽고", "자살", "자해", "끝내고", "죽을", "안 살고", "살기 싫")
+GREETING_KEYWORDS = ("안녕", "반가", "하이", "헬로", "좋은 아침", "좋은 저녁")
+EMOTION_KEYWORDS = ("힘들", "우울", "불안", "슬프", "외롭", "짜증", "화나", "스트레스",
+                    "무기력", "지쳤", "피곤", "걱정", "두렵", "무섭")
+GREETING_MAX_LEN = 10   # 이 길이 이하의 발화만 인사로 분류
+
+_CRISIS_RE = re.compile("|".join(map(re.escape, CRISIS_KEYWORDS)))
+_GREETING_RE = re.compile("|".join(map(re.escape, GREETING_KEYWORDS)))
+_EMOTION_RE = re.compile("|".join(map(re.escape, EMOTION_KEYWORDS)))
+
 
 # 의도 분류 프롬프트
 INTENT_CLASSIFICATION_PROMPT = """\
@@ -173,24 +186,16 @@ def _quick_classify(query: str) -> Optional[QueryIntent]:
     q = query.strip().lower()
     
     # CRISIS 체크 (최우선)
-    crisis_keywords = ["죽고", "자살", "자해", "끝내고", "죽을", "안 살고", "살기 싫"]
-    for kw in crisis_keywords:
-        if kw in q:
-            return QueryIntent.CRISIS
+    if _CRISIS_RE.search(q):
+        return QueryIntent.CRISIS
     
-    # GREETING 체크
-    greeting_patterns = ["안녕", "반가", "하이", "헬로", "좋은 아침", "좋은 저녁"]
-    if len(q) <= 10:  # 짧은 인사
-        for pat in greeting_patterns:
-            if pat in q:
-                return QueryIntent.GREETING
+    # GREETING 체크 (짧은 인사)
+    if len(q) <= GREETING_MAX_LEN and _GREETING_RE.search(q):
+        return QueryIntent.GREETING
     
     # EMOTION 체크 (감정 키워드)
-    emotion_keywords = ["힘들", "우울", "불안", "슬프", "외롭", "짜증", "화나", "스트레스", 
-                        "무기력", "지쳤", "피곤", "걱정", "두렵", "무섭"]
-    for kw in emotion_keywords:
-        if kw in q:
-            return QueryIntent.EMOTION
+    if _EMOTION_RE.search(q):
+        return QueryIntent.EMOTION
     
     # LLM 분류 필요
     return None
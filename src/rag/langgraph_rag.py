@@ -13,19 +13,22 @@ Description : LangGraph 기반 RAG 파이프라인
 import sys
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TypedDict, List, Dict, Any, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from langgraph.graph import StateGraph, END
+from langchain_core.prompts import PromptTemplate
 from config.model_config import create_chat_model
 from src.database.db_manager import DatabaseManager
 from src.database.vector_store import VectorStore
 from src.rag.retriever import create_retriever, load_vector_db
-from src.rag.rewrite import create_rewrite_chain, format_history
+from src.rag.rewrite import create_rewrite_chain, format_history, needs_rewrite, SessionHistoryCache
 from src.rag.answer import create_answer_chain, format_sources
 from src.rag.intent_router import route_query, QueryIntent
+from src.rag.streaming import aiter_in_thread, coalesce_chunks
 
 # -------------------------------------------------------------
 # 특수 토큰 필터링
@@ -41,6 +44,25 @@ def filter_special_tokens(text: str) -> str:
         return text
     return SPECIAL_TOKEN_PATTERN.sub('', text)
 
+# 의도 분류 / 질문 재작성 LLM 호출을 동시에 실행하기 위한 스레드풀 (DB 접근 없는 작업만 제출)
+_PIPELINE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="langgraph-pipeline")
+
+# 최상위 검색 결과 거리가 이 값 이상이면 관련 데이터 없음으로 보고 고정 응답
+LOW_SIMILARITY_DISTANCE = 0.65
+LOW_SIMILARITY_REPLY = "해당 질문에는 답변을 드리기 어렵습니다. 다른 질문을 부탁드립니다."
+
+# 상담 종료 요약 프롬프트 (대화 기록만 채움)
+SUMMARY_PROMPT = PromptTemplate.from_template("""
+[역할] 심리 상담 요약 AI
+[대화]
+{conversation}
+
+[규칙]
+1. 상담사의 구체적 조언/기법만 추출
+2. [오늘의 심리 처방] 형식으로 요약
+3. 마지막에 따뜻한 격려
+""")
+
 # -------------------------------------------------------------
 # State 정의
 # -------------------------------------------------------------
@@ -105,6 +127,9 @@ class LangGraphRAG:
         self.model = create_chat_model()
         self.retriever_func = create_retriever(self.vector_db)
         
+        # 세션별 히스토리 증분 캐시 (매 턴 전체 히스토리 조회/포맷 생략)
+        self.history_cache = SessionHistoryCache(self.db)
+        
         # 체인 생성
         self.rewrite_chain = create_rewrite_chain(self.model)
         self.answer_chain = create_answer_chain(self.model)
@@ -203,28 +228,34 @@ class LangGraphRAG:
         
         print(f"[LangGraph] Node: rewrite")
         
-        rewritten = self.rewrite_chain.invoke({
-            "history": history_text,
-            "query": query
-        }).strip().strip('"\'').splitlines()[0]
+        rewritten = self._rewrite(history_text, query)
         
         print(f"[LangGraph] Rewritten: {rewritten}")
         
         return {"rewritten_query": rewritten}
     
+    def _rewrite(self, history_text: str, query: str) -> str:
+        """검색용 쿼리 재작성 (첫 턴이거나 짧고 지시어 없는 발화는 LLM 호출 생략)"""
+        if not needs_rewrite(history_text, query):
+            return query
+        return self.rewrite_chain.invoke({
+            "history": history_text,
+            "query": query
+        }).strip().strip('"\'').splitlines()[0]
+    
     def _node_retrieve(self, state: RAGState) -> dict:
         """[Node] 문서 검색"""
         rewritten_query = state["rewritten_query"]
         
         print(f"[LangGraph] Node: retrieve")
         
-        docs = self.retriever_func(query=rewritten_query)
+        docs = self.retriever_func(query=rewritten_query, original_query=state["query"])
         
         # 유사도 체크
         is_low_similarity = False
         if docs:
             first_dist = docs[0].get("distance")
-            if first_dist is not None and first_dist >= 0.65:
+            if first_dist is not None and first_dist >= LOW_SIMILARITY_DISTANCE:
                 print("[LangGraph] Warning: 유사도 낮음")
                 is_low_similarity = True
         else:
@@ -250,7 +281,7 @@ class LangGraphRAG:
         
         # 유사도 낮으면 기본 응답
         if state.get("is_low_similarity", False):
-            return {"answer": "해당 질문에는 답변을 드리기 어렵습니다. 다른 질문을 부탁드립니다."}
+            return {"answer": LOW_SIMILARITY_REPLY}
         
         answer = self.answer_chain.invoke({
             "context": state["context"],
@@ -284,11 +315,8 @@ class LangGraphRAG:
         start_time = time.time()
         
         try:
-            # 히스토리 로드
-            history_objs = self.db.get_chat_history(session_id)
-            history_dicts = [{"role": msg.role, "content": msg.content} for msg in history_objs]
-            pre_history = history_dicts[:-1]
-            history_text = format_history(pre_history)
+            # 히스토리 로드 (새 메시지만 조회)
+            history_text = self.history_cache.load(session_id)
             
             # 그래프 실행
             initial_state: RAGState = {
@@ -332,16 +360,17 @@ class LangGraphRAG:
         
         try:
             # [FIX] 히스토리를 먼저 로드하여 Intent 분류 및 RAG 파이프라인에서 사용
-            history_objs = self.db.get_chat_history(session_id)
-            history_dicts = [{"role": msg.role, "content": msg.content} for msg in history_objs]
-            # 마지막 사용자 메시지는 이미 저장했으므로, 그 이전까지를 히스토리로 사용
-            pre_history = history_dicts[:-1] if len(history_dicts) > 1 else []
-            history_text = format_history(pre_history)
-            
-            print(f"[LangGraphRAG] History loaded: {len(pre_history)} messages")
+            # (세션별 증분 캐시 - 새 메시지만 조회, 마지막 사용자 메시지는 이미 저장했으므로 그 이전까지)
+            history_text = self.history_cache.load(session_id)
             
-            # Intent 분류 (히스토리 컨텍스트와 함께)
-            intent, direct_response, needs_rag = route_query(query, self.model, history=pre_history)
+            # Intent 분류 (route_query는 히스토리를 로그에만 사용하므로 전달 생략)
+            # 분류가 LLM 단계까지 가면 재작성도 미리 시작 → RAG 경로에서 두 LLM 호출이 겹침
+            # (직접 응답으로 끝나면 재작성 결과는 버림)
+            intent_future = _PIPELINE_EXECUTOR.submit(route_query, query, self.model)
+            rewrite_future = None
+            if not intent_future.done() and needs_rewrite(history_text, query):
+                rewrite_future = _PIPELINE_EXECUTOR.submit(self._rewrite, history_text, query)
+            intent, direct_response, needs_rag = intent_future.result()
             
             # 직접 응답 (RAG 불필요)
             if not needs_rag and direct_response:
@@ -359,25 +388,17 @@ class LangGraphRAG:
                 
                 self.db.add_chat_message(session_id, "assistant", direct_response)
                 
-                for i in range(0, len(direct_response), 3):
-                    chunk = direct_response[i:i+3]
-                    if debug:
-                        yield {"type": "content", "data": chunk}
-                    else:
-                        yield chunk
-                    time.sleep(0.05)
+                # LLM 대기가 없는 고정 응답 → 한 번에 전송 (SSE 전송 단위 1회)
+                yield {"type": "content", "data": direct_response} if debug else direct_response
                 return
             
             # RAG 파이프라인 (history_text는 위에서 이미 로드됨)
             
-            # Rewrite
-            rewritten_query = self.rewrite_chain.invoke({
-                "history": history_text,
-                "query": query
-            }).strip().strip('"\'').splitlines()[0]
+            # Rewrite (의도 분류와 동시에 시작된 결과 사용, 없으면 지금 실행)
+            rewritten_query = rewrite_future.result() if rewrite_future is not None else self._rewrite(history_text, query)
             
             # Retrieve
-            docs = self.retriever_func(query=rewritten_query)
+            docs = self.retriever_func(query=rewritten_query, original_query=query)
             
             # 유사도 필터링
             SIMILARITY_THRESHOLD = 0.40
@@ -410,6 +431,14 @@ class LangGraphRAG:
                     }
                 }
             
+            # 관련 데이터 없음 (_node_retrieve와 같은 기준) → 답변 LLM 스트리밍 없이 고정 응답 한 번에 전송
+            first_dist = docs[0].get("distance") if docs else None
+            if not docs or (first_dist is not None and first_dist >= LOW_SIMILARITY_DISTANCE):
+                print("[LangGraphRAG] Warning: 유사도 낮음 - 고정 응답")
+                self.db.add_chat_message(session_id, "assistant", LOW_SIMILARITY_REPLY)
+                yield {"type": "content", "data": LOW_SIMILARITY_REPLY} if debug else LOW_SIMILARITY_REPLY
+                return
+            
             # Context 생성
             if not valid_docs:
                 context = "관련 상담 내역 없음. 일반 지식 기반 응답."
@@ -417,15 +446,14 @@ class LangGraphRAG:
                 context = format_sources(valid_docs)
             
             # Answer 스트리밍
+            # 특수 토큰 필터링 후 토큰 단위 청크를 묶어서 전달 (첫 청크는 즉시, 이후 SSE 이벤트 수 절감)
             full_answer = ""
-            for chunk in self.answer_chain.stream({
+            token_stream = self.answer_chain.stream({
                 "context": context,
                 "history": history_text,
                 "query": rewritten_query
-            }):
-                filtered = filter_special_tokens(chunk)
-                if not filtered:
-                    continue
+            })
+            for filtered in coalesce_chunks(filter_special_tokens(chunk) for chunk in token_stream):
                 full_answer += filtered
                 if debug:
                     yield {"type": "content", "data": filtered}
@@ -450,14 +478,8 @@ class LangGraphRAG:
                 yield err_msg
     
     async def stream_async(self, user_id: int, session_id: int, query: str, debug: bool = False):
-        """비동기 스트리밍 (기존 RAGChain.stream_async 호환)"""
-        import asyncio
-        
-        def sync_stream():
-            return list(self.stream(user_id, session_id, query, debug))
-        
-        chunks = await asyncio.to_thread(sync_stream)
-        for chunk in chunks:
+        """비동기 스트리밍 (기존 RAGChain.stream_async 호환, 청크 생성 즉시 전달)"""
+        async for chunk in aiter_in_thread(lambda: self.stream(user_id, session_id, query, debug)):
             yield chunk
     
     def run_with_debug(self, query: str, history: List[Dict[str, str]] = []) -> Dict[str, Any]:
@@ -512,23 +534,11 @@ class LangGraphRAG:
         if not history:
             return "진행된 상담 내역이 없어 요약할 내용이 없습니다."
         
-        conversation = ""
-        for msg in history:
-            if msg.role == "system":
-                continue
-            role = "상담사" if msg.role == "assistant" else "내담자"
-            conversation += f"{role}: {msg.content}\n"
-        
-        prompt = f"""
-[역할] 심리 상담 요약 AI
-[대화]
-{conversation}
-
-[규칙]
-1. 상담사의 구체적 조언/기법만 추출
-2. [오늘의 심리 처방] 형식으로 요약
-3. 마지막에 따뜻한 격려
-"""
+        conversation = "".join(
+            f"{'상담사' if msg.role == 'assistant' else '내담자'}: {msg.content}\n"
+            for msg in history if msg.role != "system"
+        )
+        prompt = SUMMARY_PROMPT.format(conversation=conversation)
         response = self.model.invoke(prompt)
         return response.content if hasattr(response, 'content') else str(response)
 
@@ -7,6 +7,7 @@ Description : 심리상담 & 명언 챗봇용 Retriever 구현
 Issue/Note  : 초기 구현
               VectorDB(ChromaDB) 정상 로드 및 문서 수 출력 확인
               similarity 기반 Retriever 동작 검증
+              재작성 질문 + 원문 질문 배치 검색 후 병합 (original_query)
 """
 
 
@@ -32,7 +33,7 @@ if not hasattr(db_config, "OpenAIConfig"):
 from typing import Any, List, Dict, Optional
 import time
 
-from src.database.vector_store import VectorStore
+from src.database.vector_store import VectorStore, get_vector_store
 
 
 # -------------------------------------------------------------
@@ -53,7 +54,7 @@ def load_vector_db(persist_directory: Optional[str] = None) -> VectorStore:
     - 기존 컬렉션 중 문서가 있는 컬렉션을 사용
     """
 
-    vector_db = VectorStore()
+    vector_db = get_vector_store()
 
     client = vector_db.client
 
@@ -74,6 +75,7 @@ def load_vector_db(persist_directory: Optional[str] = None) -> VectorStore:
 
     if selected:
         vector_db.collection = selected
+        vector_db.apply_search_ef()
         print(f"[INFO] Using collection: {selected.name}")
         print(f"[INFO] Total documents: {selected.count()}")
     else:
@@ -84,6 +86,29 @@ def load_vector_db(persist_directory: Optional[str] = None) -> VectorStore:
     return vector_db
 
 
+# -------------------------------------------------------------
+# Result Merge
+# -------------------------------------------------------------
+
+def merge_search_results(result_lists: List[List[Dict[str, Any]]], k: int) -> List[Dict[str, Any]]:
+    """
+    여러 쿼리의 검색 결과를 병합
+    - 같은 문서(content 기준)는 가장 작은 distance만 유지
+    - distance 오름차순 상위 k개 반환
+
+    Args:
+        result_lists: 쿼리별 similarity_search 결과 리스트
+        k: 반환할 문서 수
+    """
+    best: Dict[str, Dict[str, Any]] = {}
+    for docs in result_lists:
+        for doc in docs:
+            prev = best.get(doc["content"])
+            if prev is None or doc["distance"] < prev["distance"]:
+                best[doc["content"]] = doc
+    return sorted(best.values(), key=lambda d: d["distance"])[:k]
+
+
 # -------------------------------------------------------------
 # Retriever Factory
 # -------------------------------------------------------------
@@ -108,15 +133,18 @@ def create_retriever(
         category: Optional[str] = None,
         speaker: Optional[str] = None,
         min_severity: Optional[int] = None,
+        original_query: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         실제 검색 수행 함수
 
         Args:
-            query: 사용자 질문
+            query: 사용자 질문 (재작성된 검색용 질문)
             category: DEPRESSION / ANXIETY / ADDICTION / NORMAL
             speaker: 상담사 / 내담자
             min_severity: 최소 심각도 (0~3)
+            original_query: 재작성 전 원문 질문
+                            (query와 다르면 두 질문을 한 번에 배치 검색 후 병합)
 
         Returns:
             [
@@ -146,6 +174,15 @@ def create_retriever(
         # -----------------------------
         # Vector 검색
         # -----------------------------
+        if original_query and original_query != query:
+            # 재작성 질문 + 원문 질문 → 임베딩 1회 배치 + 검색 1회
+            result_lists = vector_db.similarity_search_many(
+                [query, original_query],
+                k=top_k,
+                filter=where if where else None
+            )
+            return merge_search_results(result_lists, top_k)
+
         return vector_db.similarity_search(
             query=query,
             k=top_k,
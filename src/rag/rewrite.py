@@ -10,8 +10,10 @@ Issue/Note  : 그거, 이전에, 아까 등의 대화 내용을 찾을 수 있
 # Imports
 # -------------------------------------------------------------
 
+from collections import OrderedDict
 from typing import List, Dict, Optional
 import sys
+import threading
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -48,6 +50,13 @@ SYSTEM_PROMPT = """\
 
 DEFAULT_MAX_TURNS = 6
 
+# 재작성 생략 조건 (히스토리가 없거나, 짧고 지시어가 없는 자기완결 발화 → LLM 호출 없이 원문 사용)
+MIN_REWRITE_QUERY_LEN = 12
+# 세션별 히스토리 캐시 크기 (마지막 메시지 ID + 최근 포맷 줄 → 새 메시지만 DB 조회)
+HISTORY_CACHE_SIZE = 256
+
+REFERENCE_WORDS = ("그거", "저거", "이거", "그게", "이전", "방금", "아까", "저번", "그럼", "그때")
+
 # -------------------------------------------------------------
 # rewrite helper functions
 # -------------------------------------------------------------
@@ -59,16 +68,70 @@ def format_history(history: List[Dict[str, str]]) -> str:
     if not history:
         return "없음"
     
-    formatted = []
     # 최근 N개 턴만 사용 (토큰 관리)
     recent_history = history[-DEFAULT_MAX_TURNS:]
     
-    for msg in recent_history:
-        role = "사용자" if msg.get("role") == "user" else "상담사"
-        content = msg.get("content", "")
-        formatted.append(f"{role}: {content}")
-        
-    return "\n".join(formatted)
+    return "\n".join(format_history_line(msg.get("role"), msg.get("content", "")) for msg in recent_history)
+
+def format_history_line(role: str, content: str) -> str:
+    """
+    대화 이력 한 줄 변환 (format_history와 동일 형식, 세션별 증분 캐시용)
+    """
+    return f"{'사용자' if role == 'user' else '상담사'}: {content}"
+
+class SessionHistoryCache:
+    """
+    세션별 프롬프트용 히스토리 문자열 증분 캐시 (format_history와 동일 결과)
+
+    - 세션별로 마지막 메시지 ID와 최근 DEFAULT_MAX_TURNS + 1개 포맷 줄을 보관 (LRU)
+    - 매 턴 전체 히스토리 대신 이후 추가된 메시지만 조회해 이어 붙임
+      (다른 워커가 저장한 메시지도 ID 기준으로 반영되므로 캐시가 어긋나지 않음)
+    """
+
+    def __init__(self, db, max_sessions: int = HISTORY_CACHE_SIZE):
+        """
+        Args:
+            db: get_chat_history_since를 제공하는 DatabaseManager
+            max_sessions: 캐시할 최대 세션 수
+        """
+        self.db = db
+        self.max_sessions = max_sessions
+        self._cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, session_id: int, user_saved: bool = True) -> str:
+        """
+        히스토리 문자열 반환
+
+        Args:
+            user_saved: 현재 사용자 메시지가 이미 저장되었으면 True → 그 이전까지를 히스토리로 사용
+        """
+        with self._lock:
+            last_id, lines = self._cache.get(session_id, (0, ()))
+
+        new_messages = self.db.get_chat_history_since(session_id, last_id)
+        if new_messages:
+            last_id = new_messages[-1].id
+            lines = (lines + tuple(format_history_line(msg.role, msg.content) for msg in new_messages))[-(DEFAULT_MAX_TURNS + 1):]
+
+        with self._lock:
+            self._cache[session_id] = (last_id, lines)
+            self._cache.move_to_end(session_id)
+            if len(self._cache) > self.max_sessions:
+                self._cache.popitem(last=False)
+
+        recent = lines[:-1] if user_saved else lines[-DEFAULT_MAX_TURNS:]
+        return "\n".join(recent) or "없음"
+
+def needs_rewrite(history_text: str, query: str) -> bool:
+    """
+    재작성 LLM 호출 필요 여부
+    - 히스토리가 없으면 지시어를 구체화할 근거가 없으므로 생략
+    - 짧고 지시어가 없는 발화는 그대로 검색해도 충분하므로 생략
+    """
+    if not history_text.strip() or history_text == "없음":
+        return False
+    return len(query) >= MIN_REWRITE_QUERY_LEN or any(word in query for word in REFERENCE_WORDS)
 
 def rule_based_fallback(query: str) -> str:
     """
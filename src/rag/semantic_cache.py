@@ -0,0 +1,320 @@
+"""
+FileName    : semantic_cache.py
+Auth        : 우재현
+Date        : 2026-01-30
+Description : 재작성된 질의(rewritten query) 기반 시맨틱 답변 캐시
+Issue/Note  : 의미상 거의 같은 질문(반복/바꿔 말하기)은 검색 + 답변 LLM 호출 없이 이전 답변 재사용
+              SQLite(data/semantic_cache.db)에 저장하여 재시작 후에도 유지
+              사용자 ID별로 분리 (답변이 해당 사용자의 대화 히스토리를 바탕으로 생성되므로 다른 사용자에게 제공하지 않음)
+              QueryAnswerCache - 사용자별 원문 질의 캐시 (의도 분류 이전 단계, 메모리 전용 + TTL)
+"""
+
+# -------------------------------------------------------------
+# Imports
+# -------------------------------------------------------------
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from config.db_config import get_db_settings
+
+# -------------------------------------------------------------
+# Constants
+# -------------------------------------------------------------
+
+SEMANTIC_CACHE_SIZE = 2048          # 최대 항목 수 (LRU)
+SEMANTIC_CACHE_THRESHOLD = 0.92     # 캐시 적중 최소 코사인 유사도
+SEMANTIC_CACHE_MERGE_THRESHOLD = 0.86   # 저장 시 이 유사도 이상인 기존 항목(군집 중심)에 병합
+SEMANTIC_CACHE_DB_NAME = "semantic_cache.db"
+
+# 사용자별 원문 질의 캐시 (적중 시 의도 분류 / 재작성 / 검색 / 답변 LLM 모두 생략)
+QUERY_CACHE_SIZE = 1024             # 전체 최대 항목 수 (LRU)
+QUERY_CACHE_THRESHOLD = 0.92        # 적중 최소 코사인 유사도 (의도 분류를 건너뛰므로 보수적으로)
+QUERY_CACHE_TTL = 3600              # 초 단위, 오래된 답변 재사용 방지
+
+# -------------------------------------------------------------
+# Semantic Cache
+# -------------------------------------------------------------
+
+class CachedAnswer(NamedTuple):
+    """캐시 항목"""
+    rewritten_query: str
+    context: str
+    answer: str
+    similarity: float
+
+
+class SemanticCache:
+    """
+    (사용자 ID, 재작성 질의 임베딩) → 답변 캐시
+
+    - 임베딩은 L2 정규화 벡터를 전제로 함 (내적 = 코사인 유사도)
+    - 조회: 메모리 행렬과 내적 1회 → 같은 사용자 항목 중 최대 유사도가 임계값 이상이면 적중
+      (답변 생성 프롬프트에 사용자 대화 히스토리가 들어가므로 사용자 간 공유 금지)
+    - 저장: 메모리 + SQLite write-through, 최대 크기 초과 시 가장 오래 사용하지 않은 항목 삭제
+    - 군집 중심 캐시: 새 질의가 기존 항목과 merge_threshold 이상 유사하면 항목을 추가하지 않고
+      해당 항목 임베딩을 누적 평균(재정규화)으로 갱신 → 항목 수가 질의 수가 아닌 의미 군집 수에 비례
+      (대표 답변은 군집을 처음 만든 답변 유지)
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], np.ndarray],
+        db_path: Optional[Union[str, Path]] = None,
+        max_size: int = SEMANTIC_CACHE_SIZE,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        merge_threshold: float = SEMANTIC_CACHE_MERGE_THRESHOLD
+    ):
+        """
+        Args:
+            embed_fn: 텍스트 → 정규화 임베딩 (VectorStore.embed_query)
+            db_path: SQLite 파일 경로 (기본: DATA_DIR/semantic_cache.db)
+            max_size: 최대 항목 수
+            threshold: 적중 최소 코사인 유사도
+            merge_threshold: 저장 시 기존 군집에 병합할 최소 코사인 유사도
+        """
+        self.embed = embed_fn
+        self.max_size = max_size
+        self.threshold = threshold
+        self.merge_threshold = merge_threshold
+        self.db_path = Path(db_path) if db_path else get_db_settings().DATA_DIR / SEMANTIC_CACHE_DB_NAME
+
+        # row id → (중심 임베딩, rewritten_query, context, answer, 병합된 질의 수, user_id) (LRU 순서)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None   # 조회용 임베딩 행렬 (변경 시 재생성)
+        self._row_ids: list = []
+        self._user_ids: Optional[np.ndarray] = None # 행렬 행별 user_id
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "rewritten_query TEXT NOT NULL, "
+            "context TEXT NOT NULL, "
+            "answer TEXT NOT NULL, "
+            "embedding BLOB NOT NULL, "
+            "ts REAL NOT NULL)"
+        )
+        # 군집 중심 누적 평균용 질의 수 (이전 버전 DB에는 컬럼 추가)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(semantic_cache)")}
+        if "n" not in columns:
+            self._conn.execute("ALTER TABLE semantic_cache ADD COLUMN n INTEGER NOT NULL DEFAULT 1")
+        # 사용자별 분리 이전 항목은 어느 사용자의 히스토리로 만든 답변인지 알 수 없으므로 삭제
+        if "user_id" not in columns:
+            self._conn.execute("ALTER TABLE semantic_cache ADD COLUMN user_id INTEGER")
+        self._conn.execute("DELETE FROM semantic_cache WHERE user_id IS NULL")
+        self._conn.commit()
+        self._load()
+
+    def _load(self) -> None:
+        """SQLite에서 최근 사용 순으로 max_size개 로드"""
+        rows = self._conn.execute(
+            "SELECT id, rewritten_query, context, answer, embedding, n, user_id FROM semantic_cache "
+            "ORDER BY ts DESC LIMIT ?",
+            (self.max_size,)
+        ).fetchall()
+        for row_id, rewritten_query, context, answer, blob, n, user_id in reversed(rows):
+            embedding = np.frombuffer(blob, dtype=np.float32)
+            self._entries[row_id] = (embedding, rewritten_query, context, answer, n, user_id)
+        if rows:
+            print(f"[SemanticCache] Loaded {len(rows)} entries from {self.db_path}")
+
+    def _rebuild_matrix(self) -> None:
+        """조회용 행렬 재생성 (_lock 보유 상태에서 호출)"""
+        self._row_ids = list(self._entries)
+        self._matrix = (
+            np.stack([entry[0] for entry in self._entries.values()])
+            if self._entries else None
+        )
+        self._user_ids = np.array([entry[5] for entry in self._entries.values()], dtype=np.int64)
+
+    def _best_match(self, user_id: int, embedding: np.ndarray) -> Optional[tuple]:
+        """
+        같은 사용자 항목 중 가장 유사한 항목 (_lock 보유 상태에서 호출)
+
+        Returns:
+            (row id, 유사도), 해당 사용자 항목이 없으면 None
+        """
+        if self._matrix is None or len(self._row_ids) != len(self._entries):
+            self._rebuild_matrix()
+        if self._matrix is None:
+            return None
+
+        scores = np.where(self._user_ids == user_id, self._matrix @ embedding, -np.inf)
+        best = int(np.argmax(scores))
+        if scores[best] == -np.inf:
+            return None
+        return self._row_ids[best], float(scores[best])
+
+    def get(self, user_id: int, embedding: np.ndarray) -> Optional[CachedAnswer]:
+        """
+        사용자의 캐시 항목 중 가장 유사한 항목 조회
+
+        Returns:
+            유사도가 임계값 이상이면 CachedAnswer, 아니면 None
+        """
+        with self._lock:
+            match = self._best_match(user_id, embedding)
+            if match is None or match[1] < self.threshold:
+                return None
+
+            row_id, similarity = match
+            self._entries.move_to_end(row_id)
+            _, rewritten_query, context, answer, _, _ = self._entries[row_id]
+
+            # 사용 시각 갱신 (재시작 후 LRU 순서 복원용, 커넥션 공유이므로 lock 내부에서 실행)
+            try:
+                with self._conn:
+                    self._conn.execute("UPDATE semantic_cache SET ts = ? WHERE id = ?", (time.time(), row_id))
+            except sqlite3.Error as e:
+                print(f"[SemanticCache][WARN] 사용 시각 갱신 실패: {e}")
+        return CachedAnswer(rewritten_query, context, answer, similarity)
+
+    def put(self, user_id: int, embedding: np.ndarray, rewritten_query: str, context: str, answer: str) -> None:
+        """캐시 항목 추가 (같은 사용자의 가까운 군집이 있으면 중심만 갱신, 초과 시 LRU 항목 삭제)"""
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        with self._lock:
+            if self._merge(user_id, embedding):
+                return
+            try:
+                with self._conn:
+                    cursor = self._conn.execute(
+                        "INSERT INTO semantic_cache (rewritten_query, context, answer, embedding, ts, user_id) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (rewritten_query, context, answer, embedding.tobytes(), time.time(), user_id)
+                    )
+                    row_id = cursor.lastrowid
+
+                    evicted = []
+                    while len(self._entries) >= self.max_size:
+                        evicted.append(self._entries.popitem(last=False)[0])
+                    if evicted:
+                        self._conn.executemany("DELETE FROM semantic_cache WHERE id = ?", [(i,) for i in evicted])
+            except sqlite3.Error as e:
+                print(f"[SemanticCache][WARN] 저장 실패: {e}")
+                return
+
+            self._entries[row_id] = (embedding, rewritten_query, context, answer, 1, user_id)
+            self._matrix = None
+
+    def _merge(self, user_id: int, embedding: np.ndarray) -> bool:
+        """
+        같은 사용자의 가장 가까운 군집 중심이 merge_threshold 이상이면 누적 평균으로 갱신 (_lock 보유 상태에서 호출)
+
+        Returns:
+            병합했으면 True (새 항목 추가 불필요)
+        """
+        match = self._best_match(user_id, embedding)
+        if match is None or match[1] < self.merge_threshold:
+            return False
+
+        row_id = match[0]
+        centroid, rewritten_query, context, answer, n, _ = self._entries[row_id]
+        centroid = (centroid * n + embedding) / (n + 1)
+        centroid = (centroid / np.linalg.norm(centroid)).astype(np.float32)
+
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE semantic_cache SET embedding = ?, n = ?, ts = ? WHERE id = ?",
+                    (centroid.tobytes(), n + 1, time.time(), row_id)
+                )
+        except sqlite3.Error as e:
+            print(f"[SemanticCache][WARN] 군집 중심 갱신 실패: {e}")
+            return True
+
+        self._entries[row_id] = (centroid, rewritten_query, context, answer, n + 1, user_id)
+        self._entries.move_to_end(row_id)
+        self._matrix = None
+        return True
+
+
+class QueryAnswerCache:
+    """
+    네임스페이스(사용자 ID 등)별 원문 질의 임베딩 → 최종 답변 캐시 (메모리 전용)
+
+    - 같은 사용자가 짧은 시간 안에 거의 같은 말을 반복하면 파이프라인 전체를 생략
+    - 네임스페이스별 버킷 + 전역 단조 증가 ID (버킷 내 ID 오름차순 = LRU 순서)
+    - TTL이 지난 항목은 조회 시 제거
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], np.ndarray],
+        max_size: int = QUERY_CACHE_SIZE,
+        threshold: float = QUERY_CACHE_THRESHOLD,
+        ttl: float = QUERY_CACHE_TTL
+    ):
+        """
+        Args:
+            embed_fn: 텍스트 → 정규화 임베딩 (VectorStore.embed_query)
+            max_size: 전체 최대 항목 수
+            threshold: 적중 최소 코사인 유사도
+            ttl: 항목 유효 시간 (초)
+        """
+        self.embed = embed_fn
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl = ttl
+
+        # namespace → {항목 ID: (임베딩, 답변, 만료 시각)}
+        self._buckets: Dict[Hashable, "OrderedDict[int, tuple]"] = {}
+        self._size = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def get(self, namespace: Hashable, embedding: np.ndarray) -> Optional[str]:
+        """
+        네임스페이스 내 가장 유사한 답변 조회
+
+        Returns:
+            유사도가 임계값 이상인 유효 항목의 답변, 없으면 None
+        """
+        now = time.time()
+        with self._lock:
+            bucket = self._buckets.get(namespace)
+            if not bucket:
+                return None
+
+            # 만료 항목 제거
+            for entry_id in [entry_id for entry_id, entry in bucket.items() if entry[2] <= now]:
+                del bucket[entry_id]
+                self._size -= 1
+            if not bucket:
+                del self._buckets[namespace]
+                return None
+
+            entry_ids = list(bucket)
+            scores = np.stack([bucket[entry_id][0] for entry_id in entry_ids]) @ embedding
+            best = int(scores.argmax())
+            if scores[best] < self.threshold:
+                return None
+
+            # 최근 사용 항목으로 갱신 (새 ID로 재삽입)
+            entry = bucket.pop(entry_ids[best])
+            self._seq += 1
+            bucket[self._seq] = entry
+            return entry[1]
+
+    def put(self, namespace: Hashable, embedding: np.ndarray, answer: str) -> None:
+        """항목 추가 (전체 항목 수가 max_size를 넘으면 가장 오래 안 쓴 항목 제거)"""
+        with self._lock:
+            self._seq += 1
+            self._buckets.setdefault(namespace, OrderedDict())[self._seq] = (embedding, answer, time.time() + self.ttl)
+            self._size += 1
+
+            if self._size > self.max_size:
+                oldest_namespace = min(self._buckets, key=lambda key: next(iter(self._buckets[key])))
+                oldest_bucket = self._buckets[oldest_namespace]
+                oldest_bucket.popitem(last=False)
+                if not oldest_bucket:
+                    del self._buckets[oldest_namespace]
+                self._size -= 1
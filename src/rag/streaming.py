@@ -0,0 +1,103 @@
+"""
+FileName    : streaming.py
+Auth        : 우재현
+Date        : 2026-01-30
+Description : 스트리밍 응답 유틸리티 (동기 → 비동기 제너레이터 변환, 토큰 청크 묶음)
+Issue/Note  : 동기 stream()을 워커 스레드에서 돌리면서 청크가 생성되는 즉시 이벤트 루프로 전달
+              (전체 응답을 list로 모은 뒤 한 번에 내보내던 방식 대체)
+              coalesce_chunks - LLM 토큰(1~3글자) 단위 청크를 묶어 SSE 이벤트 수 절감
+"""
+
+# -------------------------------------------------------------
+# Imports
+# -------------------------------------------------------------
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+
+# -------------------------------------------------------------
+# Constants
+# -------------------------------------------------------------
+
+_DONE = object()   # 생산자 종료 신호
+
+STREAM_CHUNK_MIN_CHARS = 24   # 묶어서 내보낼 최소 글자 수 (첫 청크는 즉시 전송)
+
+# -------------------------------------------------------------
+# Chunk Coalescing
+# -------------------------------------------------------------
+
+def coalesce_chunks(chunks: Iterable[str], min_chars: int = STREAM_CHUNK_MIN_CHARS) -> Iterator[str]:
+    """
+    작은 텍스트 청크를 min_chars 이상으로 묶어서 전달
+
+    - 첫 번째 비어있지 않은 청크는 바로 전달 (첫 글자 표시 지연 없음)
+    - 빈 청크는 건너뜀, 스트림 종료 시 남은 버퍼 전달
+
+    Args:
+        chunks: 텍스트 청크 이터러블 (예: LLM 토큰 스트림)
+        min_chars: 한 번에 내보낼 최소 글자 수
+
+    Yields:
+        묶인 텍스트 청크
+    """
+    buffer = []
+    size = 0
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if first:
+            first = False
+            yield chunk
+            continue
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= min_chars:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+# -------------------------------------------------------------
+# Sync → Async Bridge
+# -------------------------------------------------------------
+
+async def aiter_in_thread(make_iterator: Callable[[], Iterator[Any]]) -> AsyncIterator[Any]:
+    """
+    동기 이터레이터를 스레드풀에서 소비하며 항목을 비동기로 하나씩 전달
+
+    - make_iterator 호출과 순회는 모두 같은 워커 스레드에서 실행
+      (thread-local scoped session을 쓰는 DB 접근이 한 스레드에 머무름)
+    - 블로킹 LLM 호출 동안에도 이벤트 루프는 다른 요청을 처리
+
+    Args:
+        make_iterator: 동기 이터레이터 생성 함수 (예: lambda: chain.stream(...))
+
+    Yields:
+        이터레이터 항목 (생성되는 즉시)
+    """
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    def _produce() -> None:
+        try:
+            for chunk in make_iterator():
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+        except BaseException as e:
+            loop.call_soon_threadsafe(chunks.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(chunks.put_nowait, _DONE)
+
+    producer = loop.run_in_executor(None, _produce)
+    try:
+        while True:
+            chunk = await chunks.get()
+            if chunk is _DONE:
+                break
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield chunk
+    finally:
+        await producer
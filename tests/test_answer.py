@@ -0,0 +1,80 @@
+"""
+FileName    : test_answer.py
+Auth        : 우재현
+Date        : 2026-02-03
+Description : src/rag/answer.py 답변 생성 테스트 (pytest)
+Issue/Note  : 전문가 연결 태그가 포함된 LLM 답변 → 태그 제거 + DB 기록 확인
+              (FakeListChatModel로 LLM 호출 대체, API 키 불필요)
+"""
+
+# -------------------------------------------------------------
+# Imports
+# -------------------------------------------------------------
+
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가 (tests 폴더의 상위 디렉토리)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.rag.answer import REFERRAL_TAG, generate_answer, agenerate_answer
+
+# -------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------
+
+QUERY = "요즘 잠을 잘 못 자요"
+TAGGED_REPLY = f"많이 힘드셨겠어요. 가까운 상담 센터를 찾아보시길 권해요. {REFERRAL_TAG}"
+
+
+class FakeDB:
+    """create_expert_referral 호출만 기록하는 DB 대역"""
+
+    def __init__(self):
+        self.referrals = []
+
+    def create_expert_referral(self, **kwargs):
+        self.referrals.append(kwargs)
+
+# -------------------------------------------------------------
+# Test Functions
+# -------------------------------------------------------------
+
+def test_generate_answer_strips_referral_tag_and_logs():
+    db = FakeDB()
+    model = FakeListChatModel(responses=[TAGGED_REPLY])
+
+    answer = generate_answer([], QUERY, session_id=1, db=db, model=model)
+
+    assert answer is not None
+    assert REFERRAL_TAG not in answer
+    assert answer.startswith("많이 힘드셨겠어요.")
+    assert len(db.referrals) == 1
+    assert db.referrals[0]["session_id"] == 1
+
+
+def test_generate_answer_without_tag_is_unchanged():
+    db = FakeDB()
+    model = FakeListChatModel(responses=["잠들기 전 휴대폰 사용을 줄여보세요."])
+
+    answer = generate_answer([], QUERY, session_id=1, db=db, model=model)
+
+    assert answer == "잠들기 전 휴대폰 사용을 줄여보세요."
+    assert db.referrals == []
+
+
+def test_agenerate_answer_hides_referral_tag_and_logs():
+    db = FakeDB()
+    model = FakeListChatModel(responses=[TAGGED_REPLY])
+
+    async def collect():
+        return [chunk async for chunk in agenerate_answer([], QUERY, session_id=1, db=db, model=model)]
+
+    streamed = "".join(asyncio.run(collect()))
+
+    assert REFERRAL_TAG not in streamed
+    assert streamed.startswith("많이 힘드셨겠어요.")
+    assert len(db.referrals) == 1
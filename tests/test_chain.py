@@ -0,0 +1,53 @@
+"""
+FileName    : test_chain.py
+Auth        : 우재현
+Date        : 2026-02-04
+Description : src/rag/chain.py RAGChain 보조 로직 테스트 (pytest)
+Issue/Note  : 사용자별 질의 캐시 제외 조건 (위기 표현 / 지시어 포함 발화)
+              (RAGChain 초기화 없이 _query_cache_key만 호출, 모델/DB 불필요)
+"""
+
+# -------------------------------------------------------------
+# Imports
+# -------------------------------------------------------------
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# 프로젝트 루트 경로 추가 (tests 폴더의 상위 디렉토리)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.rag.chain import RAGChain
+
+# -------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------
+
+def _cache_key(query: str):
+    """embed 호출 시 고정 키를 돌려주는 query_cache로 _query_cache_key 실행"""
+    fake_chain = SimpleNamespace(query_cache=SimpleNamespace(embed=lambda text: "embedding"))
+    return RAGChain._query_cache_key(fake_chain, query)
+
+# -------------------------------------------------------------
+# Test Functions
+# -------------------------------------------------------------
+
+@pytest.mark.parametrize("query", [
+    "회사 일이 너무 힘들어 죽을 것 같아",   # intent_router CRISIS 키워드만 해당
+    "이제 다 끝내고 싶어",
+    "더는 안 살고 싶어",
+    "요즘 자꾸 죽고 싶다는 생각이 들어",   # answer.crisis_reply 패턴
+])
+def test_crisis_queries_skip_query_cache(query):
+    assert _cache_key(query) is None
+
+
+def test_reference_word_queries_skip_query_cache():
+    assert _cache_key("그거 어떻게 하면 돼?") is None
+
+
+def test_plain_query_uses_query_cache():
+    assert _cache_key("회사 일이 너무 힘들어") == "embedding"
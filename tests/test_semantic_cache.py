@@ -0,0 +1,204 @@
+"""
+FileName    : test_semantic_cache.py
+Auth        : 우재현
+Date        : 2026-02-04
+Description : src/rag/semantic_cache.py 캐시 테스트 (pytest)
+Issue/Note  : SemanticCache - 군집 병합 / 신규 저장 / LRU 삭제 / 사용자 분리 / 이전 스키마 마이그레이션
+              QueryAnswerCache - TTL 만료 / 사용자 분리 / 전체 크기 제한
+              (tmp_path SQLite + 직접 만든 단위 벡터 사용, 임베딩 모델 불필요)
+"""
+
+# -------------------------------------------------------------
+# Imports
+# -------------------------------------------------------------
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트 경로 추가 (tests 폴더의 상위 디렉토리)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.rag import semantic_cache
+from src.rag.semantic_cache import QueryAnswerCache, SemanticCache
+
+# -------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------
+
+DIM = 8
+USER_A = 1
+USER_B = 2
+
+
+def unit(*values) -> np.ndarray:
+    """앞쪽 성분만 지정한 DIM차원 단위 벡터"""
+    v = np.zeros(DIM, dtype=np.float32)
+    v[:len(values)] = values
+    return v / np.linalg.norm(v)
+
+
+def make_cache(tmp_path: Path, **kwargs) -> SemanticCache:
+    return SemanticCache(lambda text: None, db_path=tmp_path / "semantic_cache.db", **kwargs)
+
+
+def db_rows(cache: SemanticCache):
+    return cache._conn.execute(
+        "SELECT id, rewritten_query, answer, embedding, n, user_id FROM semantic_cache ORDER BY id"
+    ).fetchall()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """semantic_cache 모듈의 time.time을 수동으로 진행하는 시계"""
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: now[0])
+    return now
+
+# -------------------------------------------------------------
+# SemanticCache
+# -------------------------------------------------------------
+
+def test_miss_inserts_row(tmp_path):
+    cache = make_cache(tmp_path)
+
+    assert cache.get(USER_A, unit(1)) is None
+    cache.put(USER_A, unit(1), "q1", "ctx", "answer 1")
+
+    rows = db_rows(cache)
+    assert len(rows) == 1
+    assert rows[0][1:3] == ("q1", "answer 1")
+    assert rows[0][4:] == (1, USER_A)
+    hit = cache.get(USER_A, unit(1))
+    assert hit.answer == "answer 1"
+    assert hit.similarity == pytest.approx(1.0)
+
+
+def test_dissimilar_query_inserts_new_row(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put(USER_A, unit(1), "q1", "ctx", "answer 1")
+    cache.put(USER_A, unit(0, 1), "q2", "ctx", "answer 2")
+
+    assert len(db_rows(cache)) == 2
+    assert cache.get(USER_A, unit(0, 1)).answer == "answer 2"
+
+
+def test_merge_keeps_one_row_and_moves_centroid(tmp_path):
+    cache = make_cache(tmp_path, merge_threshold=0.86)
+    first = unit(1)
+    near = unit(1, 0.5)   # cos(first, near) ≈ 0.894
+    cache.put(USER_A, first, "q1", "ctx", "answer 1")
+    cache.put(USER_A, near, "q1'", "ctx", "answer 1'")
+
+    rows = db_rows(cache)
+    assert len(rows) == 1
+    row_id, rewritten_query, answer, blob, n, _ = rows[0]
+    assert (rewritten_query, answer, n) == ("q1", "answer 1", 2)   # 대표 답변 유지, 질의 수 누적
+
+    expected = (first + near) / 2
+    expected /= np.linalg.norm(expected)
+    stored = np.frombuffer(blob, dtype=np.float32)
+    np.testing.assert_allclose(stored, expected, rtol=1e-6)
+    np.testing.assert_allclose(cache._entries[row_id][0], expected, rtol=1e-6)
+    assert np.linalg.norm(stored) == pytest.approx(1.0)
+
+
+def test_eviction_deletes_lru_row_from_sqlite(tmp_path):
+    cache = make_cache(tmp_path, max_size=2)
+    cache.put(USER_A, unit(1), "q1", "ctx", "answer 1")
+    cache.put(USER_A, unit(0, 1), "q2", "ctx", "answer 2")
+    cache.get(USER_A, unit(1))                       # q1 최근 사용 → q2가 LRU
+    cache.put(USER_A, unit(0, 0, 1), "q3", "ctx", "answer 3")
+
+    assert [row[1] for row in db_rows(cache)] == ["q1", "q3"]
+    assert cache.get(USER_A, unit(0, 1)) is None
+
+    reloaded = make_cache(tmp_path, max_size=2)
+    assert reloaded.get(USER_A, unit(1)).answer == "answer 1"
+    assert reloaded.get(USER_A, unit(0, 1)) is None
+
+
+def test_entries_are_not_shared_between_users(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put(USER_A, unit(1), "q1", "ctx", "answer for A")
+
+    assert cache.get(USER_B, unit(1)) is None
+
+    # 다른 사용자의 같은 질의는 A의 군집에 병합되지 않고 별도 항목
+    cache.put(USER_B, unit(1), "q1", "ctx", "answer for B")
+    assert len(db_rows(cache)) == 2
+    assert cache.get(USER_A, unit(1)).answer == "answer for A"
+    assert cache.get(USER_B, unit(1)).answer == "answer for B"
+
+
+def test_legacy_schema_is_migrated_and_unowned_rows_dropped(tmp_path):
+    db_path = tmp_path / "semantic_cache.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE semantic_cache ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, rewritten_query TEXT NOT NULL, context TEXT NOT NULL, "
+        "answer TEXT NOT NULL, embedding BLOB NOT NULL, ts REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO semantic_cache (rewritten_query, context, answer, embedding, ts) VALUES (?, ?, ?, ?, ?)",
+        ("q", "ctx", "legacy answer", unit(1).tobytes(), 1.0)
+    )
+    conn.commit()
+    conn.close()
+
+    cache = make_cache(tmp_path)
+
+    columns = {row[1] for row in cache._conn.execute("PRAGMA table_info(semantic_cache)")}
+    assert {"n", "user_id"} <= columns
+    assert db_rows(cache) == []
+    assert cache.get(USER_A, unit(1)) is None
+
+# -------------------------------------------------------------
+# QueryAnswerCache
+# -------------------------------------------------------------
+
+def test_query_cache_hit_within_ttl(clock):
+    cache = QueryAnswerCache(lambda text: None, ttl=60)
+    cache.put(USER_A, unit(1), "answer")
+
+    clock[0] += 59
+    assert cache.get(USER_A, unit(1)) == "answer"
+
+
+def test_query_cache_expired_entry_misses(clock):
+    cache = QueryAnswerCache(lambda text: None, ttl=60)
+    cache.put(USER_A, unit(1), "answer")
+
+    clock[0] += 60
+    assert cache.get(USER_A, unit(1)) is None
+    assert cache._size == 0
+
+
+def test_query_cache_other_user_misses(clock):
+    cache = QueryAnswerCache(lambda text: None)
+    cache.put(USER_A, unit(1), "answer")
+
+    assert cache.get(USER_B, unit(1)) is None
+
+
+def test_query_cache_below_threshold_misses(clock):
+    cache = QueryAnswerCache(lambda text: None, threshold=0.92)
+    cache.put(USER_A, unit(1), "answer")
+
+    assert cache.get(USER_A, unit(1, 0.5)) is None   # cos ≈ 0.894
+
+
+def test_query_cache_evicts_least_recently_used(clock):
+    cache = QueryAnswerCache(lambda text: None, max_size=2)
+    cache.put(USER_A, unit(1), "a1")
+    cache.put(USER_B, unit(0, 1), "b1")
+    assert cache.get(USER_A, unit(1)) == "a1"        # A 항목 최근 사용 → B 항목이 LRU
+    cache.put(USER_A, unit(0, 0, 1), "a2")
+
+    assert cache._size == 2
+    assert cache.get(USER_B, unit(0, 1)) is None
+    assert cache.get(USER_A, unit(1)) == "a1"
+    assert cache.get(USER_A, unit(0, 0, 1)) == "a2"
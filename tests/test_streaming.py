@@ -0,0 +1,76 @@
+"""
+FileName    : test_streaming.py
+Auth        : 우재현
+Date        : 2026-02-04
+Description : src/rag/streaming.py 스트리밍 유틸리티 테스트 (pytest)
+Issue/Note  : coalesce_chunks - 첫 청크 즉시 전달 / 최소 글자 수 묶음 / 빈 청크 무시 / 내용 보존
+              aiter_in_thread - 순서 보존 / 예외 전파
+"""
+
+# -------------------------------------------------------------
+# Imports
+# -------------------------------------------------------------
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 경로 추가 (tests 폴더의 상위 디렉토리)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.rag.streaming import aiter_in_thread, coalesce_chunks
+
+# -------------------------------------------------------------
+# coalesce_chunks
+# -------------------------------------------------------------
+
+def test_first_chunk_is_yielded_immediately():
+    chunks = coalesce_chunks(iter(["안", "녕", "하", "세", "요"]), min_chars=10)
+
+    assert next(chunks) == "안"
+
+
+def test_chunks_are_grouped_to_min_chars_and_tail_flushed():
+    tokens = ["a"] + ["bc"] * 7 + ["d"]
+
+    out = list(coalesce_chunks(tokens, min_chars=4))
+
+    assert out == ["a", "bcbc", "bcbc", "bcbc", "bcd"]
+    assert "".join(out) == "".join(tokens)
+
+
+def test_empty_chunks_are_skipped():
+    out = list(coalesce_chunks(["", None, "a", "", "b", ""], min_chars=24))
+
+    assert out == ["a", "b"]
+
+
+def test_empty_stream_yields_nothing():
+    assert list(coalesce_chunks([])) == []
+
+# -------------------------------------------------------------
+# aiter_in_thread
+# -------------------------------------------------------------
+
+def test_aiter_in_thread_preserves_order():
+    async def collect():
+        return [item async for item in aiter_in_thread(lambda: iter(range(5)))]
+
+    assert asyncio.run(collect()) == [0, 1, 2, 3, 4]
+
+
+def test_aiter_in_thread_propagates_errors():
+    def failing():
+        yield "partial"
+        raise ValueError("boom")
+
+    async def collect(received):
+        async for item in aiter_in_thread(failing):
+            received.append(item)
+
+    received = []
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(collect(received))
+    assert received == ["partial"]
@@ -0,0 +1,109 @@
+"""
+FileName    : test_vector_store_scan.py
+Auth        : 우재현
+Date        : 2026-02-03
+Description : VectorStore FP16 사이드 인덱스 전수 탐색 테스트 (pytest)
+Issue/Note  : scan_topk_many(배치 행렬곱 top-k)가 쿼리별 argsort 기준 결과와 같은지 확인
+              (임베딩 모델 / ChromaDB 로드 없이 사이드 인덱스만 직접 구성)
+"""
+
+# -------------------------------------------------------------
+# Imports
+# -------------------------------------------------------------
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가 (tests 폴더의 상위 디렉토리)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database.vector_store import VectorStore
+
+# -------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------
+
+N_DOCS = 500
+DIM = 64
+
+
+def _unit_rows(rng, n: int) -> np.ndarray:
+    x = rng.standard_normal((n, DIM)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def _make_store(tmp_path: Path, matrix: np.ndarray, ids) -> VectorStore:
+    """사이드 인덱스 파일만 가진 VectorStore (모델/컬렉션 초기화 생략)"""
+    store = VectorStore.__new__(VectorStore)
+    store._scan_vectors_path = str(tmp_path / "vecs.f16")
+    store._scan_ids_path = str(tmp_path / "vecs.ids")
+    store._scan_index = None
+    store._scan_lock = threading.Lock()
+    store.embedding_model = SimpleNamespace(
+        device="cpu",
+        get_sentence_embedding_dimension=lambda: DIM
+    )
+    store.collection = object()
+    store._count_cache = (store.collection, len(ids))
+    store._append_scan_index(matrix, ids)
+    return store
+
+
+def _reference_topk(matrix16: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix16.astype(np.float32) @ query.astype(np.float32)
+    return np.argsort(-scores, kind="stable")[:k]
+
+# -------------------------------------------------------------
+# Test Functions
+# -------------------------------------------------------------
+
+def test_scan_index_loads_as_float32(tmp_path):
+    rng = np.random.default_rng(0)
+    store = _make_store(tmp_path, _unit_rows(rng, N_DOCS), [f"doc{i}" for i in range(N_DOCS)])
+
+    matrix, ids = store._load_scan_index()
+
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (N_DOCS, DIM)
+    assert len(ids) == N_DOCS
+
+
+def test_scan_topk_many_matches_per_query_argsort(tmp_path):
+    rng = np.random.default_rng(1)
+    matrix = _unit_rows(rng, N_DOCS)
+    ids = [f"doc{i}" for i in range(N_DOCS)]
+    store = _make_store(tmp_path, matrix, ids)
+    queries = _unit_rows(rng, 8)
+    k = 10
+
+    hits = store.scan_topk_many(queries, k)
+
+    assert len(hits) == len(queries)
+    matrix16 = matrix.astype(np.float16)
+    for query, (hit_ids, distances) in zip(queries, hits):
+        expected = _reference_topk(matrix16, query, k)
+        assert hit_ids == [ids[i] for i in expected]
+        expected_dist = 1.0 - matrix16[expected].astype(np.float32) @ query
+        np.testing.assert_allclose(distances, expected_dist, rtol=1e-5, atol=1e-6)
+        assert distances == sorted(distances)
+
+
+def test_scan_topk_is_single_query_case(tmp_path):
+    rng = np.random.default_rng(2)
+    matrix = _unit_rows(rng, N_DOCS)
+    store = _make_store(tmp_path, matrix, [f"doc{i}" for i in range(N_DOCS)])
+    query = _unit_rows(rng, 1)[0]
+
+    assert store.scan_topk(query, 5) == store.scan_topk_many(query[None, :], 5)[0]
+
+
+def test_scan_topk_many_rejects_stale_index(tmp_path):
+    rng = np.random.default_rng(3)
+    store = _make_store(tmp_path, _unit_rows(rng, N_DOCS), [f"doc{i}" for i in range(N_DOCS)])
+    store._count_cache = (store.collection, N_DOCS + 1)  # 사이드 인덱스에 없는 문서가 컬렉션에 있음
+
+    assert store.scan_topk_many(_unit_rows(rng, 2), 5) is None
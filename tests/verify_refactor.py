@@ -28,8 +28,11 @@ def test_settings():
     """
     print("--- 설정(Settings) 로드 테스트 ---")
     try:
-        from config.db_config import db_settings
-        from config.model_config import model_settings
+        from config.db_config import get_db_settings
+        from config.model_config import get_model_settings
+        
+        db_settings = get_db_settings()
+        model_settings = get_model_settings()
         
         print(f"SQLITE_DB_NAME: {db_settings.SQLITE_DB_NAME}")
         print(f"CHROMA_COLLECTION_NAME: {db_settings.CHROMA_COLLECTION_NAME}")